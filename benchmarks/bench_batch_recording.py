@@ -0,0 +1,48 @@
+"""Compares recording the trials of a sweep one at a time with 
+record_experiment against recording them together with 
+record_experiments, with and without an index.
+
+Usage:
+    python -m benchmarks.bench_batch_recording
+"""
+
+import time
+import random
+import shutil
+import tempfile
+
+import researcher as rs
+
+def trials(n_trials, n_steps):
+    return [
+        ({"title": "trial", "learning_rate": random.random(), "seed": i, "layers": [64, 64, 10]}, {"loss": [[random.random() for _ in range(n_steps)] for _ in range(3)]})
+        for i in range(n_trials)
+    ]
+
+def timed(record, batch, indexed):
+    path = tempfile.mkdtemp() + "/"
+    try:
+        if indexed:
+            rs.build_index(path)
+
+        start = time.perf_counter()
+        record(batch, path)
+        return time.perf_counter() - start
+    finally:
+        shutil.rmtree(path)
+
+def one_at_a_time(batch, path):
+    for params, observations in batch:
+        rs.record_experiment(params, path, observations)
+
+def main():
+    n_trials = 500
+    for n_steps in [10, 1000]:
+        batch = trials(n_trials, n_steps)
+        for indexed in [False, True]:
+            single = timed(one_at_a_time, batch, indexed)
+            batched = timed(rs.record_experiments, batch, indexed)
+            print(f"{n_steps:>5} steps, {'indexed' if indexed else 'no index'}: record_experiment {n_trials / single:8.0f} records/s, record_experiments {n_trials / batched:8.0f} records/s")
+
+if __name__ == "__main__":
+    main()
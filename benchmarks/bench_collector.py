@@ -0,0 +1,50 @@
+"""Compares the per-step append throughput and memory use of
+ObservationCollector and CompactObservationCollector, collecting python 
+floats and numpy float64 scalars.
+
+Usage:
+    python -m benchmarks.bench_collector [n_steps] [n_folds]
+"""
+
+import sys
+import time
+import random
+import tracemalloc
+
+import numpy as np
+import researcher as rs
+
+def collect(collector, values, n_folds):
+    start = time.perf_counter()
+    for fold in range(n_folds):
+        for value in values:
+            collector.add_fold_observation(fold, "loss", value)
+
+    return time.perf_counter() - start
+
+def used_memory(collector_class, values, n_folds):
+    # values are computed as they are collected, as they would be during 
+    # training, so that each collected float is a separate object.
+    tracemalloc.start()
+    collector = collector_class()
+    for fold in range(n_folds):
+        for value in values:
+            collector.add_fold_observation(fold, "loss", value * 1.0)
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return memory
+
+def main(n_steps=1000000, n_folds=3):
+    print(f"{n_steps} steps x {n_folds} folds")
+    values = [random.random() for _ in range(n_steps)]
+
+    for kind, kind_values in [("float", values), ("np.float64", list(np.array(values)))]:
+        for collector_class in [rs.ObservationCollector, rs.CompactObservationCollector]:
+            elapsed = collect(collector_class(), kind_values, n_folds)
+            memory = used_memory(collector_class, kind_values, n_folds)
+
+            print(f"{collector_class.__name__:28} {kind:10} {n_steps * n_folds / elapsed / 1e6:.2f}M appends/s, {memory / 1e6:.1f}MB")
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,47 @@
+"""Compares the size of records and the time taken to load them when they
+are written indented, compactly and compressed.
+
+Usage:
+    python -m benchmarks.bench_compression
+"""
+
+import os
+import time
+import random
+import shutil
+import tempfile
+
+import researcher as rs
+from researcher.compression import has_zstd
+
+def timed(f, repeats=5):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        f()
+    return (time.perf_counter() - start) / repeats
+
+def main():
+    rs.configure_cache(max_entries=0)
+
+    formats = [("indented", False, None), ("compact", True, None), ("gzip", True, "gzip")]
+    if has_zstd():
+        formats.append(("zstd", True, "zstd"))
+
+    path = tempfile.mkdtemp() + "/"
+    try:
+        for n_steps in [1000, 100000]:
+            observations = {"loss": [[random.random() for _ in range(n_steps)] for _ in range(3)], "accuracy": [[round(random.random(), 3) for _ in range(n_steps)] for _ in range(3)]}
+            for label, compact, compression in formats:
+                name = rs.save_experiment(path, label, {"title": "bench", "learning_rate": 0.01}, observations, compact=compact, compression=compression)
+
+                write = timed(lambda: rs.save_experiment(path, label, {"title": "bench", "learning_rate": 0.01}, observations, compact=compact, compression=compression), repeats=3)
+                load = timed(lambda: rs.load_experiment(path, name), repeats=3)
+                size = os.path.getsize(path + name)
+
+                print(f"{n_steps:>7} steps {label:>9}: {size / 2**20:8.2f}MiB, write {write * 1000:8.1f}ms, load {load * 1000:8.1f}ms")
+    finally:
+        shutil.rmtree(path)
+        rs.configure_cache(max_entries=1024)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Compares exporting records to CSV by loading every experiment into
+memory first against export_table, in time and peak memory.
+
+Usage:
+    python -m benchmarks.bench_export
+"""
+
+import csv
+import time
+import random
+import shutil
+import tempfile
+import tracemalloc
+
+import researcher as rs
+
+def record(path, n, steps):
+    batch = [
+        ({"title": "bench", "run": i, "lr": random.choice([0.1, 0.01]), "seed": i % 10, "optimizer": {"name": "adam"}}, {"val_loss": [[random.random() for _ in range(steps)] for _ in range(3)]})
+        for i in range(n)
+    ]
+    rs.record_experiments(batch, path)
+
+def loaded_export(path, file_name):
+    experiments = rs.all_experiments(path)
+    keys = sorted({k for e in experiments for k in e.data if k not in rs.globals.METADATA_KEYS + ["observations"]})
+
+    with open(file_name, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(keys + ["val_loss"])
+        for e in experiments:
+            finals = e.final_observations("val_loss")
+            writer.writerow([e.data.get(k) for k in keys] + [sum(finals) / len(finals)])
+
+def measure(f, *args):
+    tracemalloc.start()
+    start = time.perf_counter()
+    f(*args)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return elapsed, peak / 2**20
+
+def main():
+    for n, steps in [(1000, 500), (4000, 500)]:
+        path = tempfile.mkdtemp() + "/"
+        out = tempfile.mkdtemp() + "/"
+        try:
+            record(path, n, steps)
+
+            loaded, loaded_peak = measure(loaded_export, path, out + "loaded.csv")
+            exported, exported_peak = measure(rs.export_table, path, out + "exported.csv", ["val_loss"])
+
+            print(f"{n} experiments of {steps} steps: loaded {loaded:.2f}s {loaded_peak:.0f}MiB, export_table {exported:.2f}s {exported_peak:.1f}MiB")
+        finally:
+            shutil.rmtree(path)
+            shutil.rmtree(out)
+
+if __name__ == "__main__":
+    main()
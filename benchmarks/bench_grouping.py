@@ -0,0 +1,60 @@
+"""Compares computing the mean and standard deviation of a final metric
+over seeds by grouping with reduced_params and get_hash in python loops
+against group_experiments.
+
+Usage:
+    python -m benchmarks.bench_grouping
+"""
+
+import time
+import random
+import statistics
+
+import researcher as rs
+
+def experiments(n):
+    return [
+        rs.Experiment({
+            "title": "bench",
+            "hash": str(i),
+            "lr": random.choice([0.1, 0.01, 0.001]),
+            "batch_size": random.choice([16, 32, 64]),
+            "model": random.choice(["rnn", "cnn", "mlp"]),
+            "seed": random.randrange(10),
+            "observations": {"val_loss": [[random.random() for _ in range(50)] for _ in range(3)]},
+        })
+        for i in range(n)
+    ]
+
+def loop_groups(es):
+    groups = {}
+    for e in es:
+        params = rs.reduced_params({k: v for k, v in e.data.items() if k != "observations"}, ["seed", "hash"])
+        groups.setdefault(rs.get_hash(params), []).append(e)
+
+    results = {}
+    for key, members in groups.items():
+        finals = [statistics.mean(e.final_observations("val_loss")) for e in members]
+        results[key] = (statistics.mean(finals), statistics.pstdev(finals))
+
+    return results
+
+def main():
+    # imports numpy, so that it is not counted as part of the first grouping.
+    rs.group_experiments([])
+
+    for n in [1000, 10000]:
+        es = experiments(n)
+
+        start = time.perf_counter()
+        loop_groups(es)
+        loop = time.perf_counter() - start
+
+        start = time.perf_counter()
+        rs.group_experiments(es).aggregate("val_loss", quantiles=())
+        grouped = time.perf_counter() - start
+
+        print(f"{n} experiments: loops {loop:.3f}s, group_experiments {grouped:.3f}s ({loop / grouped:.1f}x)")
+
+if __name__ == "__main__":
+    main()
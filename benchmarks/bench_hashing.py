@@ -0,0 +1,46 @@
+"""Compares the original implementation of get_hash with both current
+hashing schemes, for a sweep of candidate parameters.
+
+Usage:
+    python -m benchmarks.bench_hashing
+"""
+
+import json
+import time
+import hashlib
+import binascii
+import itertools
+
+import researcher as rs
+from researcher.fileutils import TrickyValuesEncoder
+
+def original_get_hash(params):
+    return hex(int(binascii.hexlify(hashlib.md5(json.dumps(params, cls=TrickyValuesEncoder).encode("utf-8")).digest()), 16))[2:]
+
+def sweep():
+    grid = itertools.product([0.1, 0.01, 0.001, 0.0001], [16, 32, 64, 128, 256], ["rnn", "cnn", "mlp"], range(25), [0.0, 0.1, 0.5])
+    return [
+        {"title": "sweep", "learning_rate": lr, "batch_size": bs, "model": model, "seed": seed, "dropout": dropout, "layers": [64, 64, 10]}
+        for lr, bs, model, seed, dropout in grid
+    ]
+
+def timed(f, candidates):
+    start = time.perf_counter()
+    for params in candidates:
+        f(params)
+    return time.perf_counter() - start
+
+def main():
+    candidates = sweep()
+
+    results = [
+        ("original", timed(original_get_hash, candidates)),
+        ("version 1", timed(lambda p: rs.get_hash(p, 1), candidates)),
+        ("version 2", timed(lambda p: rs.get_hash(p, 2), candidates)),
+    ]
+
+    for name, seconds in results:
+        print(f"{name:>10}: {len(candidates) / seconds:10.0f} hashes/s ({seconds * 1e6 / len(candidates):.2f}us each)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""Compares the time taken by all_experiments to load a synthetic records
+directory serially and with pools of worker processes and threads.
+
+Usage:
+    python -m benchmarks.bench_parallel_loading [n_records] [n_steps]
+"""
+
+import os
+import sys
+import time
+import random
+import shutil
+import tempfile
+
+import researcher as rs
+
+def make_records(path, n_records, n_steps, n_folds=3):
+    for i in range(n_records):
+        params = {"title": "bench", "seed": i, "learning_rate": random.random()}
+        observations = {"loss": [[random.random() for _ in range(n_steps)] for _ in range(n_folds)]}
+        rs.record_experiment(params, path, observations=observations)
+
+def timed(f):
+    start = time.perf_counter()
+    f()
+    return time.perf_counter() - start
+
+def main(n_records=2000, n_steps=500):
+    path = tempfile.mkdtemp() + "/"
+    try:
+        make_records(path, n_records, n_steps)
+        print(f"{n_records} records of {n_steps} steps, {os.cpu_count()} cpus")
+
+        serial = timed(lambda: rs.all_experiments(path))
+        print(f"serial:           {serial:.3f}s")
+
+        for workers in [2, 4, 8]:
+            processes = timed(lambda: rs.all_experiments(path, workers=workers))
+            threads = timed(lambda: rs.all_experiments(path, workers=workers, processes=False))
+            print(f"{workers} processes:      {processes:.3f}s ({serial / processes:.2f}x)")
+            print(f"{workers} threads:        {threads:.3f}s ({serial / threads:.2f}x)")
+    finally:
+        shutil.rmtree(path)
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,36 @@
+"""Compares reading only the parameters of a record with decoding the
+whole record, for records of increasing length.
+
+Usage:
+    python -m benchmarks.bench_read_parameters
+"""
+
+import time
+import random
+import shutil
+import tempfile
+
+import researcher as rs
+from researcher.recordfiles import read_parameters, read_record
+
+def timed(f, repeats=5):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        f()
+    return (time.perf_counter() - start) / repeats
+
+def main():
+    path = tempfile.mkdtemp() + "/"
+    try:
+        for n_steps in [100, 10000, 1000000]:
+            params = {"title": "bench", "learning_rate": 0.01, "layers": [64, 64, 10]}
+            rs.save_experiment(path, "bench", params, {"loss": [[random.random() for _ in range(n_steps)] for _ in range(3)]})
+
+            full = timed(lambda: read_record(path + "bench.json"))
+            header = timed(lambda: read_parameters(path + "bench.json"))
+            print(f"{n_steps:>8} steps: full decode {full * 1000:9.3f}ms, parameters only {header * 1000:.3f}ms")
+    finally:
+        shutil.rmtree(path)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""Compares finding the experiments nearest to a new set of parameters
+with Experiment.common_values and differing_values against a 
+ParameterMatrix, and times the all-pairs counts.
+
+Usage:
+    python -m benchmarks.bench_similarity
+"""
+
+import time
+import random
+
+import researcher as rs
+
+def experiments(n):
+    return [
+        rs.Experiment({
+            "title": "bench",
+            "hash": str(i),
+            "lr": random.choice([0.1, 0.01, 0.001, 0.0001]),
+            "batch_size": random.choice([16, 32, 64, 128]),
+            "model": random.choice(["rnn", "cnn", "mlp"]),
+            "layers": random.choice([[64, 64], [128], [32, 32, 32]]),
+            "dropout": random.random(),
+            "seed": random.randrange(100),
+        })
+        for i in range(n)
+    ]
+
+def loop_nearest(es, query, k):
+    return sorted(es, key=lambda e: (-query.common_values(e), query.differing_values(e)))[:k]
+
+def main():
+    # imports numpy, so that it is not counted as part of the first encode.
+    rs.parameter_matrix([])
+
+    for n in [1000, 10000, 100000]:
+        es = experiments(n)
+        query = rs.Experiment(dict(es[0].data))
+
+        start = time.perf_counter()
+        loop_nearest(es, query, 10)
+        loop = time.perf_counter() - start
+
+        start = time.perf_counter()
+        matrix = rs.parameter_matrix(es)
+        encode = time.perf_counter() - start
+
+        start = time.perf_counter()
+        matrix.nearest(query, 10)
+        vectorized = time.perf_counter() - start
+
+        print(f"{n:>7} experiments: python nearest {loop * 1000:8.1f}ms, encode {encode * 1000:8.1f}ms, vectorized nearest {vectorized * 1000:6.2f}ms")
+
+        if n <= 10000:
+            start = time.perf_counter()
+            matrix.common_counts()
+            print(f"{n:>7} experiments: all-pairs common counts {(time.perf_counter() - start) * 1000:.1f}ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""Compares ranking experiments by their best validation loss by loading
+every record and scanning its observations against reading the summaries
+stored in the index.
+
+Usage:
+    python -m benchmarks.bench_summary
+"""
+
+import time
+import random
+import shutil
+import tempfile
+
+import researcher as rs
+
+def record(path, n, steps):
+    batch = [
+        ({"title": "bench", "run": i}, {"val_loss": [[random.random() for _ in range(steps)] for _ in range(3)]})
+        for i in range(n)
+    ]
+    rs.record_experiments(batch, path)
+
+def loaded_ranking(path):
+    experiments = rs.load_experiments(path, rs.list_records(path))
+    return sorted(experiments, key=lambda e: sum(min(fold) for fold in e.observations["val_loss"]) / 3)
+
+def main():
+    for n, steps in [(200, 1000), (1000, 1000)]:
+        path = tempfile.mkdtemp() + "/"
+        try:
+            rs.build_index(path)
+            record(path, n, steps)
+
+            start = time.perf_counter()
+            loaded_ranking(path)
+            loaded = time.perf_counter() - start
+
+            start = time.perf_counter()
+            with rs.ExperimentIndex(path) as index:
+                index.rank("val_loss", "min")
+            indexed = time.perf_counter() - start
+
+            print(f"{n} experiments of {steps} steps: loaded {loaded:.3f}s, index {indexed:.4f}s ({loaded / indexed:.0f}x)")
+        finally:
+            shutil.rmtree(path)
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,38 @@
-from researcher.experiment import Experiment
-from researcher.observations import ObservationCollector
-from researcher.record import reduced_params, record_experiment, record_experiment_with_collector
-from researcher.fileutils import get_hash, save_experiment, all_experiments, past_experiment_from_hash, past_experiments_from_hashes, load_experiment
-from researcher.dashboard import *
\ No newline at end of file
+import sys
+import importlib
+
+from researcher.experiment import Experiment, LazyExperiment
+from researcher.observations import ObservationCollector, CompactObservationCollector
+from researcher.record import reduced_params, record_name, record_experiment, record_experiment_with_collector, record_experiments
+from researcher.streaming import StreamingObservationCollector, compact_observation_log
+from researcher.writer import BackgroundRecorder
+from researcher.fileutils import get_hash, save_experiment, all_experiments, past_experiment_from_hash, past_experiments_from_hashes, load_experiment, load_experiments, shard_records
+from researcher.index import ExperimentIndex, build_index, has_index
+from researcher.cache import ExperimentCache, configure_cache, cache_info, clear_cache
+from researcher.query import query
+from researcher.export import export_table
+from researcher.sweep import RecordedSet, unrecorded
+from researcher.watcher import ExperimentSet
+from researcher.dashboard import *
+
+# Modules which import numpy are only imported when one of their members
+# is first used, so that importing researcher stays fast.
+_LAZY_MEMBERS = {
+    "MetricMatrix": "researcher.matrix",
+    "metric_matrix": "researcher.matrix",
+    "metric_matrices": "researcher.matrix",
+    "downsample": "researcher.sampling",
+    "ParameterMatrix": "researcher.similarity",
+    "parameter_matrix": "researcher.similarity",
+    "GroupedExperiments": "researcher.grouping",
+    "group_experiments": "researcher.grouping",
+}
+
+def __getattr__(name):
+    if name in _LAZY_MEMBERS:
+        return getattr(importlib.import_module(_LAZY_MEMBERS[name]), name)
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def __dir__():
+    return sorted(set(vars(sys.modules[__name__])) | set(_LAZY_MEMBERS))
@@ -0,0 +1,71 @@
+"""Contains helpers for writing files atomically, so that readers never see
+a partially written file even while many processes write to the same 
+directory.
+"""
+
+import os
+from contextlib import contextmanager
+
+TEMPORARY_EXTENSION = ".tmp"
+
+def sync_directory(directory):
+    """Flushes the entries of a directory to disk, so that files created,
+    renamed or removed in it survive a crash. Does nothing on platforms
+    which cannot open directories, such as Windows.
+
+    Args:
+        directory (string): The directory to flush.
+    """
+    try:
+        fd = os.open(directory or ".", os.O_RDONLY)
+    except (PermissionError, IsADirectoryError):
+        return
+
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+@contextmanager
+def atomic_open(file_name, mode="w", durable=False):
+    """Opens a temporary file alongside file_name for writing, and moves 
+    it into place once the block exits without raising. Until then readers
+    see either the previous contents of file_name or nothing at all. If 
+    the block raises, the temporary file is removed.
+
+    Without durable, the file is only handed to the operating system, and
+    a crash soon after may still lose it or leave it empty.
+
+    Temporary files begin with a dot and end in .tmp, so they are never
+    mistaken for records.
+
+    Args:
+        file_name (string): The full path of the file to write.
+
+        mode (string, optional): The mode to open the temporary file in,
+        either "w" or "wb". Defaults to "w".
+
+        durable (bool, optional): If True, the file is flushed to disk
+        before it is moved into place, and the directory is flushed 
+        afterwards, so the new file survives a crash once the block exits.
+        Defaults to False.
+
+    Yields:
+        file: The open temporary file.
+    """
+    directory, name = os.path.split(file_name)
+    temporary_name = os.path.join(directory, ".{}.{}{}".format(name, os.urandom(16).hex(), TEMPORARY_EXTENSION))
+
+    try:
+        with open(temporary_name, mode.replace("w", "x")) as f:
+            yield f
+            if durable:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(temporary_name, file_name)
+        if durable:
+            sync_directory(directory)
+    except BaseException:
+        if os.path.exists(temporary_name):
+            os.remove(temporary_name)
+        raise
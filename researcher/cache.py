@@ -0,0 +1,214 @@
+"""Contains a process-wide cache of loaded experiments, so that loading an
+unchanged record a second time does not read it from disk again.
+"""
+
+import os
+import time
+from collections import OrderedDict
+
+# Records modified more recently than this may be modified again without
+# their modification time changing, so they are not cached.
+RACY_WINDOW_NS = 2 * 10**9
+
+class ExperimentCache():
+    """A least recently used cache of Experiment instances keyed by the
+    path of their record. Each entry remembers the modification time, size
+    and inode of the record when it was loaded, and is only used while
+    these are unchanged.
+
+    Cached experiments are shared between every caller which loads them,
+    so changes made to one are visible to the others.
+
+    Attributes:
+        max_entries (int): The most experiments the cache will hold.
+
+        max_bytes (int): The most record bytes the cache will hold. The
+        size of each record on disk is used as an estimate of the memory
+        taken by its experiment.
+
+        hits (int): The number of loads served from the cache.
+
+        misses (int): The number of loads which had to read a record.
+    """
+    def __init__(self, max_entries=1024, max_bytes=256 * 2**20):
+        """Instantiates an ExperimentCache.
+
+        Args:
+            max_entries (int, optional): The most experiments to hold. 0
+            disables the cache. Defaults to 1024.
+
+            max_bytes (int, optional): The most record bytes to hold.
+            Defaults to 256MiB.
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+        self.__entries = OrderedDict()
+        self.__bytes = 0
+
+    def __len__(self):
+        return len(self.__entries)
+
+    def signature(self, file_name):
+        """Returns the modification time, size and inode of a record.
+
+        Args:
+            file_name (string): The full path to the record.
+
+        Returns:
+            tuple[int, int, int]: A value which changes whenever the record
+            is rewritten.
+        """
+        stat = os.stat(file_name)
+        return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+    def lookup(self, file_name, lazy, signature):
+        """Returns the cached experiment for a record, if the record has
+        not changed since it was cached.
+
+        Args:
+            file_name (string): The full path to the record.
+
+            lazy (bool): Whether a LazyExperiment is sought.
+
+            signature (tuple): The current signature of the record.
+
+        Returns:
+            Experiment: The cached experiment, or None if there is none.
+        """
+        key = (os.path.abspath(file_name), lazy)
+        entry = self.__entries.get(key)
+
+        if entry is None or entry[0] != signature:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self.__entries.move_to_end(key)
+
+        return entry[1]
+
+    def store(self, file_name, lazy, signature, experiment):
+        """Caches the experiment loaded from a record, evicting the least
+        recently used experiments if the cache is full. Records which were
+        modified very recently are not cached.
+
+        Args:
+            file_name (string): The full path to the record.
+
+            lazy (bool): Whether the experiment is a LazyExperiment.
+
+            signature (tuple): The signature of the record taken before it
+            was read.
+
+            experiment (Experiment): The experiment loaded from the record.
+        """
+        size = signature[1]
+        if size > self.max_bytes or self.max_entries <= 0 or time.time_ns() - signature[0] < RACY_WINDOW_NS:
+            return
+
+        key = (os.path.abspath(file_name), lazy)
+        self.__discard(key)
+
+        self.__entries[key] = (signature, experiment, size)
+        self.__bytes += size
+
+        self.__trim()
+
+    def __trim(self):
+        while self.__entries and (len(self.__entries) > self.max_entries or self.__bytes > self.max_bytes):
+            self.__discard(next(iter(self.__entries)))
+
+    def resize(self, max_entries=None, max_bytes=None):
+        """Changes the budget of the cache, evicting the least recently 
+        used experiments until it is met.
+
+        Args:
+            max_entries (int, optional): The most experiments to hold.
+            Unchanged if None.
+
+            max_bytes (int, optional): The most record bytes to hold. 
+            Unchanged if None.
+        """
+        if max_entries is not None:
+            self.max_entries = max_entries
+        if max_bytes is not None:
+            self.max_bytes = max_bytes
+
+        self.__trim()
+
+    def __discard(self, key):
+        entry = self.__entries.pop(key, None)
+        if entry is not None:
+            self.__bytes -= entry[2]
+
+    def get(self, file_name, lazy, load):
+        """Returns the cached experiment for a record, loading and caching
+        it if necessary.
+
+        Args:
+            file_name (string): The full path to the record.
+
+            lazy (bool): Whether a LazyExperiment is sought.
+
+            load (callable): Takes no arguments and loads the experiment
+            from the record.
+
+        Returns:
+            Experiment: The experiment stored in the record.
+        """
+        signature = self.signature(file_name)
+        experiment = self.lookup(file_name, lazy, signature)
+
+        if experiment is None:
+            experiment = load()
+            self.store(file_name, lazy, signature, experiment)
+
+        return experiment
+
+    def clear(self):
+        """Removes every experiment from the cache and resets the hit and
+        miss counters.
+        """
+        self.__entries.clear()
+        self.__bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def info(self):
+        """Summarizes the state of the cache.
+
+        Returns:
+            dict: The number of hits, misses, entries and bytes held.
+        """
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self.__entries), "bytes": self.__bytes}
+
+EXPERIMENT_CACHE = ExperimentCache()
+
+def configure_cache(max_entries=None, max_bytes=None):
+    """Changes the budget of the process-wide experiment cache. Setting
+    max_entries to 0 disables it.
+
+    Args:
+        max_entries (int, optional): The most experiments to hold.
+        Unchanged if None.
+
+        max_bytes (int, optional): The most record bytes to hold. Unchanged
+        if None.
+    """
+    EXPERIMENT_CACHE.resize(max_entries, max_bytes)
+
+def cache_info():
+    """Summarizes the state of the process-wide experiment cache.
+
+    Returns:
+        dict: The number of hits, misses, entries and bytes held.
+    """
+    return EXPERIMENT_CACHE.info()
+
+def clear_cache():
+    """Empties the process-wide experiment cache.
+    """
+    EXPERIMENT_CACHE.clear()
@@ -0,0 +1,161 @@
+"""Contains helpers for reading and writing compressed experiment records.
+Records compressed with gzip end in .json.gz and records compressed with
+zstd end in .json.zst. Writing and reading zstd records requires the
+optional zstandard package.
+"""
+
+import io
+import gzip
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+from researcher.globals import GZIP_EXTENSION, RECORD_EXTENSION, ZSTD_EXTENSION
+
+GZIP = "gzip"
+ZSTD = "zstd"
+
+# Every extension a record may have. Longer extensions come first, so the
+# first match is always the whole extension.
+RECORD_EXTENSIONS = [RECORD_EXTENSION + GZIP_EXTENSION, RECORD_EXTENSION + ZSTD_EXTENSION, RECORD_EXTENSION]
+
+def has_zstd():
+    """Indicates whether records can be compressed with zstd.
+
+    Returns:
+        bool: True if the zstandard package is installed.
+    """
+    return zstandard is not None
+
+def resolve_compression(compression):
+    """Returns the compression which will actually be used when the given
+    compression is requested. zstd falls back to gzip if the zstandard
+    package is not installed.
+
+    Args:
+        compression (string): None, "gzip" or "zstd".
+
+    Raises:
+        ValueError: If the compression is not recognised.
+
+    Returns:
+        string: None, "gzip" or "zstd".
+    """
+    if compression not in [None, GZIP, ZSTD]:
+        raise ValueError(f"Unknown compression {compression}, expected one of {[None, GZIP, ZSTD]}")
+
+    if compression == ZSTD and not has_zstd():
+        return GZIP
+
+    return compression
+
+def record_extension(compression):
+    """Returns the extension of records written with the given compression.
+
+    Args:
+        compression (string): None, "gzip" or "zstd".
+
+    Returns:
+        string: The extension, including the leading .json.
+    """
+    compression = resolve_compression(compression)
+
+    if compression == GZIP:
+        return RECORD_EXTENSION + GZIP_EXTENSION
+    if compression == ZSTD:
+        return RECORD_EXTENSION + ZSTD_EXTENSION
+
+    return RECORD_EXTENSION
+
+def compression_of(file_name):
+    """Returns the compression of a record, judging by its extension.
+
+    Args:
+        file_name (string): The filename of a record.
+
+    Returns:
+        string: None, "gzip" or "zstd".
+    """
+    if file_name.endswith(GZIP_EXTENSION):
+        return GZIP
+    if file_name.endswith(ZSTD_EXTENSION):
+        return ZSTD
+
+    return None
+
+def strip_record_extension(name):
+    """Removes the record extension, if any, from a filename.
+
+    Args:
+        name (string): The filename of a record.
+
+    Returns:
+        string: The filename without .json, .json.gz or .json.zst.
+    """
+    for extension in RECORD_EXTENSIONS:
+        if name.endswith(extension):
+            return name[:-len(extension)]
+
+    return name
+
+def sibling_names(name):
+    """Returns the names the same record would have with every other
+    record extension. Only one of them should exist at a time.
+
+    Args:
+        name (string): The filename of a record.
+
+    Returns:
+        list[string]: The filename with each other record extension.
+    """
+    stem = strip_record_extension(name)
+
+    return [stem + extension for extension in RECORD_EXTENSIONS if stem + extension != name]
+
+def compress(data, compression):
+    """Compresses the encoded contents of a record.
+
+    Args:
+        data (bytes): The record, encoded as utf-8.
+
+        compression (string): None, "gzip" or "zstd".
+
+    Returns:
+        bytes: The compressed record.
+    """
+    compression = resolve_compression(compression)
+
+    if compression == GZIP:
+        return gzip.compress(data, compresslevel=6, mtime=0)
+    if compression == ZSTD:
+        return zstandard.ZstdCompressor().compress(data)
+
+    return data
+
+def open_record(file_name):
+    """Opens a record for reading as text, decompressing it as it is read
+    if its extension shows it is compressed.
+
+    Args:
+        file_name (string): The full path to the record.
+
+    Raises:
+        ImportError: If the record is compressed with zstd and the
+        zstandard package is not installed.
+
+    Returns:
+        file: The open record.
+    """
+    compression = compression_of(file_name)
+
+    if compression == GZIP:
+        return gzip.open(file_name, "rt", encoding="utf-8")
+
+    if compression == ZSTD:
+        if not has_zstd():
+            raise ImportError(f"The zstandard package is required to read {file_name}")
+        return io.TextIOWrapper(zstandard.ZstdDecompressor().stream_reader(open(file_name, "rb")), encoding="utf-8")
+
+    return open(file_name, "r")
@@ -1,11 +1,10 @@
 """Contains helper functions for visualizing the results of experiments
-and comparing recorded experiments to one another.
+and comparing recorded experiments to one another. matplotlib is only 
+imported when something is first plotted.
 """
 
-import matplotlib.pyplot as plt
-from numpy.lib.arraysetops import isin
-
 from researcher.fileutils import *
+from researcher.globals import DEFAULT_MAX_POINTS
 
 def final_compare(experiments, metrics, draw_plots=False, **kwargs):
     """Prints the final recorded value for each experiment and accross 
@@ -22,6 +21,8 @@ def final_compare(experiments, metrics, draw_plots=False, **kwargs):
         draw_plots (bool): Indicates whether to plot graphs as well as
         displaying printouts. 
     """
+    import matplotlib.pyplot as plt
+    import numpy as np
 
     if draw_plots:
         fig, axes = plt.subplots(len(metrics), **kwargs)
@@ -54,7 +55,9 @@ def plot_compare(experiments, metrics, **kwargs):
         metrics (list[string]): The metrics to compare the given 
         experiments on. 
     """
-    
+    import matplotlib.pyplot as plt
+    import numpy as np
+
     fig, axes = plt.subplots(len(metrics), **kwargs)
     if not isinstance(axes, list):
         axes = [axes]
@@ -89,6 +92,9 @@ def plot_lr(e, metric, lr_name, n_increases=3):
         metric goes from falling to rising will be highlighted with 
         printouts and plotted vertical lines. Defaults to 3.
     """
+    import matplotlib.pyplot as plt
+    import numpy as np
+
     _, ax = plt.subplots(figsize=(20, 5))
     
     values = np.mean(e.observations[metric], axis=0)
@@ -132,7 +138,7 @@ def plot_lr(e, metric, lr_name, n_increases=3):
     print("lowest loss achieved at: ", min_index)
     print("corresponding lr: ", lr_values[min_index], 6)
 
-def plot_training(es, metrics, **kwargs):
+def plot_training(es, metrics, max_points=DEFAULT_MAX_POINTS, **kwargs):
     """For each given metric, the progression of that metric over all the
     given experiments will be plotted on a separate line graph.
 
@@ -141,7 +147,13 @@ def plot_training(es, metrics, **kwargs):
 
         metrics (list[string]): The metrics on which to compare the 
         experiments of interest. 
+
+        max_points (int, optional): Each line is downsampled to at most 
+        this many points, keeping its smallest and largest values. 
+        Defaults to 2000.
     """
+    import matplotlib.pyplot as plt
+
     if not isinstance(es, list):
         es = [es]
     
@@ -152,8 +164,7 @@ def plot_training(es, metrics, **kwargs):
 
     for i, m in enumerate(metrics):
         for e in es:
-            folds = e.observations[m]
-            line, = ax[i].plot(np.mean(folds, axis=0))
+            line, = ax[i].plot(*e.downsampled_mean(m, max_points))
             line.set_label(f"{e.identifier()} {m}")
         ax[i].legend()
         ax[i].grid()
@@ -168,6 +179,9 @@ def plot_folds(es, metrics, xlabel=None, ylabel=None, **kwargs):
         metrics (list[string]): The metrics on which to compare the 
         experiments of interest.
     """
+    import matplotlib.pyplot as plt
+    import numpy as np
+
     if not isinstance(es, list):
         es = [es]
     
@@ -201,7 +215,7 @@ def plot_folds(es, metrics, xlabel=None, ylabel=None, **kwargs):
     plt.xticks(rotation=45)
 
 
-def plot_fold_training(e, metrics, **kwargs):
+def plot_fold_training(e, metrics, max_points=DEFAULT_MAX_POINTS, **kwargs):
     """For each given metric, the progression of that metric over each fold
     of the given experiment will be plotted into a line graph.
 
@@ -210,7 +224,12 @@ def plot_fold_training(e, metrics, **kwargs):
 
         metrics (list[string]): The metrics on which to compare the 
         experiment folds. 
+
+        max_points (int, optional): Each fold is downsampled to at most 
+        this many points, keeping its smallest and largest values. 
+        Defaults to 2000.
     """
+    import matplotlib.pyplot as plt
 
     if isinstance(e, tuple) or isinstance(e, list) and len(e) == 1:
         e = e[0]
@@ -221,9 +240,8 @@ def plot_fold_training(e, metrics, **kwargs):
         ax = [ax]
 
     for i, m in enumerate(metrics):
-        folds = e.observations[m]
-        for j, fold in enumerate(folds):
-            line, = ax[i].plot(fold)
+        for j, (steps, values) in enumerate(e.downsampled_folds(m, max_points)):
+            line, = ax[i].plot(steps, values)
             line.set_label(f"{j}_{m}")
         ax[i].legend()
         ax[i].grid()
\ No newline at end of file
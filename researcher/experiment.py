@@ -1,7 +1,10 @@
 import datetime
 
-from researcher.globals import DATE_FORMAT, METADATA_KEYS, OBSERVATIONS_NAME
-from researcher.observations import FinalizedObservations
+from researcher.globals import DATE_FORMAT, METADATA_KEYS, OBSERVATIONS_NAME, SCHEMA_KEY, SUMMARY_KEY
+from researcher.lazy import is_ndarray
+from researcher.observations import FinalizedObservations, LazyObservations
+from researcher.schema import FOLDS
+from researcher.summary import STATISTICS, fold_mean, summarize
 
 class Experiment(FinalizedObservations):
     """Contains all the data related to a single recorded experiment.
@@ -31,18 +34,79 @@ class Experiment(FinalizedObservations):
 
         self.timestamp = datetime.datetime.strptime(self.data["timestamp"], DATE_FORMAT) if "timestamp" in self.data else None
     
+    def schema(self):
+        """Returns the description of the shape of each observation stored
+        in the record, without reading the observations. 
+
+        Returns:
+            dict: The description of each observation, keyed by name, or 
+            None for records written before schemas were stored. See 
+            researcher.schema.key_schema.
+        """
+        return self.data.get(SCHEMA_KEY)
+
+    def summary(self):
+        """Returns the summary statistics of each numeric observation 
+        stored in the record, without reading the observations. 
+
+        Returns:
+            dict: The statistics of each numeric series or fold 
+            observation, keyed by name, or None for records written before
+            summaries were stored. See researcher.summary.summarize.
+        """
+        return self.data.get(SUMMARY_KEY)
+
+    def statistic(self, key, statistic, mean=False):
+        """Returns a summary statistic of an observation. The stored
+        summary is used if there is one, otherwise the statistic is
+        computed from the observations.
+
+        Args:
+            key (string): The name of the observation.
+
+            statistic (string): One of researcher.summary.STATISTICS.
+
+            mean (bool, optional): If True, the statistic is averaged over
+            the folds of a fold observation. Defaults to False.
+
+        Returns:
+            object: The statistic of each fold, or of the series. See
+            researcher.summary.summarize.
+
+        Raises:
+            ValueError: If statistic is not a known statistic.
+
+            KeyError: If the experiment has no numeric series or fold
+            observation with the given name.
+        """
+        if statistic not in STATISTICS:
+            raise ValueError(f"Unknown statistic {statistic}, expected one of {STATISTICS}")
+
+        summary = self.summary()
+        if summary is None:
+            summary = summarize(self.observations)
+
+        value = summary[key][statistic]
+
+        return fold_mean(value) if mean else value
+
     def n_folds(self):
-        """Returns the number of folds that the experiment has.
+        """Returns the number of folds that the experiment has. If the
+        record stores a schema, the observations are not read.
+
         Returns:
             int: the number of folds that the experiment has.
         """
+        schema = self.schema()
+        if schema is not None:
+            return next((s["folds"] for s in schema.values() if s["kind"] == FOLDS and s["folds"] > 0), 0)
 
         max_folds = 0
 
         # we assume any observation that takes the form of a list of lists
         # represents seprate folds of data.
         for val in self.observations.values():
-            if isinstance(val, list) and all([isinstance(x, list) for x in val]) and len(val) > max_folds:
+            if isinstance(val, list) and all([isinstance(x, list) or is_ndarray(x) for x in val]) and len(val) > max_folds:
                  return len(val)
         
         return max_folds
@@ -90,4 +154,30 @@ class Experiment(FinalizedObservations):
 
         id = title + self.data["hash"][:8]
         
-        return id
\ No newline at end of file
+        return id
+
+class LazyExperiment(Experiment):
+    """An Experiment whose parameters are available immediately but whose
+    observations are only read from the record when they are first 
+    accessed. Unlike Experiment, data does not contain the observations.
+
+    Attributes:
+        data (dict): The parameters and metadata associated with the 
+        recorded experiment.
+
+        timestamp: (datetime.datetime) The time at which the recorded 
+        experiment was first recorded.
+    """
+    def __init__(self, data, load_observations):
+        """Instantiates a LazyExperiment.
+
+        Args:
+            data (dict): The recorded parameters and metadata of the 
+            experiment.
+
+            load_observations (callable): Takes no arguments and returns 
+            the observations of the experiment.
+        """
+        super().__init__(data)
+
+        self.observations = LazyObservations(load_observations)
@@ -0,0 +1,256 @@
+"""Contains helpers for exporting the records in a records directory to a
+flat table with one row per experiment, for analysis with other tools.
+Records are read one chunk at a time, so memory use does not grow with
+the number of records.
+"""
+
+import csv
+import json
+
+from researcher.atomic import atomic_open
+from researcher.fileutils import load_experiment
+from researcher.globals import CSV_EXTENSION, NPY_EXTENSION, OBSERVATIONS_NAME, SCHEMA_KEY, SUMMARY_KEY
+from researcher.index import ExperimentIndex, build_index, has_index
+from researcher.recordfiles import list_records, read_parameters
+from researcher.summary import STATISTICS, fold_mean, summarize
+
+# The number of records read before the rows made from them are written.
+DEFAULT_CHUNK_SIZE = 1000
+
+NUMBER = "f8"
+
+_EXCLUDED_KEYS = {OBSERVATIONS_NAME, SCHEMA_KEY, SUMMARY_KEY}
+
+def flatten(params, prefix=""):
+    """Flattens nested parameters, joining the keys of nested dicts with
+    dots.
+
+    Args:
+        params (dict): The parameters to flatten.
+
+        prefix (string, optional): Prepended to every key. Defaults to "".
+
+    Returns:
+        dict: The flattened parameters. Values other than non-empty dicts
+        are left as they are.
+
+    Raises:
+        ValueError: If two parameters flatten to the same key, such as 
+        {"a.b": 1, "a": {"b": 2}}.
+    """
+    flat = {}
+    for key, value in params.items():
+        if isinstance(value, dict) and value:
+            items = flatten(value, prefix + key + ".").items()
+        else:
+            items = [(prefix + key, value)]
+
+        for flat_key, flat_value in items:
+            if flat_key in flat:
+                raise ValueError(f"More than one parameter flattens to {flat_key}")
+            flat[flat_key] = flat_value
+
+    return flat
+
+def _is_number(value):
+    return isinstance(value, (int, float))
+
+def _as_text(value):
+    return value if isinstance(value, str) else json.dumps(value)
+
+def _metric_column(metric, statistic):
+    # parameters never have the observations key, so metric columns never
+    # share a name with a parameter column.
+    return OBSERVATIONS_NAME + "." + metric + "." + statistic
+
+def _records(path, names):
+    # yields the name and parameters of each record, from the index if
+    # there is one so that the record files are not read.
+    if has_index(path):
+        with ExperimentIndex(path) as index:
+            for name in names:
+                yield name, index.parameters(name)
+    else:
+        for name in names:
+            yield name, read_parameters(path + name)
+
+def record_names(path):
+    """Lists the records to export from a records directory. If the
+    directory has been indexed, the index is brought up to date first.
+
+    Args:
+        path (string): The records directory.
+
+    Returns:
+        list[string]: The filename of each record.
+    """
+    if has_index(path):
+        build_index(path)
+        with ExperimentIndex(path) as index:
+            return index.names()
+
+    return list_records(path)
+
+def table_columns(path, names, metrics=None):
+    """Determines the parameter columns of the table made from the given
+    records, and the metrics it holds, reading only their parameters.
+    Every parameter of any record gets a column.
+
+    Args:
+        path (string): The records directory.
+
+        names (list[string]): The filenames of the records. See
+        record_names.
+
+        metrics (list[string], optional): The observations to export. If
+        None, every observation summarized in any record is exported.
+        Defaults to None.
+
+    Returns:
+        tuple[list[tuple[string, string]], list[string]]: The name of each
+        parameter column and the numpy type of its values, which is "f8"
+        for columns holding only numbers and "U" followed by the length of
+        the longest value for the rest, and the metrics to export.
+    """
+    numeric = {}
+    widths = {}
+    summarized = set()
+    for _, params in _records(path, names):
+        for key, value in flatten({k: v for k, v in params.items() if k not in _EXCLUDED_KEYS}).items():
+            numeric[key] = numeric.get(key, True) and _is_number(value)
+            widths[key] = max(widths.get(key, 1), len(_as_text(value)))
+
+        if metrics is None:
+            summarized.update(params.get(SUMMARY_KEY) or {})
+
+    columns = [(key, NUMBER if numeric[key] else "U" + str(widths[key])) for key in sorted(numeric)]
+
+    return columns, sorted(summarized) if metrics is None else list(metrics)
+
+def table_rows(path, names, columns, metrics, statistic="final", chunk_size=DEFAULT_CHUNK_SIZE):
+    """Makes the rows of the table made from the given records, one chunk
+    at a time. Metrics are read from the summary stored in each record.
+    Only the records written before summaries were stored are read in
+    full.
+
+    Args:
+        path (string): The records directory.
+
+        names (list[string]): The filenames of the records.
+
+        columns (list[tuple[string, string]]): The parameter columns of
+        the table. See table_columns.
+
+        metrics (list[string]): The observations to export.
+
+        statistic (string, optional): The statistic of each metric to
+        export, one of researcher.summary.STATISTICS. Defaults to "final".
+
+        chunk_size (int, optional): The number of rows in each chunk.
+        Defaults to 1000.
+
+    Yields:
+        list[list]: A chunk of rows, each holding a value for every
+        parameter column followed by the statistic of every metric,
+        averaged over folds. Missing values are None.
+    """
+    chunk = []
+    for name, params in _records(path, names):
+        flat = flatten({k: v for k, v in params.items() if k not in _EXCLUDED_KEYS})
+
+        summary = params.get(SUMMARY_KEY)
+        if summary is None and metrics:
+            summary = summarize(load_experiment(path, name).observations)
+
+        row = [flat.get(column) for column, _ in columns]
+        row += [fold_mean(summary[metric][statistic]) if metric in summary else None for metric in metrics]
+
+        chunk.append(row)
+        if len(chunk) == chunk_size:
+            yield chunk
+            chunk = []
+
+    if chunk:
+        yield chunk
+
+def _write_csv(file_name, columns, chunks):
+    rows = 0
+    with atomic_open(file_name, "w") as f:
+        writer = csv.writer(f)
+        writer.writerow([column for column, _ in columns])
+        for chunk in chunks:
+            writer.writerows([["" if v is None else (v if dtype == NUMBER else _as_text(v)) for v, (_, dtype) in zip(row, columns)] for row in chunk])
+            rows += len(chunk)
+
+    return rows
+
+def _write_npy(file_name, columns, chunks, n_rows):
+    import numpy as np
+
+    dtype = np.dtype([(column, column_dtype) for column, column_dtype in columns])
+
+    rows = 0
+    with atomic_open(file_name, "wb") as f:
+        np.lib.format.write_array_header_2_0(f, {"descr": np.lib.format.dtype_to_descr(dtype), "fortran_order": False, "shape": (n_rows,)})
+        for chunk in chunks:
+            f.write(np.array([
+                tuple((float("nan") if v is None else v) if column_dtype == NUMBER else ("" if v is None else _as_text(v)) for v, (_, column_dtype) in zip(row, columns))
+                for row in chunk
+            ], dtype=dtype).tobytes())
+            rows += len(chunk)
+
+        if rows != n_rows:
+            raise ValueError(f"Expected {n_rows} rows but made {rows}")
+
+    return rows
+
+def export_table(path, file_name, metrics=None, statistic="final", chunk_size=DEFAULT_CHUNK_SIZE):
+    """Writes the parameters and metrics of every record in a records
+    directory to a table with one row per experiment. Nested parameters
+    are flattened, see flatten, and each metric is averaged over folds in
+    a column named observations.<metric>.<statistic>. The table is written
+    atomically. Records are read twice, once to find the columns of the table and
+    once to write its rows, but only their parameters are read unless
+    they lack a stored summary.
+
+    Args:
+        path (string): The records directory.
+
+        file_name (string): The table to write. A ".csv" file is written
+        as CSV, with values which are neither numbers nor strings written
+        as JSON. A ".npy" file is written as a numpy structured array,
+        with a field per column, NaN for missing numbers and an empty
+        string for missing text.
+
+        metrics (list[string], optional): The observations to export. If
+        None, every observation summarized in any record is exported.
+        Defaults to None.
+
+        statistic (string, optional): The statistic of each metric to
+        export, one of researcher.summary.STATISTICS. Defaults to "final".
+
+        chunk_size (int, optional): The number of records read before
+        their rows are written. Defaults to 1000.
+
+    Returns:
+        int: The number of rows written.
+
+    Raises:
+        ValueError: If statistic is not a known statistic, file_name does
+        not end in ".csv" or ".npy", or the parameters of a record cannot
+        be flattened.
+    """
+    if statistic not in STATISTICS:
+        raise ValueError(f"Unknown statistic {statistic}, expected one of {STATISTICS}")
+    if not file_name.endswith((CSV_EXTENSION, NPY_EXTENSION)):
+        raise ValueError(f"Cannot export to {file_name}, expected a file ending in {CSV_EXTENSION} or {NPY_EXTENSION}")
+
+    names = record_names(path)
+    columns, metrics = table_columns(path, names, metrics)
+    chunks = table_rows(path, names, columns, metrics, statistic, chunk_size)
+    header = columns + [(_metric_column(metric, statistic), NUMBER) for metric in metrics]
+
+    if file_name.endswith(CSV_EXTENSION):
+        return _write_csv(file_name, header, chunks)
+
+    return _write_npy(file_name, header, chunks, len(names))
@@ -4,12 +4,18 @@ json package.
 
 import os
 import json
-import binascii
 import hashlib
-
-import numpy as np
-from researcher.globals import OBSERVATIONS_NAME
-from researcher.experiment import Experiment
+from functools import partial
+
+from researcher.globals import OBSERVATIONS_NAME, SHARDED_NAME
+from researcher.atomic import atomic_open
+from researcher.compression import RECORD_EXTENSIONS, compress, compression_of, record_extension, sibling_names
+from researcher.cache import EXPERIMENT_CACHE
+from researcher.experiment import Experiment, LazyExperiment
+from researcher.index import ExperimentIndex, build_index, has_index
+from researcher.lazy import loaded_numpy
+from researcher.storage import binary_file_names, remove_binary_files, save_binary_observations
+from researcher.recordfiles import is_record_file, is_sharded, list_records, read_observations, read_parameters, read_record, record_location
 
 class TrickyValuesEncoder(json.JSONEncoder):
     """A JSON Encoder class that handles tricky python datatypes.
@@ -26,6 +32,10 @@ class TrickyValuesEncoder(json.JSONEncoder):
             object: The same value that was passed in represented as a 
             data type that the json package can serialize.
         """
+        np = loaded_numpy()
+        if np is None:
+            return json.JSONEncoder.default(self, obj)
+
         if isinstance(obj, np.float32):
             return float(obj)
         elif isinstance(obj, np.integer):
@@ -35,21 +45,72 @@ class TrickyValuesEncoder(json.JSONEncoder):
         
         return json.JSONEncoder.default(self, obj)
 
-def get_hash(params):
+class CanonicalEncoder(TrickyValuesEncoder):
+    """A JSON Encoder class which produces the same output for equal 
+    parameters regardless of key order or whether values are python or
+    numpy types.
+    """
+    def default(self, obj):
+        """Converts numpy scalars and arrays into the equivalent python
+        values.
+
+        Args:
+            obj (object): a python value that will be serialized by the 
+            json package.
+
+        Returns:
+            object: The same value represented as a python data type.
+        """
+        np = loaded_numpy()
+        if np is None:
+            return TrickyValuesEncoder.default(self, obj)
+
+        if isinstance(obj, np.bool_):
+            return bool(obj)
+        elif isinstance(obj, np.floating):
+            return float(obj)
+
+        return TrickyValuesEncoder.default(self, obj)
+
+# Version 1 hashes the md5 of the parameters in insertion order, and drops 
+# leading zeros from the digest. Version 2 hashes the blake2b of the 
+# parameters with sorted keys, and is always 32 characters long.
+HASH_VERSIONS = [1, 2]
+DEFAULT_HASH_VERSION = 1
+
+_LEGACY_ENCODER = TrickyValuesEncoder()
+_CANONICAL_ENCODER = CanonicalEncoder(sort_keys=True, separators=(",", ":"))
+
+def get_hash(params, version=DEFAULT_HASH_VERSION):
     """Converts the given parameters deterministically into a unique hash. 
 
     Args:
         params (dict): The parameters that define an experiment.
 
+        version (int, optional): The hashing scheme to use. Version 2 is
+        faster and gives the same hash for parameters which differ only in
+        key order or in the use of numpy rather than python types. Defaults
+        to 1, the scheme used by existing records.
+
+    Raises:
+        ValueError: If the version is not one of HASH_VERSIONS.
+
     Returns:
         string: A hash that is deterministically generated from and unique
         to the given parameters.
     """
-    return hex(int(binascii.hexlify(hashlib.md5(json.dumps(params, cls=TrickyValuesEncoder).encode("utf-8")).digest()), 16))[2:]
+    if version == 2:
+        return hashlib.blake2b(_CANONICAL_ENCODER.encode(params).encode("utf-8"), digest_size=16).hexdigest()
+    if version == 1:
+        # equivalent to converting the digest to an int and back to hex.
+        return hashlib.md5(_LEGACY_ENCODER.encode(params).encode("utf-8")).hexdigest().lstrip("0") or "0"
+
+    raise ValueError(f"Unknown hash version {version}, expected one of {HASH_VERSIONS}")
 
-def save_experiment(path, name, parameters, observations):
+def save_experiment(path, name, parameters, observations, binary=False, compact=False, compression=None):
     """Saves parameters and associated experiment observations to a JSON 
-    file.
+    file. The file is written atomically, so concurrent readers never see 
+    a partially written record.
 
     Args:
         path (string): The parent directory in which to save the record.
@@ -62,34 +123,225 @@ def save_experiment(path, name, parameters, observations):
 
         observations (dict, optional): All observations made during the
         experiment.
+
+        binary (bool, optional): If True, numeric series in observations 
+        are stored as raw typed arrays in a binary file alongside the JSON
+        record, which only holds references to them. Defaults to False.
+
+        compact (bool, optional): If True, the record is written on a 
+        single line without any whitespace, which is much smaller and 
+        faster to write for records with many observations. Defaults to 
+        False.
+
+        compression (string, optional): "gzip" or "zstd" to compress the
+        record, in which case its filename ends in .json.gz or .json.zst.
+        zstd requires the zstandard package, and falls back to gzip if it
+        is not installed. Defaults to None.
+
+    Returns:
+        string: The filename of the saved record relative to path. In a 
+        sharded directory this includes the shard subdirectory.
+    """
+    name = record_location(path, name + record_extension(compression))
+
+    if is_sharded(path):
+        os.makedirs(os.path.dirname(path + name), exist_ok=True)
+
+    write_record(path + name, parameters, observations, binary, compact)
+
+    return name
+
+def write_record(file_name, parameters, observations, binary=False, compact=False, durable=False):
+    """Writes a record atomically to the given file, without checking the
+    layout of the records directory or creating any directories. The 
+    record is compressed if the extension of file_name calls for it. Any
+    copy of the record with another extension is removed. See 
+    save_experiment.
+
+    Args:
+        file_name (string): The full path of the record.
+
+        parameters (dict): The parameters and metadata of the experiment.
+
+        observations (dict): All observations made during the experiment.
+
+        binary (bool, optional): If True, numeric series in observations
+        are stored in a binary file alongside the record. Defaults to 
+        False.
+
+        compact (bool, optional): If True, the record is written without
+        any whitespace. Defaults to False.
+
+        durable (bool, optional): If True, the record and any binary file
+        are flushed to disk before this returns, so they survive a crash.
+        See atomic_open. Defaults to False.
     """
-    file_name = path + name + ".json"
+    # a record saved earlier with another compression is replaced too.
+    siblings = [name for name in sibling_names(file_name) if os.path.exists(name)]
+    replaced = siblings or os.path.exists(file_name)
+
+    binary_name = None
+    if binary and observations:
+        observations, binary_name = save_binary_observations(file_name, observations, durable)
 
     experiment_dict = {**parameters, OBSERVATIONS_NAME: observations}
 
-    with open(file_name, "w") as f:
-        f.write(json.dumps(experiment_dict, indent=4, cls=TrickyValuesEncoder))
+    if compact:
+        text = json.dumps(experiment_dict, separators=(",", ":"), cls=TrickyValuesEncoder)
+    else:
+        text = json.dumps(experiment_dict, indent=4, cls=TrickyValuesEncoder)
+
+    compression = compression_of(file_name)
+    if compression is None:
+        with atomic_open(file_name, "w", durable) as f:
+            f.write(text)
+    else:
+        with atomic_open(file_name, "wb", durable) as f:
+            f.write(compress(text.encode("utf-8"), compression))
+
+    # the old record and its binary files are only removed once the new
+    # record is in place.
+    for name in siblings:
+        try:
+            os.remove(name)
+        except FileNotFoundError:
+            pass
+
+    if replaced:
+        remove_binary_files(file_name, keep=binary_name)
+
+def shard_records(path):
+    """Converts a flat records directory to the sharded layout, moving 
+    each record, and any binary observations file alongside it, into a 
+    subdirectory named after the first characters of its hash. Records 
+    saved to the directory afterwards are sharded too. Loading functions 
+    handle both layouts, as well as directories part way through being 
+    converted. If the directory has an index it is brought up to date.
+
+    Args:
+        path (string): The records directory to convert.
+    """
+    open(path + SHARDED_NAME, "a").close()
+
+    for name in os.listdir(path):
+        if not is_record_file(name):
+            continue
+
+        destination = path + record_location(path, name)
+        os.makedirs(os.path.dirname(destination), exist_ok=True)
+
+        for binary_name in binary_file_names(path + name):
+            os.replace(binary_name, os.path.dirname(destination) + "/" + os.path.basename(binary_name))
+        os.replace(path + name, destination)
+
+    if has_index(path):
+        build_index(path)
+
+def load_experiments(path, names, lazy=False, workers=None, processes=True):
+    """Loads the given records into Experiment instances, optionally 
+    spreading the work over a pool of workers. Experiments already in the
+    experiment cache are not read again.
+
+    Args:
+        path (string): The directory containing the experiment records.
+
+        names (list[string]): The filenames of the records to load.
+
+        lazy (bool, optional): If True, LazyExperiment instances are 
+        returned. Defaults to False.
+
+        workers (int, optional): The number of workers to load records 
+        with. If None, records are loaded one after another in the calling
+        process. Defaults to None.
+
+        processes (bool, optional): If True, records are read and decoded 
+        in a pool of worker processes, which suits large records where 
+        decoding dominates. If False a pool of threads is used instead, 
+        which suits many small records on a slow filesystem where waiting 
+        on I/O dominates. Defaults to True.
+
+    Returns:
+        list[Experiment]: The loaded experiments, in the same order as 
+        names.
+    """
+    file_names = [path + name for name in names]
+
+    if workers is None:
+        return [EXPERIMENT_CACHE.get(file_name, lazy, partial(_read_experiment, file_name, lazy)) for file_name in file_names]
 
-def all_experiments(path):
+    signatures = [EXPERIMENT_CACHE.signature(file_name) for file_name in file_names]
+    experiments = [EXPERIMENT_CACHE.lookup(file_name, lazy, signature) for file_name, signature in zip(file_names, signatures)]
+    missing = [i for i, e in enumerate(experiments) if e is None]
+
+    read = read_parameters if lazy else read_record
+    missing_files = [file_names[i] for i in missing]
+
+    # concurrent.futures is slow to import, and only needed here.
+    from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+    if processes:
+        with ProcessPoolExecutor(workers) as executor:
+            records = list(executor.map(read, missing_files, chunksize=max(1, len(missing_files) // (workers * 4))))
+    else:
+        with ThreadPoolExecutor(workers) as executor:
+            records = list(executor.map(read, missing_files))
+
+    for i, record in zip(missing, records):
+        experiments[i] = _lazy_experiment(file_names[i], record) if lazy else Experiment(record)
+        EXPERIMENT_CACHE.store(file_names[i], lazy, signatures[i], experiments[i])
+
+    return experiments
+
+def all_experiments(path, lazy=False, workers=None, processes=True):
     """Loads all records in the given directory into Experiment instances.
+    If the directory has been indexed, the index is brought up to date and 
+    used to list the records.
 
     Args:
         path (string): The directory to search for experiment records to 
         load.
 
+        lazy (bool, optional): If True, LazyExperiment instances are 
+        returned, which only read observations when they are accessed. If 
+        the directory has been indexed their parameters are taken from the
+        index, so no records are read at all. Defaults to False.
+
+        workers (int, optional): The number of workers to load records 
+        with. See load_experiments. Defaults to None.
+
+        processes (bool, optional): Whether workers are processes or 
+        threads. See load_experiments. Defaults to True.
+
     Returns:
         list[Experiment]: All the experiments that were located
         in the given directory.
     """
-    experiments = []
-    for file in os.listdir(path):
-        if file[-5:] == ".json":
-            experiments.append(load_experiment(path, file))
+    if has_index(path):
+        with ExperimentIndex(path) as index:
+            index.refresh()
+            if lazy:
+                experiments = [_lazy_experiment(path + name, params) for name, params in index.records()]
+            else:
+                experiments = load_experiments(path, index.names(), workers=workers, processes=processes)
+    else:
+        experiments = load_experiments(path, list_records(path), lazy, workers, processes)
 
     return sorted(experiments, key=lambda x: x.timestamp)
 
-def past_experiment_from_hash(path, hash_segment):
-    """Loads and returns the experiment which matches the given hash.
+def _indexed_matches(path, hash_segment):
+    with ExperimentIndex(path) as index:
+        matches = index.find(hash_segment)
+
+        if not matches or not all(index.is_current(name) for name in matches):
+            index.refresh()
+            matches = index.find(hash_segment)
+
+    return matches
+
+def past_experiment_from_hash(path, hash_segment, lazy=False):
+    """Loads and returns the experiment which matches the given hash. If 
+    the directory has been indexed the record is located using the index 
+    rather than by searching the directory.
 
     Args:
         path (string): The directory to search for experiments in.
@@ -97,6 +349,9 @@ def past_experiment_from_hash(path, hash_segment):
         hash_segment (string): At least 8 consecutive characters from the
         unique identifier hash of the sought experiment. 
 
+        lazy (bool, optional): If True, a LazyExperiment is returned. 
+        Defaults to False.
+
     Raises:
         ValueError: If hash_segment is less than 8 characters long.
         ValueError: If more than one experiment that matches hash_segment
@@ -111,50 +366,79 @@ def past_experiment_from_hash(path, hash_segment):
     if len(hash_segment) < 8:
         raise ValueError("Hash segment {} must be at least 8 characters long to avoid ambiguity".format(hash_segment))
 
-    past_experiments = [e for e in os.listdir(path) if e[-5:] == ".json"]
+    if has_index(path):
+        matches = _indexed_matches(path, hash_segment)
+    else:
+        # every shard is searched, since the segment may come from anywhere
+        # in the hash rather than from its start.
+        matches = [e for e in list_records(path) if hash_segment in e]
+
     experiment_name = None
 
-    for e in past_experiments:
-        if hash_segment in e:
-            if experiment_name is not None:
-                raise ValueError("At least two old experiments {} and {} found matching hash segment {}".format(experiment_name, e, hash_segment))
-            experiment_name = e
+    for e in matches:
+        if experiment_name is not None:
+            raise ValueError("At least two old experiments {} and {} found matching hash segment {}".format(experiment_name, e, hash_segment))
+        experiment_name = e
     
     if not experiment_name:
         raise ValueError("Could not locate experiment for hash segment {} in directory {}".format(hash_segment, path))
     
-    return load_experiment(path, experiment_name)
+    return load_experiment(path, experiment_name, lazy)
 
-def past_experiments_from_hashes(path, hash_segments):
+def past_experiments_from_hashes(path, hash_segments, lazy=False):
     """Loads all experiments that match one of the given hashes.
 
     Args:
         path (string): The directory to search for experiments in.
         hash_segments (list[string]): Hashes that uniquely identify sought
         experiments.
+        lazy (bool, optional): If True, LazyExperiment instances are 
+        returned. Defaults to False.
 
     Returns:
         list[Experiment]: All experiments that were located 
         that match one of the given hashes.
     """
-    return [past_experiment_from_hash(path, h) for h in hash_segments]
+    return [past_experiment_from_hash(path, h, lazy) for h in hash_segments]
+
+def _lazy_experiment(file_name, parameters):
+    return LazyExperiment(parameters, partial(read_observations, file_name))
 
-def load_experiment(path, name):
-    """Loads and returns the data for an experiment.
+def _read_experiment(file_name, lazy):
+    if lazy:
+        return _lazy_experiment(file_name, read_parameters(file_name))
+
+    return Experiment(read_record(file_name))
+
+def load_experiment(path, name, lazy=False):
+    """Loads and returns the data for an experiment. Experiments are 
+    cached, so loading an unchanged record again returns the same 
+    Experiment instance without reading the record. See researcher.cache.
 
     Args:
         path (string): The directory containing the experiment record.
-        name (string): The full filename of the experiment record.
+        name (string): The filename of the experiment record. The 
+        extension may be omitted, in which case an uncompressed record is
+        preferred to a compressed one. In a sharded directory the shard 
+        subdirectory may be omitted.
+        lazy (bool, optional): If True, only the parameters are read 
+        immediately and a LazyExperiment is returned. Defaults to False.
 
     Returns:
         researcher.Experiment: The data associated with that experiment
         including the experiment parameters and observations.
     """
-    file_name = path + name
+    file_name = _locate(path, name)
+
+    return EXPERIMENT_CACHE.get(file_name, lazy, partial(_read_experiment, file_name, lazy))
+
+def _locate(path, name):
+    candidates = [name] if is_record_file(name) else [name + extension for extension in RECORD_EXTENSIONS[::-1]]
 
-    if file_name[-5:] != ".json":
-        file_name += ".json"
+    for candidate in candidates:
+        if os.path.isfile(path + candidate):
+            return path + candidate
+        if is_sharded(path) and os.path.isfile(path + record_location(path, candidate)):
+            return path + record_location(path, candidate)
 
-    with open(file_name, "r") as f:
-        params = json.load(f)
-    return Experiment(params)
+    return path + candidates[0]
@@ -5,10 +5,32 @@ HASH_KEY = "hash"
 TIMESTAMP_KEY = "timestamp"
 DURATION_KEY = "duration"
 TITLE_KEY = "title"
+HASH_VERSION_KEY = "hash_version"
+# Stored under names which parameters are unlikely to use, and which
+# record_experiment refuses to overwrite.
+SCHEMA_KEY = "__schema__"
+SUMMARY_KEY = "__summary__"
 
 METADATA_KEYS = [
     HASH_KEY,
     TIMESTAMP_KEY,
     DURATION_KEY,
-    TITLE_KEY
+    TITLE_KEY,
+    HASH_VERSION_KEY,
+    SCHEMA_KEY,
+    SUMMARY_KEY
 ]
+
+RECORD_EXTENSION = ".json"
+GZIP_EXTENSION = ".gz"
+ZSTD_EXTENSION = ".zst"
+BINARY_EXTENSION = ".bin"
+LOG_EXTENSION = ".log"
+CSV_EXTENSION = ".csv"
+NPY_EXTENSION = ".npy"
+INDEX_NAME = ".researcher_index.sqlite"
+SHARDED_NAME = ".researcher_sharded"
+SHARD_LENGTH = 2
+
+# The most points per series passed to matplotlib by the dashboard.
+DEFAULT_MAX_POINTS = 2000
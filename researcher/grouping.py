@@ -0,0 +1,216 @@
+"""Contains helpers for grouping experiments which differ only in some of
+their parameters, such as their random seed, and aggregating their
+observations within each group with vectorized numpy operations.
+"""
+
+import warnings
+
+import numpy as np
+
+from researcher.matrix import metric_matrix
+from researcher.record import reduced_params
+from researcher.similarity import ParameterMatrix
+from researcher.summary import STATISTICS, fold_mean
+
+DEFAULT_QUANTILES = (0.25, 0.5, 0.75)
+
+class GroupedExperiments():
+    """Experiments bucketed by the values of some of their parameters.
+    Two experiments fall in the same group exactly when they have the same
+    value for every grouping key, lacking a key counting as a value.
+
+    Attributes:
+        experiments (list[Experiment]): The grouped experiments.
+
+        keys (list[string]): The parameter keys the experiments are
+        grouped by.
+
+        groups (list[dict]): The grouping parameters shared by the members
+        of each group.
+
+        indices (np.ndarray): The group of each experiment.
+
+        counts (np.ndarray): The number of experiments in each group.
+    """
+    def __init__(self, experiments, keys, indices):
+        self.experiments = experiments
+        self.keys = keys
+        self.indices = indices
+        self.counts = np.bincount(indices, minlength=indices.max(initial=-1) + 1)
+
+        _, firsts = np.unique(indices, return_index=True)
+        self.groups = [reduced_params(experiments[i].data, experiments[i].data.keys() - set(keys)) for i in firsts]
+
+    def __len__(self):
+        return len(self.groups)
+
+    def members(self, group):
+        """Returns the experiments in a single group.
+
+        Args:
+            group (int): The index of the group.
+
+        Returns:
+            list[Experiment]: The members of the group.
+        """
+        return [self.experiments[i] for i in np.flatnonzero(self.indices == group)]
+
+    def __padded(self, values):
+        # lays the values of each group out in a row of their own, padded
+        # with NaN to the size of the largest group.
+        order = np.argsort(self.indices, kind="stable")
+        starts = np.concatenate([[0], np.cumsum(self.counts)[:-1]])
+        positions = np.arange(len(order)) - starts[self.indices[order]]
+
+        padded = np.full((len(self), self.counts.max(initial=0)) + values.shape[1:], np.nan)
+        padded[self.indices[order], positions] = values[order]
+
+        return padded
+
+    def __aggregate(self, values, quantiles, ddof):
+        padded = self.__padded(values)
+
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", category=RuntimeWarning)
+            return {
+                "count": np.sum(~np.isnan(padded), axis=1),
+                "mean": np.nanmean(padded, axis=1),
+                "std": np.nanstd(padded, axis=1, ddof=ddof),
+                "quantiles": np.moveaxis(np.nanquantile(padded, quantiles, axis=1), 0, 1) if len(quantiles) else np.empty((len(self), 0) + values.shape[1:]),
+            }
+
+    def aggregate(self, metric, statistic="final", quantiles=DEFAULT_QUANTILES, ddof=0):
+        """Aggregates a summary statistic of one metric over the members
+        of each group. The statistic of each experiment is averaged over
+        its folds and read from its summary where it has one, so the
+        observations of summarized records are not read. The statistics
+        of the remaining experiments are computed together from a 
+        MetricMatrix.
+
+        Args:
+            metric (string): The name of the observation to aggregate.
+
+            statistic (string, optional): One of researcher.summary.
+            STATISTICS. Defaults to "final".
+
+            quantiles (tuple[float], optional): The quantiles to compute.
+            Defaults to the quartiles.
+
+            ddof (int, optional): The delta degrees of freedom of the
+            standard deviation. Defaults to 0.
+
+        Returns:
+            dict: The count of members observing the metric, and the mean
+            and standard deviation of their values, as arrays with one
+            value per group, and a (groups, quantiles) array of quantiles.
+            Groups without values have NaN statistics.
+
+        Raises:
+            ValueError: If statistic is not a known statistic.
+        """
+        if statistic not in STATISTICS:
+            raise ValueError(f"Unknown statistic {statistic}, expected one of {STATISTICS}")
+
+        values = np.full(len(self.experiments), np.nan)
+        unsummarized = []
+        for i, e in enumerate(self.experiments):
+            summary = e.summary()
+            if summary is None:
+                unsummarized.append(i)
+            elif metric in summary:
+                value = fold_mean(summary[metric][statistic])
+                values[i] = np.nan if value is None else value
+
+        if unsummarized:
+            values[unsummarized] = _matrix_statistic(metric_matrix([self.experiments[i] for i in unsummarized], metric), statistic)
+
+        return self.__aggregate(values, quantiles, ddof)
+
+    def aggregate_steps(self, metric, quantiles=DEFAULT_QUANTILES, ddof=0):
+        """Aggregates one metric step by step over the members of each
+        group. The value of each step of each experiment is averaged over
+        its folds first.
+
+        Args:
+            metric (string): The name of the observation to aggregate.
+
+            quantiles (tuple[float], optional): The quantiles to compute.
+            Defaults to the quartiles.
+
+            ddof (int, optional): The delta degrees of freedom of the
+            standard deviation. Defaults to 0.
+
+        Returns:
+            dict: As aggregate, but with an extra trailing steps dimension
+            on each array.
+        """
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", category=RuntimeWarning)
+            values = metric_matrix(self.experiments, metric).step_means()
+
+        return self.__aggregate(values, quantiles, ddof)
+
+def _matrix_statistic(matrix, statistic):
+    values = matrix.values
+    if values.size == 0:
+        return np.full(len(values), np.nan)
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", category=RuntimeWarning)
+
+        if statistic == "final":
+            folds = matrix.final_values()
+        elif statistic == "min":
+            folds = np.nanmin(values, axis=2)
+        elif statistic == "max":
+            folds = np.nanmax(values, axis=2)
+        elif statistic == "mean":
+            folds = np.nanmean(values, axis=2)
+        else:
+            missing = np.isnan(values)
+            filled = np.where(missing, np.inf if statistic == "argmin" else -np.inf, values)
+            steps = np.argmin(filled, axis=2) if statistic == "argmin" else np.argmax(filled, axis=2)
+            folds = np.where(np.all(missing, axis=2), np.nan, steps)
+
+        return np.nanmean(folds, axis=1)
+
+def group_experiments(experiments, exclude=("seed",), by=None):
+    """Buckets experiments by their parameters, ignoring the given keys,
+    as though each experiment's parameters were passed to reduced_params.
+    Metadata keys and observations are always ignored.
+
+    Args:
+        experiments (list[Experiment]): The experiments to group.
+
+        exclude (list[string], optional): The parameter keys to ignore.
+        Defaults to ("seed",).
+
+        by (list[string], optional): If given, experiments are grouped by
+        these keys only and exclude is ignored. Defaults to None.
+
+    Returns:
+        GroupedExperiments: The grouped experiments, with groups numbered
+        in the order their first members appear.
+    """
+    matrix = ParameterMatrix(experiments)
+
+    if by is None:
+        exclude = set(exclude)
+        columns = [i for i, key in enumerate(matrix.keys) if key not in exclude]
+    else:
+        by = set(by)
+        columns = [i for i, key in enumerate(matrix.keys) if key in by]
+
+    codes = matrix.codes[:, columns]
+    if len(experiments) == 0:
+        indices = np.zeros(0, dtype=int)
+    else:
+        _, firsts, inverse = np.unique(codes, axis=0, return_index=True, return_inverse=True)
+
+        # renumbers the groups so that they appear in the order of their
+        # first members rather than in the order of their codes.
+        renumbered = np.empty(len(firsts), dtype=int)
+        renumbered[np.argsort(firsts, kind="stable")] = np.arange(len(firsts))
+        indices = renumbered[inverse.reshape(-1)]
+
+    return GroupedExperiments(experiments, [matrix.keys[i] for i in columns], indices)
@@ -0,0 +1,456 @@
+"""Contains an on-disk index of the records in a records directory, which
+allows records to be listed and located by hash without reading every
+record file.
+"""
+
+import os
+import json
+import sqlite3
+
+from researcher.globals import HASH_KEY, INDEX_NAME, SUMMARY_KEY, TIMESTAMP_KEY, TITLE_KEY
+from researcher.recordfiles import file_hash, list_records, read_parameters
+from researcher.summary import STATISTICS, fold_mean
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS experiments (
+    file_name TEXT PRIMARY KEY,
+    file_hash TEXT,
+    hash TEXT,
+    title TEXT,
+    timestamp TEXT,
+    mtime_ns INTEGER,
+    size INTEGER,
+    parameters TEXT
+);
+CREATE INDEX IF NOT EXISTS experiments_file_hash ON experiments (file_hash);
+CREATE INDEX IF NOT EXISTS experiments_timestamp ON experiments (timestamp);
+CREATE TABLE IF NOT EXISTS parameter_values (
+    file_name TEXT,
+    key TEXT,
+    value_text TEXT,
+    value_num REAL
+);
+CREATE INDEX IF NOT EXISTS parameter_values_file_name ON parameter_values (file_name);
+CREATE INDEX IF NOT EXISTS parameter_values_text ON parameter_values (key, value_text);
+CREATE INDEX IF NOT EXISTS parameter_values_num ON parameter_values (key, value_num);
+CREATE TABLE IF NOT EXISTS summary_values (
+    file_name TEXT,
+    key TEXT,
+    statistic TEXT,
+    value REAL
+);
+CREATE INDEX IF NOT EXISTS summary_values_file_name ON summary_values (file_name);
+CREATE INDEX IF NOT EXISTS summary_values_value ON summary_values (key, statistic, value);
+"""
+
+# The number of seconds to wait for another process to finish writing to 
+# the index before giving up.
+INDEX_TIMEOUT = 60
+
+# Incremented whenever _SCHEMA or the way records are indexed changes.
+# Indexes created with an older version are discarded and rebuilt.
+INDEX_VERSION = 4
+
+_COMPARISONS = {
+    "eq": "=",
+    "ne": "!=",
+    "lt": "<",
+    "lte": "<=",
+    "gt": ">",
+    "gte": ">=",
+}
+
+def is_number(value):
+    """Indicates whether the given parameter value is compared numerically
+    by queries.
+
+    Args:
+        value (object): A parameter value.
+
+    Returns:
+        bool: True for ints and floats other than booleans.
+    """
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+def check_predicate(operator, value):
+    """Checks that an operator can be applied to a value in a query.
+
+    Args:
+        operator (string): One of eq, ne, lt, lte, gt, gte and in.
+
+        value (object): The value the operator is applied to.
+
+    Raises:
+        ValueError: If the operator is unknown, if an ordering operator is
+        applied to a value which is neither a number nor a string, or if
+        in is applied to something other than a list, tuple or set.
+    """
+    if operator == "in":
+        if not isinstance(value, (list, tuple, set)):
+            raise ValueError(f"Cannot apply operator in to {value}, expected a list, tuple or set of values")
+        return
+
+    if operator not in _COMPARISONS:
+        raise ValueError(f"Unknown query operator {operator}, expected one of {list(_COMPARISONS) + ['in']}")
+
+    if operator not in ["eq", "ne"] and not (is_number(value) or isinstance(value, str)):
+        raise ValueError(f"Cannot apply operator {operator} to non-numeric, non-string value {value}")
+
+def _condition(operator, value):
+    check_predicate(operator, value)
+
+    if operator == "in":
+        if not value:
+            return "0", []
+
+        conditions = [_condition("eq", v) for v in value]
+        return "(" + " OR ".join(sql for sql, _ in conditions) + ")", [arg for _, args in conditions for arg in args]
+
+    comparison = _COMPARISONS[operator]
+
+    if is_number(value):
+        return f"value_num {comparison} ?", [float(value)]
+    if operator in ["eq", "ne"]:
+        return f"value_text {comparison} ?", [json.dumps(value)]
+
+    # strings are only ordered against other strings, whose JSON begins
+    # with a quote.
+    return f"(value_text LIKE '\"%' AND value_text {comparison} ?)", [json.dumps(value)]
+
+def has_index(path):
+    """Indicates whether the given records directory has been indexed.
+
+    Args:
+        path (string): A records directory.
+
+    Returns:
+        bool: True if an index file exists in the directory.
+    """
+    return os.path.isfile(path + INDEX_NAME)
+
+def build_index(path):
+    """Creates an index for the given records directory, or brings an
+    existing index up to date.
+
+    Args:
+        path (string): The records directory to index.
+    """
+    with ExperimentIndex(path) as index:
+        index.refresh()
+
+class ExperimentIndex():
+    """A SQLite index of every record in a records directory.
+
+    The index lives in a single file inside the records directory. Each
+    entry holds the hash, title, timestamp and parameters of one record
+    along with the modification time and size of the record file at the
+    time it was indexed, so the index can be brought up to date by reading
+    only the records that have changed since.
+
+    Attributes:
+        path (string): The records directory being indexed.
+    """
+    def __init__(self, path):
+        """Opens the index for the given directory, creating it if it does
+        not exist yet.
+
+        Args:
+            path (string): The records directory to index.
+        """
+        self.path = path
+        self.__connection = sqlite3.connect(path + INDEX_NAME, timeout=INDEX_TIMEOUT)
+
+        # the version is set in the same transaction that creates the
+        # schema, so an index at the current version needs no write lock
+        # and can be opened by readers while another process writes, or
+        # from a read-only directory.
+        if self.__version() != INDEX_VERSION:
+            self.__migrate()
+
+    def __version(self):
+        version, = self.__connection.execute("PRAGMA user_version").fetchone()
+        return version
+
+    def __migrate(self):
+        # the schema is checked again while holding the write lock, so that
+        # two processes opening a new or outdated index cannot both rebuild
+        # it.
+        self.__connection.execute("BEGIN IMMEDIATE")
+        try:
+            if self.__version() != INDEX_VERSION:
+                self.__connection.execute("DROP TABLE IF EXISTS experiments")
+                self.__connection.execute("DROP TABLE IF EXISTS parameter_values")
+                self.__connection.execute("DROP TABLE IF EXISTS summary_values")
+
+                for statement in _SCHEMA.split(";"):
+                    self.__connection.execute(statement)
+
+                self.__connection.execute(f"PRAGMA user_version = {INDEX_VERSION}")
+        except BaseException:
+            self.__connection.rollback()
+            self.__connection.close()
+            raise
+
+        self.__connection.commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        """Closes the connection to the index file.
+        """
+        self.__connection.close()
+
+    def __insert(self, name, stat, parameters):
+        self.__connection.execute(
+            "INSERT OR REPLACE INTO experiments VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                name,
+                file_hash(name),
+                parameters.get(HASH_KEY),
+                parameters.get(TITLE_KEY),
+                parameters.get(TIMESTAMP_KEY),
+                stat.st_mtime_ns,
+                stat.st_size,
+                json.dumps(parameters),
+            )
+        )
+
+        self.__connection.execute("DELETE FROM parameter_values WHERE file_name = ?", (name,))
+        self.__connection.executemany(
+            "INSERT INTO parameter_values VALUES (?, ?, ?, ?)",
+            [(name, key, json.dumps(value), float(value) if is_number(value) else None) for key, value in parameters.items()]
+        )
+
+        self.__connection.execute("DELETE FROM summary_values WHERE file_name = ?", (name,))
+        self.__connection.executemany(
+            "INSERT INTO summary_values VALUES (?, ?, ?, ?)",
+            [
+                (name, key, statistic, fold_mean(statistics[statistic]))
+                for key, statistics in (parameters.get(SUMMARY_KEY) or {}).items()
+                for statistic in STATISTICS
+            ]
+        )
+
+    def __delete(self, names):
+        rows = [(name,) for name in names]
+        self.__connection.executemany("DELETE FROM experiments WHERE file_name = ?", rows)
+        self.__connection.executemany("DELETE FROM parameter_values WHERE file_name = ?", rows)
+        self.__connection.executemany("DELETE FROM summary_values WHERE file_name = ?", rows)
+
+    def add(self, name, parameters=None):
+        """Adds or updates the index entry for a single record.
+
+        Args:
+            name (string): The filename of the record, relative to the
+            records directory.
+
+            parameters (dict, optional): The parameters stored in the
+            record. If omitted they are read from the record file.
+        """
+        stat = os.stat(self.path + name)
+        if parameters is None:
+            parameters = read_parameters(self.path + name)
+
+        with self.__connection:
+            self.__insert(name, stat, parameters)
+
+    def add_all(self, records):
+        """Adds or updates the index entries for many records in a single
+        transaction.
+
+        Args:
+            records (list[tuple[string, dict]]): The filename of each 
+            record, relative to the records directory, and the parameters
+            stored in it.
+        """
+        stats = [os.stat(self.path + name) for name, _ in records]
+
+        with self.__connection:
+            for (name, parameters), stat in zip(records, stats):
+                self.__insert(name, stat, parameters)
+
+    def remove(self, names):
+        """Removes the index entries for the given records, if they have
+        any.
+
+        Args:
+            names (list[string]): The filenames of the records, relative
+            to the records directory.
+        """
+        with self.__connection:
+            self.__delete(names)
+
+    def refresh(self):
+        """Brings the index up to date with the records directory. Only
+        records which are new, or whose modification time or size has
+        changed since they were last indexed are read. Entries for records
+        which no longer exist are removed.
+
+        Records are read before the index is locked for writing, so other
+        processes are only blocked while the changes are written.
+        """
+        indexed = {name: (mtime_ns, size) for name, mtime_ns, size in self.__connection.execute("SELECT file_name, mtime_ns, size FROM experiments")}
+
+        changed = []
+        for name in list_records(self.path):
+            try:
+                stat = os.stat(self.path + name)
+                if indexed.pop(name, None) != (stat.st_mtime_ns, stat.st_size):
+                    changed.append((name, stat, read_parameters(self.path + name)))
+            except FileNotFoundError:
+                # the record was deleted or moved since it was listed.
+                continue
+
+        with self.__connection:
+            for name, stat, parameters in changed:
+                self.__insert(name, stat, parameters)
+
+            self.__delete(indexed)
+
+    def is_current(self, name):
+        """Checks whether the index entry for a record still matches the
+        record file on disk.
+
+        Args:
+            name (string): The filename of the record.
+
+        Returns:
+            bool: False if the record has been modified or deleted since it
+            was indexed, or was never indexed.
+        """
+        row = self.__connection.execute("SELECT mtime_ns, size FROM experiments WHERE file_name = ?", (name,)).fetchone()
+
+        try:
+            stat = os.stat(self.path + name)
+        except FileNotFoundError:
+            return False
+
+        return row == (stat.st_mtime_ns, stat.st_size)
+
+    def names(self):
+        """Returns the filenames of all indexed records.
+
+        Returns:
+            list[string]: The filename of every indexed record, ordered by
+            timestamp.
+        """
+        return [name for name, in self.__connection.execute("SELECT file_name FROM experiments ORDER BY timestamp")]
+
+    def entries(self):
+        """Returns the parameters of all indexed records.
+
+        Returns:
+            list[dict]: The parameters and metadata of every indexed
+            record, ordered by timestamp.
+        """
+        return [json.loads(params) for params, in self.__connection.execute("SELECT parameters FROM experiments ORDER BY timestamp")]
+
+    def records(self):
+        """Returns the filenames and parameters of all indexed records.
+
+        Returns:
+            list[tuple[string, dict]]: The filename and parameters of every
+            indexed record, ordered by timestamp.
+        """
+        return [(name, json.loads(params)) for name, params in self.__connection.execute("SELECT file_name, parameters FROM experiments ORDER BY timestamp")]
+
+    def parameters(self, name):
+        """Returns the parameters of a single indexed record.
+
+        Args:
+            name (string): The filename of the record.
+
+        Returns:
+            dict: The parameters and metadata stored in the record, or None
+            if the record has not been indexed.
+        """
+        row = self.__connection.execute("SELECT parameters FROM experiments WHERE file_name = ?", (name,)).fetchone()
+        return json.loads(row[0]) if row is not None else None
+
+    def find(self, hash_segment):
+        """Locates the records whose filenames contain the given segment.
+        A complete hash is looked up in the index of record hashes. Any
+        other segment may come from anywhere in a filename, so every
+        indexed filename is searched for it.
+
+        Args:
+            hash_segment (string): Part of the hash of the sought record.
+
+        Returns:
+            list[string]: The filenames of all matching records.
+        """
+        names = [name for name, in self.__connection.execute("SELECT file_name FROM experiments WHERE file_hash = ?", (hash_segment,))]
+
+        if names:
+            return names
+
+        return [name for name, in self.__connection.execute("SELECT file_name FROM experiments WHERE instr(file_name, ?) > 0", (hash_segment,))]
+
+    def select(self, predicates):
+        """Returns the records whose parameters satisfy every one of the 
+        given predicates, using only the index.
+
+        Args:
+            predicates (list[tuple[string, string, object]]): Triples of a
+            parameter key, an operator and a value. The operators are eq,
+            ne, lt, lte, gt, gte and in. Numbers are compared numerically
+            and strings lexically. A record which lacks a key never 
+            satisfies a predicate on that key.
+
+        Returns:
+            list[tuple[string, dict]]: The filename and parameters of every
+            matching record, ordered by timestamp.
+        """
+        conditions = []
+        args = []
+        for key, operator, value in predicates:
+            condition, condition_args = _condition(operator, value)
+            conditions.append(f"file_name IN (SELECT file_name FROM parameter_values WHERE key = ? AND {condition})")
+            args += [key] + condition_args
+
+        where = " WHERE " + " AND ".join(conditions) if conditions else ""
+
+        return [(name, json.loads(params)) for name, params in self.__connection.execute(f"SELECT file_name, parameters FROM experiments{where} ORDER BY timestamp", args)]
+
+    def rank(self, key, statistic="min", descending=False, limit=None):
+        """Orders the records by a summary statistic of one of their
+        observations, using only the index. Statistics of fold
+        observations are averaged over the folds. See researcher.summary.
+
+        Args:
+            key (string): The name of the observation.
+
+            statistic (string, optional): One of researcher.summary.
+            STATISTICS. Defaults to "min".
+
+            descending (bool, optional): If True, the largest values come
+            first. Defaults to False.
+
+            limit (int, optional): The most records to return. If None, 
+            every record with the statistic is returned. Defaults to None.
+
+        Returns:
+            list[tuple[string, dict, float]]: The filename, parameters and
+            statistic of each record which has the statistic, best first.
+
+        Raises:
+            ValueError: If statistic is not a known statistic.
+        """
+        if statistic not in STATISTICS:
+            raise ValueError(f"Unknown statistic {statistic}, expected one of {STATISTICS}")
+
+        order = "DESC" if descending else "ASC"
+        sql = (
+            "SELECT e.file_name, e.parameters, s.value FROM summary_values s JOIN experiments e ON e.file_name = s.file_name "
+            f"WHERE s.key = ? AND s.statistic = ? AND s.value IS NOT NULL ORDER BY s.value {order}, e.timestamp"
+        )
+        args = [key, statistic]
+        if limit is not None:
+            sql += " LIMIT ?"
+            args.append(limit)
+
+        return [(name, json.loads(params), value) for name, params, value in self.__connection.execute(sql, args)]
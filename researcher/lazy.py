@@ -0,0 +1,28 @@
+"""Contains helpers for recognising numpy values without importing numpy.
+numpy is only imported by the parts of researcher which need it, when they
+are first used, so that importing researcher stays fast.
+"""
+
+import sys
+
+def loaded_numpy():
+    """Returns the numpy module if it has already been imported. No value
+    can be a numpy value unless it has been.
+
+    Returns:
+        module: numpy, or None if it has not been imported.
+    """
+    return sys.modules.get("numpy")
+
+def is_ndarray(value):
+    """Indicates whether a value is a numpy array, without importing 
+    numpy.
+
+    Args:
+        value (object): Any value.
+
+    Returns:
+        bool: True if value is a numpy array.
+    """
+    np = loaded_numpy()
+    return np is not None and isinstance(value, np.ndarray)
@@ -0,0 +1,162 @@
+"""Contains helpers for gathering one metric from many experiments into a
+single dense array, so that comparisons across experiments can be made
+with vectorized numpy operations rather than python loops.
+"""
+
+import warnings
+
+import numpy as np
+
+def _as_folds(values):
+    if isinstance(values, (list, np.ndarray)) and len(values) > 0 and isinstance(values[0], (list, np.ndarray)):
+        return values
+    if isinstance(values, (list, np.ndarray)):
+        return [values]
+
+    return [[values]]
+
+class MetricMatrix():
+    """The values of a single metric across many experiments.
+
+    Every observation is treated as a set of folds, each a sequence of
+    steps. Non-fold series are treated as a single fold and single values
+    as a single fold with a single step.
+
+    Attributes:
+        metric (string): The name of the metric.
+
+        values (np.ndarray): An (experiments, folds, steps) array of metric
+        values. Experiments with fewer folds or folds with fewer steps than
+        the largest are padded with NaN, as are experiments which did not
+        observe the metric.
+
+        lengths (np.ndarray): An (experiments, folds) array of the number of
+        steps recorded for each fold of each experiment.
+
+        identifiers (np.ndarray): The identifier of each experiment.
+
+        hashes (np.ndarray): The hash of each experiment.
+    """
+    def __init__(self, metric, values, lengths, identifiers, hashes):
+        self.metric = metric
+        self.values = values
+        self.lengths = lengths
+        self.identifiers = identifiers
+        self.hashes = hashes
+
+    def final_values(self):
+        """Returns the last recorded value of each fold of each experiment.
+
+        Returns:
+            np.ndarray: An (experiments, folds) array, NaN for folds with no
+            values.
+        """
+        indices = np.maximum(self.lengths - 1, 0)[:, :, np.newaxis]
+        finals = np.take_along_axis(self.values, indices, axis=2)[:, :, 0]
+
+        return np.where(self.lengths > 0, finals, np.nan)
+
+    def final_means(self):
+        """Returns the last recorded value of each experiment averaged over
+        its folds.
+
+        Returns:
+            np.ndarray: An array with one value per experiment, NaN for
+            experiments which did not observe the metric.
+        """
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", category=RuntimeWarning)
+            return np.nanmean(self.final_values(), axis=1)
+
+    def step_means(self):
+        """Returns the value of each step of each experiment averaged over
+        its folds.
+
+        Returns:
+            np.ndarray: An (experiments, steps) array.
+        """
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", category=RuntimeWarning)
+            return np.nanmean(self.values, axis=1)
+
+    def best_steps(self, minimize=True):
+        """Returns the step at which each experiment's fold-averaged value
+        was best.
+
+        Args:
+            minimize (bool, optional): If True the lowest value is best,
+            otherwise the highest. Defaults to True.
+
+        Returns:
+            np.ndarray: The best step of each experiment, -1 for experiments
+            which did not observe the metric.
+        """
+        means = self.step_means()
+        observed = ~np.all(np.isnan(means), axis=1)
+
+        filled = np.where(np.isnan(means), np.inf if minimize else -np.inf, means)
+        best = np.argmin(filled, axis=1) if minimize else np.argmax(filled, axis=1)
+
+        return np.where(observed, best, -1)
+
+    def ranking(self, minimize=True):
+        """Orders the experiments by their fold-averaged final values.
+
+        Args:
+            minimize (bool, optional): If True lower values rank first,
+            otherwise higher values do. Defaults to True.
+
+        Returns:
+            np.ndarray: The indices of the experiments from best to worst.
+            Experiments which did not observe the metric rank last.
+        """
+        means = self.final_means()
+
+        return np.argsort(means if minimize else -means, kind="stable")
+
+def metric_matrix(experiments, metric):
+    """Gathers the values of one metric from many experiments into a
+    MetricMatrix.
+
+    Args:
+        experiments (list[Experiment]): The experiments to gather values
+        from.
+
+        metric (string): The metric to gather.
+
+    Returns:
+        MetricMatrix: The values of the metric across every experiment.
+    """
+    folds = [_as_folds(e.observations[metric]) if e.has_observation(metric) else [] for e in experiments]
+
+    n_folds = max([len(f) for f in folds], default=0)
+    lengths = np.zeros((len(experiments), n_folds), dtype=int)
+    for i, experiment_folds in enumerate(folds):
+        lengths[i, :len(experiment_folds)] = [len(fold) for fold in experiment_folds]
+
+    values = np.full((len(experiments), n_folds, lengths.max(initial=0)), np.nan)
+    for i, experiment_folds in enumerate(folds):
+        for j, fold in enumerate(experiment_folds):
+            values[i, j, :len(fold)] = fold
+
+    return MetricMatrix(
+        metric,
+        values,
+        lengths,
+        np.array([e.identifier() for e in experiments]),
+        np.array([e.get_hash() for e in experiments]),
+    )
+
+def metric_matrices(experiments, metrics):
+    """Gathers the values of several metrics from many experiments.
+
+    Args:
+        experiments (list[Experiment]): The experiments to gather values
+        from.
+
+        metrics (list[string]): The metrics to gather.
+
+    Returns:
+        dict: A MetricMatrix for each metric, keyed by metric name.
+    """
+    return {metric: metric_matrix(experiments, metric) for metric in metrics}
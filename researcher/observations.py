@@ -1,5 +1,9 @@
-from numpy.lib.arraysetops import isin
+from array import array
+from collections.abc import Mapping
+
 from researcher.globals import *
+from researcher.lazy import is_ndarray, loaded_numpy
+from researcher.schema import infer_schema
 
 class Observations():
     """A light wrapper around experiment observations.
@@ -19,17 +23,30 @@ class ObservationCollector(Observations):
         self.__fold_data = set()
         self.__non_fold_data = set()
 
-    def __add_fold_value(self, fold, key, value):
-        self.observations[key][fold].append(value)
-
-    def __add_fold(self, fold, key):
+    def _add_fold_values(self, fold, key, values):
+        # Subclasses override this and _set_value to change how 
+        # observations are stored.
         if not key in self.observations:
             self.observations[key] = []
-            self.__fold_data.add(key)
         
         while len(self.observations[key]) <= fold:
             self.observations[key].append([])
 
+        self.observations[key][fold].extend(values)
+
+    def _set_value(self, key, value):
+        self.observations[key] = value
+
+    def schema(self):
+        """Describes the shape of every collected observation. Keys which
+        were added as fold observations are always described as folds.
+
+        Returns:
+            dict: The description of each observation, keyed by name. See 
+            researcher.schema.key_schema.
+        """
+        return infer_schema(self.observations, self.__fold_data)
+
     def add_tensorflow_history(self, fold, history):
         """Adds all the data in a tensorflow History instance to the 
         specified fold.
@@ -56,11 +73,11 @@ class ObservationCollector(Observations):
         Raises:
             ValueError: If the given key is already being used to store values.
         """
-        if key in self.observations:
+        if key in self.__fold_data or key in self.__non_fold_data:
             raise ValueError(f"key {key} is already being used to store the following observations: {self.observations[key]}")
 
         self.__non_fold_data.add(key)
-        self.observations[key] = value
+        self._set_value(key, value)
 
     def set_observations(self, obs_dict):
         """Stores the whole dictionary of data as experiment observations.
@@ -94,8 +111,8 @@ class ObservationCollector(Observations):
         if key in self.__non_fold_data:
             raise ValueError(f"Cannot add fold data to {key}, since this key is already being used to store non-fold related observations")
 
-        self.__add_fold(fold, key)
-        self.__add_fold_value(fold, key, value)
+        self.__fold_data.add(key)
+        self._add_fold_values(fold, key, [value])
 
     def add_fold_observations(self, fold, key, values):
         """Appends multiple values to the list of values associated with 
@@ -113,9 +130,121 @@ class ObservationCollector(Observations):
         if key in self.__non_fold_data:
             raise ValueError(f"Cannot add fold data to {key}, since this key is already being used to store non-fold related observations")
 
-        self.__add_fold(fold, key)
-        for value in values:
-            self.__add_fold_value(fold, key, value)
+        self.__fold_data.add(key)
+        self._add_fold_values(fold, key, list(values))
+
+# The typecode used to store the values of each type, when the typecode
+# of a CompactObservationCollector is chosen per observation.
+_TYPECODES = {int: "q", float: "d"}
+
+def _typecode(value_type):
+    if value_type in _TYPECODES:
+        return _TYPECODES[value_type]
+
+    # numpy scalars which fit in 8 bytes are stored like python numbers.
+    np = loaded_numpy()
+    if np is None or value_type is None or not issubclass(value_type, np.generic) or np.dtype(value_type).itemsize > 8:
+        return None
+    if issubclass(value_type, np.floating):
+        return "d"
+    if issubclass(value_type, np.signedinteger) or (issubclass(value_type, np.unsignedinteger) and np.dtype(value_type).itemsize < 8):
+        return "q"
+
+    return None
+
+class CompactObservationCollector(ObservationCollector):
+    """An ObservationCollector which stores each fold of each fold 
+    observation in a typed array rather than a list, using 8 bytes per 
+    value instead of the 30 or more taken by a float in a list. If a value
+    which cannot be stored in a typed array is added to a fold, that fold 
+    falls back to being stored as a list.
+
+    By default the type of each observation is taken from its first value:
+    ints are stored as 64 bit integers and floats as doubles, as are numpy
+    integer and floating point scalars, which are collected as the 
+    equivalent python numbers. Any other values are stored in lists. A 
+    fold falls back to a list as soon as a value of another type is added
+    to it, so the collected observations always equal ObservationCollector's.
+    """
+    def __init__(self, typecode=None):
+        """Instantiates a CompactObservationCollector.
+
+        Args:
+            typecode (string, optional): The array.array typecode used to 
+            store the values of every fold, which are converted to it. If
+            None, the typecode of each observation is chosen from its 
+            first value. Defaults to None.
+        """
+        self.typecode = typecode
+        self.__data = {}
+        self.__fold_keys = set()
+        self.__typecodes = {}
+
+        super().__init__()
+
+    @property
+    def observations(self):
+        """dict: All collected observations, with every fold converted to a
+        list.
+        """
+        return {key: [list(fold) for fold in value] if key in self.__fold_keys else value for key, value in self.__data.items()}
+
+    @observations.setter
+    def observations(self, observations):
+        # ObservationCollector initializes observations to an empty 
+        # dictionary, which is nothing to store.
+        pass
+
+    def fold_arrays(self, key):
+        """Returns the folds of a fold observation as numpy arrays.
+
+        Args:
+            key (string): The name of a fold observation.
+
+        Returns:
+            list[np.ndarray]: A copy of each fold of the observation.
+        """
+        import numpy as np
+
+        return [np.array(fold) for fold in self.__data[key]]
+
+    def _add_fold_values(self, fold, key, values):
+        if not key in self.__data:
+            self.__data[key] = []
+            self.__fold_keys.add(key)
+            if self.typecode is not None:
+                self.__typecodes[key] = (self.typecode, None)
+            else:
+                value_type = type(values[0]) if values else None
+                self.__typecodes[key] = (_typecode(value_type), value_type)
+
+        typecode, value_type = self.__typecodes[key]
+        folds = self.__data[key]
+        while len(folds) <= fold:
+            folds.append(array(typecode) if typecode is not None else [])
+
+        values_fold = folds[fold]
+        if isinstance(values_fold, list):
+            values_fold.extend(values)
+            return
+
+        # with a typecode chosen per observation, values of any other type
+        # are kept as they are rather than converted.
+        try:
+            if len(values) == 1:
+                value = values[0]
+                if value_type is not None and type(value) is not value_type:
+                    raise TypeError
+                values_fold.append(value)
+            else:
+                if value_type is not None and any(type(v) is not value_type for v in values):
+                    raise TypeError
+                values_fold.extend(array(typecode, values))
+        except (TypeError, OverflowError):
+            folds[fold] = list(values_fold) + list(values)
+
+    def _set_value(self, key, value):
+        self.__data[key] = value
 
 class FinalizedObservations(Observations):
     """Observations loaded from an already completed experiment. 
@@ -123,6 +252,60 @@ class FinalizedObservations(Observations):
     def __init__(self, observations):
         super().__init__(observations)
 
+        self.__downsampled = {}
+
+    def __downsample(self, key, max_points, mean):
+        cache_key = (key, max_points, mean)
+        if cache_key not in self.__downsampled:
+            from researcher.sampling import downsample, fold_mean
+
+            values = self.observations[key]
+            if mean:
+                self.__downsampled[cache_key] = downsample(fold_mean(values), max_points)
+            else:
+                folds = values if len(values) > 0 and (isinstance(values[0], list) or is_ndarray(values[0])) else [values]
+                self.__downsampled[cache_key] = [downsample(fold, max_points) for fold in folds]
+
+        return self.__downsampled[cache_key]
+
+    def downsampled_folds(self, key, max_points=DEFAULT_MAX_POINTS):
+        """Reduces each fold of an observation to at most max_points points
+        for plotting, keeping the smallest and largest values. See 
+        researcher.sampling. Results are cached, so plotting the same 
+        observation again is fast. 
+
+        Args:
+            key (string): The name of an observation which is a series or
+            a fold observation.
+
+            max_points (int, optional): The most points to keep per fold.
+            Defaults to 2000.
+
+        Returns:
+            list[tuple[np.ndarray, np.ndarray]]: The steps and values of 
+            the points kept from each fold. A series which is not a fold
+            observation is treated as a single fold.
+        """
+        return self.__downsample(key, max_points, False)
+
+    def downsampled_mean(self, key, max_points=DEFAULT_MAX_POINTS):
+        """Averages an observation over its folds and reduces the average
+        to at most max_points points for plotting, keeping the smallest 
+        and largest values. Results are cached.
+
+        Args:
+            key (string): The name of an observation which is a series or
+            a fold observation.
+
+            max_points (int, optional): The most points to keep. Defaults 
+            to 2000.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: The steps and values of the kept
+            points.
+        """
+        return self.__downsample(key, max_points, True)
+
     def has_observation(self, key):
         """
         Args:
@@ -154,13 +337,56 @@ class FinalizedObservations(Observations):
         """
         values = self.observations[key]
         
-        if not isinstance(values, list):
+        if not (isinstance(values, list) or is_ndarray(values)):
             return values
 
         if len(values) == 0:
             raise ValueError(f"expected key {key} to have some values associated with it, got {values}")
 
-        if isinstance(values[0], list):
+        if isinstance(values[0], list) or is_ndarray(values[0]):
             return [fold[-1] for fold in values]
 
-        return values[-1]
\ No newline at end of file
+        return values[-1]
+
+class LazyObservations(Mapping):
+    """A read-only mapping of experiment observations which are only 
+    loaded when they are first accessed.
+    """
+    def __init__(self, load):
+        """Instantiates a LazyObservations.
+
+        Args:
+            load (callable): Takes no arguments and returns the dictionary
+            of observations. Called at most once.
+        """
+        self.__load = load
+        self.__observations = None
+
+    def __loaded(self):
+        if self.__observations is None:
+            self.__observations = self.__load() or {}
+        
+        return self.__observations
+
+    def is_loaded(self):
+        """
+        Returns:
+            bool: An indicator of whether the observations have been 
+            loaded yet.
+        """
+        return self.__observations is not None
+
+    def __getitem__(self, key):
+        return self.__loaded()[key]
+
+    def __contains__(self, key):
+        return key in self.__loaded()
+
+    def __iter__(self):
+        return iter(self.__loaded())
+
+    def __len__(self):
+        return len(self.__loaded())
+
+    def __repr__(self):
+        return repr(self.__loaded()) if self.is_loaded() else "LazyObservations(<not loaded>)"
@@ -0,0 +1,119 @@
+"""Contains helpers for finding the experiments in a records directory
+whose parameters satisfy some conditions, without reading observations.
+"""
+
+import json
+import operator
+from functools import partial
+
+from researcher.experiment import LazyExperiment
+from researcher.fileutils import load_experiments
+from researcher.index import ExperimentIndex, check_predicate, has_index, is_number
+from researcher.recordfiles import list_records, read_observations, read_parameters
+
+_OPERATORS = {
+    "eq": operator.eq,
+    "ne": operator.ne,
+    "lt": operator.lt,
+    "lte": operator.le,
+    "gt": operator.gt,
+    "gte": operator.ge,
+}
+
+def parse_predicates(conditions):
+    """Converts keyword query conditions into predicates. A condition 
+    named key__operator applies that operator to the key, while a 
+    condition named only by key tests for equality.
+
+    Args:
+        conditions (dict): Query conditions, e.g. {"model": "rnn", 
+        "learning_rate__lt": 1e-3}.
+
+    Returns:
+        list[tuple[string, string, object]]: Triples of a parameter key, an
+        operator and a value.
+
+    Raises:
+        ValueError: If an operator cannot be applied to its value. See
+        researcher.index.check_predicate.
+    """
+    predicates = []
+    for name, value in conditions.items():
+        key, _, operator_name = name.rpartition("__")
+        if operator_name in _OPERATORS or operator_name == "in":
+            predicates.append((key, operator_name, value))
+        else:
+            predicates.append((name, "eq", value))
+
+        check_predicate(*predicates[-1][1:])
+
+    return predicates
+
+def satisfies(params, predicate):
+    """Indicates whether a set of parameters satisfies a predicate, 
+    following the same rules as ExperimentIndex.select.
+
+    Args:
+        params (dict): The parameters of an experiment.
+
+        predicate (tuple[string, string, object]): A parameter key, an 
+        operator and a value.
+
+    Returns:
+        bool: True if the parameters satisfy the predicate.
+    """
+    key, operator_name, value = predicate
+
+    if key not in params:
+        return False
+    if operator_name == "in":
+        return any(satisfies(params, (key, "eq", v)) for v in value)
+
+    actual = params[key]
+    compare = _OPERATORS[operator_name]
+
+    if is_number(value):
+        return is_number(actual) and compare(actual, value)
+    if operator_name in ["eq", "ne"] or (isinstance(value, str) and isinstance(actual, str)):
+        return compare(json.dumps(actual), json.dumps(value))
+
+    return False
+
+def query(path, lazy=True, **conditions):
+    """Finds the experiments in a records directory whose parameters 
+    satisfy all the given conditions, e.g. query("records/", model="rnn", 
+    learning_rate__lt=1e-3). The operators eq, ne, lt, lte, gt, gte and in
+    are supported. Numbers are compared numerically and strings lexically,
+    and experiments lacking a key never satisfy a condition on it.
+
+    If the directory has been indexed the index is brought up to date and
+    searched. Otherwise the parameters of every record are read.
+
+    Args:
+        path (string): The records directory to search.
+
+        lazy (bool, optional): If True, LazyExperiment instances are 
+        returned, which only read observations when they are accessed. 
+        Defaults to True.
+
+        **conditions: The conditions experiments must satisfy.
+
+    Returns:
+        list[Experiment]: The matching experiments, sorted by timestamp.
+    """
+    predicates = parse_predicates(conditions)
+
+    if has_index(path):
+        with ExperimentIndex(path) as index:
+            index.refresh()
+            records = index.select(predicates)
+    else:
+        records = [(name, read_parameters(path + name)) for name in list_records(path)]
+        records = [(name, params) for name, params in records if all(satisfies(params, p) for p in predicates)]
+
+    if lazy:
+        experiments = [LazyExperiment(params, partial(read_observations, path + name)) for name, params in records]
+    else:
+        experiments = load_experiments(path, [name for name, _ in records])
+
+    return sorted(experiments, key=lambda x: x.timestamp)
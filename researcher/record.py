@@ -7,6 +7,11 @@ import copy
 
 from researcher.fileutils import *
 from researcher.globals import *
+from researcher.index import ExperimentIndex, has_index
+from researcher.compression import record_extension, sibling_names
+from researcher.recordfiles import shard_of
+from researcher.schema import infer_schema
+from researcher.summary import summarize
 
 def reduced_params(params, unwanted_keys):
     """Create a copy of params with the selected fields removed.
@@ -25,7 +30,25 @@ def reduced_params(params, unwanted_keys):
 
     return {k: params[k] for k in params.keys() - unwanted_keys}
 
-def record_experiment_with_collector(params, save_path, collector=None, duration=None):
+def record_name(params, hash_version=DEFAULT_HASH_VERSION):
+    """Returns the name that record_experiment gives to the record of an
+    experiment with the given parameters.
+
+    Args:
+        params (dict): The parameters that define the experimental 
+        conditions of the experiment.
+
+        hash_version (int, optional): The hashing scheme used to name the
+        record. See get_hash. Defaults to 1.
+
+    Returns:
+        string: The filename of the record, without an extension.
+    """
+    title = params["title"] if "title" in params else "no_title"
+
+    return "{}_{}".format(title, get_hash(params, hash_version))
+
+def record_experiment_with_collector(params, save_path, collector=None, duration=None, binary=False, hash_version=DEFAULT_HASH_VERSION, compression=None):
     """Saves the experiment parameters and observations by unpacking those 
     observations from a researcher.ObservationCollector instance.
 
@@ -42,14 +65,28 @@ def record_experiment_with_collector(params, save_path, collector=None, duration
 
         duration (datetime.timedelta, optional): The time elapsed between
         the start and the end of the experiment. Defaults to None.
+
+        binary (bool, optional): If True, numeric observations are stored
+        in a binary file alongside the record. See save_experiment. 
+        Defaults to False.
+
+        hash_version (int, optional): The hashing scheme used to name the
+        record. See get_hash. Defaults to 1.
+
+        compression (string, optional): "gzip" or "zstd" to compress the
+        record. See record_experiment. Defaults to None.
     """
     observations = collector.observations if collector is not None else None
+    schema = collector.schema() if collector is not None else {}
 
-    record_experiment(params, save_path, observations, duration)
+    _record_experiment(params, save_path, observations, duration, binary, hash_version, compression, schema)
 
-def record_experiment(params, save_path, observations=None, duration=None):
+def record_experiment(params, save_path, observations=None, duration=None, binary=False, hash_version=DEFAULT_HASH_VERSION, compression=None):
     """Saves the parameters and associated experiment observations to a 
-    JSON experiment record.
+    JSON experiment record. If save_path has been indexed, the new record
+    is added to the index. A description of the shape of each observation
+    and summary statistics of each numeric series are stored with the
+    parameters, see researcher.schema and researcher.summary.
 
     Args:
         params (dict): The parameters that define the experimental 
@@ -63,23 +100,124 @@ def record_experiment(params, save_path, observations=None, duration=None):
 
         duration (datetime.timedelta, optional): The time elapsed between
         the start and the end of the experiment. Defaults to None.
+
+        binary (bool, optional): If True, numeric observations are stored
+        in a binary file alongside the record. See save_experiment. 
+        Defaults to False.
+
+        hash_version (int, optional): The hashing scheme used to name the
+        record. Records hashed with any scheme other than version 1 store
+        the version they used. See get_hash. Defaults to 1.
+
+        compression (string, optional): "gzip" or "zstd" to compress the
+        record. Compressed records are also written compactly. See 
+        save_experiment. Defaults to None.
+
+    Raises:
+        ValueError: If params uses a key reserved for the metadata stored 
+        alongside it, such as the observation schema and summary.
     """
-    if not os.path.isdir(save_path):
-        os.mkdir(save_path)
+    _record_experiment(params, save_path, observations, duration, binary, hash_version, compression, infer_schema(observations))
+
+def _record_experiment(params, save_path, observations, duration, binary, hash_version, compression, schema):
+    os.makedirs(save_path, exist_ok=True)
 
-    cloned_params = copy.deepcopy(params)
-    param_hash = get_hash(cloned_params)
+    timestamp = datetime.datetime.now().strftime(DATE_FORMAT)
+    name, cloned_params = _record_parameters(copy.deepcopy(params), timestamp, duration, hash_version, observations, schema)
+
+    saved_name = save_experiment(save_path, name, parameters=cloned_params, observations=observations, binary=binary, compact=compression is not None, compression=compression)
+
+    if has_index(save_path):
+        with ExperimentIndex(save_path) as index:
+            index.add(saved_name, cloned_params)
+            index.remove(sibling_names(saved_name))
+
+def _record_parameters(cloned_params, timestamp, duration, hash_version, observations, schema):
+    for key in [SCHEMA_KEY, SUMMARY_KEY]:
+        if key in cloned_params:
+            raise ValueError(f"The parameter key {key} is reserved for the observation schema and summary")
+
+    param_hash = get_hash(cloned_params, hash_version)
 
     cloned_params["hash"] = param_hash
-    cloned_params["timestamp"] = datetime.datetime.now().strftime(DATE_FORMAT)
+    if hash_version != DEFAULT_HASH_VERSION:
+        cloned_params[HASH_VERSION_KEY] = hash_version
+    cloned_params["timestamp"] = timestamp
 
     if duration is not None:
         cloned_params["duration"] = duration.total_seconds()
 
+    cloned_params[SCHEMA_KEY] = schema
+    cloned_params[SUMMARY_KEY] = summarize(observations, schema)
+
     if "title" in cloned_params:
         title = cloned_params["title"]
     else:
         title = "no_title"
 
-    save_experiment(save_path, "{}_{}".format(title, param_hash), parameters=cloned_params, observations=observations)
+    return "{}_{}".format(title, param_hash), cloned_params
 
+def record_experiments(batch, save_path, binary=False, hash_version=DEFAULT_HASH_VERSION, compression=None, durable=False):
+    """Saves many experiments at once, exactly as repeated calls to 
+    record_experiment would, but checking the records directory and 
+    opening its index only once. Records are written compactly, which is
+    much faster to encode.
+
+    Args:
+        batch (list[tuple]): A tuple for each experiment of its parameters
+        and observations, optionally followed by its duration as a
+        datetime.timedelta and the time it was recorded as a 
+        datetime.datetime. Observations and durations may be None. 
+        Experiments without a time are recorded at the time of the call.
+
+        save_path (string): The parent directory in which to save 
+        experiment observations.
+
+        binary (bool, optional): If True, numeric observations are stored
+        in a binary file alongside each record. See save_experiment. 
+        Defaults to False.
+
+        hash_version (int, optional): The hashing scheme used to name the
+        records. See get_hash. Defaults to 1.
+
+        compression (string, optional): "gzip" or "zstd" to compress the
+        records. See save_experiment. Defaults to None.
+
+        durable (bool, optional): If True, every record is flushed to disk
+        before this returns, so that they survive a crash. See 
+        atomic_open. Defaults to False.
+
+    Returns:
+        list[string]: The filename of each saved record, relative to 
+        save_path.
+    """
+    os.makedirs(save_path, exist_ok=True)
+
+    sharded = is_sharded(save_path)
+    timestamp = datetime.datetime.now().strftime(DATE_FORMAT)
+    extension = record_extension(compression)
+
+    shards = set()
+    saved = []
+    for params, observations, *extra in batch:
+        duration = extra[0] if extra else None
+        recorded = extra[1].strftime(DATE_FORMAT) if len(extra) > 1 else timestamp
+        name, cloned_params = _record_parameters(dict(params), recorded, duration, hash_version, observations, infer_schema(observations))
+
+        saved_name = name + extension
+        if sharded:
+            shard = shard_of(saved_name)
+            if shard not in shards:
+                os.makedirs(save_path + shard, exist_ok=True)
+                shards.add(shard)
+            saved_name = shard + "/" + saved_name
+
+        write_record(save_path + saved_name, cloned_params, observations, binary, compact=True, durable=durable)
+        saved.append((saved_name, cloned_params))
+
+    if has_index(save_path):
+        with ExperimentIndex(save_path) as index:
+            index.add_all(saved)
+            index.remove([sibling for name, _ in saved for sibling in sibling_names(name)])
+
+    return [name for name, _ in saved]
@@ -0,0 +1,222 @@
+"""Contains low level helpers for locating and reading experiment record
+files on disk.
+"""
+
+import os
+import re
+import json
+
+from researcher.compression import RECORD_EXTENSIONS, open_record, strip_record_extension
+from researcher.globals import OBSERVATIONS_NAME, SHARD_LENGTH, SHARDED_NAME
+from researcher.storage import has_binary_observations, load_binary_observations
+
+HEADER_CHUNK_SIZE = 8192
+
+_DECODER = json.JSONDecoder()
+_WHITESPACE = re.compile(r"\s*")
+
+def is_record_file(name):
+    """Indicates whether the given filename refers to an experiment record.
+
+    Args:
+        name (string): The name of a file in a records directory.
+
+    Returns:
+        bool: True if the file is an experiment record, compressed or not.
+    """
+    return any(name.endswith(extension) for extension in RECORD_EXTENSIONS)
+
+def file_hash(name):
+    """Returns the hash in the filename of a record. Records are saved as
+    {title}_{hash}.json, so this is whatever follows the final underscore.
+
+    Args:
+        name (string): The filename of a record.
+
+    Returns:
+        string: The hash of the record.
+    """
+    return strip_record_extension(os.path.basename(name)).rsplit("_", 1)[-1]
+
+def is_sharded(path):
+    """Indicates whether a records directory uses the sharded layout, in 
+    which each record is saved in a subdirectory named after the first 
+    characters of its hash rather than in the directory itself.
+
+    Args:
+        path (string): A records directory.
+
+    Returns:
+        bool: True if the directory is sharded.
+    """
+    return os.path.isfile(path + SHARDED_NAME)
+
+def shard_of(name):
+    """Returns the subdirectory a record belongs in under the sharded 
+    layout.
+
+    Args:
+        name (string): The filename of a record.
+
+    Returns:
+        string: The name of the subdirectory.
+    """
+    return file_hash(name)[:SHARD_LENGTH]
+
+def record_location(path, name):
+    """Returns where a new record with the given filename should be saved
+    in a records directory.
+
+    Args:
+        path (string): The records directory.
+
+        name (string): The filename of the record.
+
+    Returns:
+        string: The path to the record, relative to the records directory.
+    """
+    if is_sharded(path):
+        return shard_of(name) + "/" + name
+
+    return name
+
+def _shards(path):
+    return [entry for entry in os.listdir(path) if len(entry) == SHARD_LENGTH and os.path.isdir(path + entry)]
+
+def list_records(path, shards=None):
+    """Lists the filenames of all experiment records in a directory. If 
+    the directory is sharded, records in its shard subdirectories are 
+    listed as well.
+
+    Args:
+        path (string): The directory to search for experiment records.
+
+        shards (list[string], optional): If given, only these shard 
+        subdirectories are searched. Defaults to None.
+
+    Returns:
+        list[string]: The filenames, relative to path, of every record in 
+        the directory.
+    """
+    names = [name for name in os.listdir(path) if is_record_file(name)]
+
+    if is_sharded(path):
+        for shard in (_shards(path) if shards is None else shards):
+            if os.path.isdir(path + shard):
+                names += [shard + "/" + name for name in os.listdir(path + shard) if is_record_file(name)]
+
+    return names
+
+def _read_json(file_name):
+    with open_record(file_name) as f:
+        return json.load(f)
+
+def read_record(file_name):
+    """Reads all the data stored in a single experiment record. Any 
+    observations stored in an accompanying binary file are memory mapped.
+
+    Args:
+        file_name (string): The full path to the record.
+
+    Returns:
+        dict: The parameters and observations stored in the record.
+    """
+    data = _read_json(file_name)
+    observations = data.get(OBSERVATIONS_NAME)
+
+    if has_binary_observations(observations):
+        data[OBSERVATIONS_NAME] = load_binary_observations(file_name, observations)
+
+    return data
+
+def read_observations(file_name):
+    """Reads the observations stored in a single experiment record.
+
+    Args:
+        file_name (string): The full path to the record.
+
+    Returns:
+        dict: The observations stored in the record, or None if there are
+        none.
+    """
+    return read_record(file_name).get(OBSERVATIONS_NAME)
+
+class _IncompleteHeader(Exception):
+    pass
+
+def _skip_whitespace(text, index):
+    return _WHITESPACE.match(text, index).end()
+
+def _expect(text, index, character):
+    if index >= len(text):
+        raise _IncompleteHeader()
+    if text[index] != character:
+        raise ValueError(f"Expected {character!r} at position {index} of record, found {text[index]!r}")
+
+    return index + 1
+
+def _parse_header(text):
+    # Parses the top level keys of a record one at a time, stopping at the
+    # observations key rather than decoding its value.
+    parameters = {}
+    index = _expect(text, _skip_whitespace(text, 0), "{")
+
+    while True:
+        index = _skip_whitespace(text, index)
+        if index < len(text) and text[index] == "}":
+            return parameters
+
+        try:
+            key, index = _DECODER.raw_decode(text, index)
+            index = _expect(text, _skip_whitespace(text, index), ":")
+            index = _skip_whitespace(text, index)
+
+            if key == OBSERVATIONS_NAME:
+                return parameters
+
+            value, index = _DECODER.raw_decode(text, index)
+        except json.JSONDecodeError:
+            raise _IncompleteHeader()
+
+        parameters[key] = value
+
+        index = _skip_whitespace(text, index)
+        if index < len(text) and text[index] == ",":
+            index += 1
+        else:
+            _expect(text, index, "}")
+
+def read_parameters(file_name):
+    """Reads the parameters and metadata stored in a single experiment 
+    record without decoding its observations. 
+    
+    Records are read a chunk at a time until the observations key is 
+    reached, so the cost depends on the size of the parameters rather than
+    the size of the record. This relies on observations being the last 
+    key in the record, as it is in every record written by 
+    save_experiment.
+
+    Args:
+        file_name (string): The full path to the record.
+
+    Returns:
+        dict: The parameters stored in the record.
+    """
+    text = ""
+    chunk_size = HEADER_CHUNK_SIZE
+
+    with open_record(file_name) as f:
+        while True:
+            chunk = f.read(chunk_size)
+            text += chunk
+
+            try:
+                return _parse_header(text)
+            except _IncompleteHeader:
+                if not chunk:
+                    # the record is truncated or malformed, let the json
+                    # package report the problem.
+                    json.loads(text)
+                    raise
+
+            chunk_size *= 2
@@ -0,0 +1,66 @@
+"""Contains helpers for reducing very long series of observations to a
+number of points which can be plotted quickly, without hiding the peaks
+and troughs of the series.
+"""
+
+import numpy as np
+
+from researcher.globals import DEFAULT_MAX_POINTS
+
+def downsample(values, max_points=DEFAULT_MAX_POINTS):
+    """Reduces a series to at most max_points points. The series is split
+    into max_points // 2 equally sized buckets and the smallest and largest
+    value of each bucket are kept, so every extreme of the original series
+    survives.
+
+    Args:
+        values (list|np.ndarray): A series of numbers.
+
+        max_points (int, optional): The most points to return. Must be at
+        least 2. Defaults to 2000.
+
+    Raises:
+        ValueError: If max_points is less than 2.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: The steps of the kept points in the
+        original series, in increasing order, and their values.
+    """
+    if max_points < 2:
+        raise ValueError(f"Cannot downsample to fewer than 2 points, got {max_points}")
+
+    values = np.asarray(values, dtype=float)
+    if len(values) <= max_points:
+        return np.arange(len(values)), values
+
+    bucket_size = -(-len(values) // (max_points // 2))
+    n_buckets = -(-len(values) // bucket_size)
+
+    buckets = np.full(n_buckets * bucket_size, np.nan)
+    buckets[:len(values)] = values
+    buckets = buckets.reshape(n_buckets, bucket_size)
+
+    # NaN padding and missing values are never chosen over real ones.
+    lowest = np.argmin(np.where(np.isnan(buckets), np.inf, buckets), axis=1)
+    highest = np.argmax(np.where(np.isnan(buckets), -np.inf, buckets), axis=1)
+
+    offsets = np.arange(n_buckets)[:, np.newaxis] * bucket_size
+    steps = np.sort(np.stack([lowest, highest], axis=1) + offsets, axis=1).ravel()
+    steps = steps[np.concatenate([[True], np.diff(steps) != 0])]
+
+    return steps, values[steps]
+
+def fold_mean(values):
+    """Averages a fold observation over its folds. Series which are not
+    fold observations are returned unchanged.
+
+    Args:
+        values (list|np.ndarray): A fold observation, or a single series.
+
+    Returns:
+        np.ndarray: The value of each step averaged over the folds.
+    """
+    if len(values) > 0 and isinstance(values[0], (list, np.ndarray)):
+        return np.mean(values, axis=0)
+
+    return np.asarray(values, dtype=float)
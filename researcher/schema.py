@@ -0,0 +1,102 @@
+"""Contains helpers for describing the shape of experiment observations.
+The description is stored in the header of each record, so the shape of
+an experiment's observations is known without reading them.
+"""
+
+import numbers
+from array import array
+
+from researcher.lazy import is_ndarray
+
+VALUE = "value"
+SERIES = "series"
+FOLDS = "folds"
+
+_ARRAY_DTYPES = {"b": "bool", "i": "int", "u": "int", "f": "float"}
+
+def _is_sequence(value):
+    return isinstance(value, (list, array)) or is_ndarray(value)
+
+def _dtype(values):
+    if isinstance(values, array):
+        return "float" if values.typecode in "fd" else "int"
+    if is_ndarray(values):
+        return _ARRAY_DTYPES.get(values.dtype.kind, "object")
+
+    types = set(map(type, values))
+    if not types:
+        return None
+    if types == {bool}:
+        return "bool"
+    if types == {str}:
+        return "str"
+
+    if bool not in types:
+        if all(issubclass(t, numbers.Integral) for t in types):
+            return "int"
+        if all(issubclass(t, numbers.Real) for t in types):
+            return "float"
+
+    return "object"
+
+def _combined_dtype(dtypes):
+    dtypes = set(dtypes) - {None}
+    if not dtypes:
+        return None
+    if len(dtypes) == 1:
+        return dtypes.pop()
+    if dtypes == {"int", "float"}:
+        return "float"
+
+    return "object"
+
+def key_schema(value, folds=None):
+    """Describes the shape of a single observation.
+
+    Args:
+        value (object): The observation.
+
+        folds (bool, optional): Whether the observation holds fold data.
+        If None, it is taken to if it is a non-empty list of sequences.
+        Defaults to None.
+
+    Returns:
+        dict: The kind of observation, which is "value", "series" or
+        "folds", and for series and folds the number of folds, the length
+        of each fold and the type of the values, which is "bool", "int",
+        "float", "str", "object" or None if there are no values. A series
+        is described as a single fold.
+    """
+    if folds is None:
+        folds = _is_sequence(value) and len(value) > 0 and all(_is_sequence(fold) for fold in value)
+
+    if folds:
+        return {
+            "kind": FOLDS,
+            "folds": len(value),
+            "lengths": [len(fold) for fold in value],
+            "dtype": _combined_dtype(_dtype(fold) for fold in value),
+        }
+
+    if _is_sequence(value):
+        return {"kind": SERIES, "folds": 1, "lengths": [len(value)], "dtype": _dtype(value)}
+
+    return {"kind": VALUE}
+
+def infer_schema(observations, fold_keys=None):
+    """Describes the shape of every observation made during an experiment.
+
+    Args:
+        observations (dict): The observations.
+
+        fold_keys (set[string], optional): The keys which hold fold data.
+        If None, fold data is recognised by its shape. Defaults to None.
+
+    Returns:
+        dict: The description of each observation, keyed by name. See
+        key_schema.
+    """
+    if not observations:
+        return {}
+
+    return {key: key_schema(value, None if fold_keys is None else key in fold_keys) for key, value in observations.items()}
@@ -0,0 +1,185 @@
+"""Contains a compact encoding of the parameters of many experiments, which
+allows experiments to be compared with one another by vectorized numpy
+operations rather than by comparing their parameters key by key.
+"""
+
+import numpy as np
+
+from researcher.globals import METADATA_KEYS, OBSERVATIONS_NAME
+
+MISSING = -1
+UNSEEN = -2
+
+_EXCLUDED_KEYS = set(METADATA_KEYS) | {OBSERVATIONS_NAME}
+
+def _hashable(value):
+    if isinstance(value, list):
+        return tuple(_hashable(v) for v in value)
+    if isinstance(value, dict):
+        return frozenset((k, _hashable(v)) for k, v in value.items())
+
+    return value
+
+def _parameters(experiment):
+    data = experiment.data if hasattr(experiment, "data") else experiment
+
+    return {k: v for k, v in data.items() if k not in _EXCLUDED_KEYS}
+
+class ParameterMatrix():
+    """The parameters of many experiments, with each parameter value
+    replaced by an integer code. Two experiments share a value for a key
+    exactly when their codes for that key are equal, so comparisons
+    between experiments become comparisons between integer arrays.
+    Metadata keys and observations are not encoded.
+
+    Attributes:
+        experiments (list[Experiment]): The encoded experiments.
+
+        keys (list[string]): The parameter keys, one per column of codes.
+
+        codes (np.ndarray): An (experiments, keys) array of value codes,
+        -1 where an experiment lacks a key.
+    """
+    def __init__(self, experiments):
+        """Encodes the parameters of the given experiments.
+
+        Args:
+            experiments (list[Experiment]): The experiments to encode.
+        """
+        self.experiments = experiments
+        self.keys = []
+
+        self.__columns = {}
+        self.__codebooks = []
+
+        rows, columns, values = [], [], []
+        for i, experiment in enumerate(experiments):
+            for key, value in _parameters(experiment).items():
+                column = self.__columns.get(key)
+                if column is None:
+                    column = self.__columns[key] = len(self.keys)
+                    self.keys.append(key)
+                    self.__codebooks.append({})
+
+                codebook = self.__codebooks[column]
+                rows.append(i)
+                columns.append(column)
+                values.append(codebook.setdefault(_hashable(value), len(codebook)))
+
+        self.codes = np.full((len(experiments), len(self.keys)), MISSING, dtype=np.int32)
+        self.codes[rows, columns] = values
+
+    def __len__(self):
+        return len(self.experiments)
+
+    def encode(self, params):
+        """Encodes a single set of parameters using the codes of the
+        encoded experiments. Keys which none of them have are ignored.
+
+        Args:
+            params (dict|Experiment): The parameters to encode.
+
+        Returns:
+            np.ndarray: A code for each key, -1 for keys params lacks and
+            -2 for values which none of the experiments share.
+        """
+        codes = np.full(len(self.keys), MISSING, dtype=np.int32)
+        for key, value in _parameters(params).items():
+            if key in self.__columns:
+                column = self.__columns[key]
+                codes[column] = self.__codebooks[column].get(_hashable(value), UNSEEN)
+
+        return codes
+
+    def compare(self, params):
+        """Counts the values each encoded experiment shares with the given
+        parameters, and the values which differ, exactly as
+        Experiment.common_values and Experiment.differing_values would.
+
+        Args:
+            params (dict|Experiment): The parameters to compare against.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: The number of common and the
+            number of differing values of each experiment.
+        """
+        codes = self.encode(params)
+        both = (self.codes != MISSING) & (codes != MISSING)
+        equal = self.codes == codes
+
+        return np.sum(both & equal, axis=1), np.sum(both & ~equal, axis=1)
+
+    def nearest(self, params, k=5):
+        """Finds the encoded experiments most similar to the given
+        parameters: those sharing the most values with them and, among
+        those, with the fewest differing values.
+
+        Args:
+            params (dict|Experiment): The parameters to compare against.
+
+            k (int, optional): The number of experiments to find. Defaults
+            to 5.
+
+        Returns:
+            list[Experiment]: At most k experiments, most similar first.
+        """
+        if k <= 0 or len(self) == 0:
+            return []
+
+        common, differing = self.compare(params)
+        scores = common.astype(np.int64) * (len(self.keys) + 1) - differing
+
+        candidates = np.argpartition(-scores, k - 1)[:k] if k < len(self) else np.arange(len(self))
+        best = candidates[np.argsort(-scores[candidates], kind="stable")]
+
+        return [self.experiments[i] for i in best]
+
+    def common_counts(self):
+        """Counts the values shared by every pair of encoded experiments.
+        The result takes experiments squared bytes, so this suits up to
+        several tens of thousands of experiments.
+
+        Returns:
+            np.ndarray: An (experiments, experiments) array whose i, j
+            entry is experiments[i].common_values(experiments[j]).
+        """
+        present = self.codes != MISSING
+        dtype = np.uint8 if len(self.keys) < 2**8 else np.uint32
+
+        # missing values are replaced by a code unique to each experiment,
+        # so that they only ever match themselves.
+        codes = np.where(present, self.codes, MISSING - 1 - np.arange(len(self))[:, np.newaxis])
+
+        counts = np.zeros((len(self), len(self)), dtype=dtype)
+        for column in codes.T:
+            counts += column[:, np.newaxis] == column[np.newaxis, :]
+
+        np.fill_diagonal(counts, np.sum(present, axis=1))
+
+        return counts
+
+    def differing_counts(self):
+        """Counts the values which differ between every pair of encoded
+        experiments. See common_counts.
+
+        Returns:
+            np.ndarray: An (experiments, experiments) array whose i, j
+            entry is experiments[i].differing_values(experiments[j]).
+        """
+        common = self.common_counts()
+
+        present = (self.codes != MISSING).astype(np.float32)
+        both = present @ present.T
+
+        return both.astype(common.dtype) - common
+
+def parameter_matrix(experiments):
+    """Encodes the parameters of many experiments into a ParameterMatrix.
+
+    Args:
+        experiments (list[Experiment]): The experiments to encode.
+
+    Returns:
+        ParameterMatrix: The encoded parameters.
+    """
+    return ParameterMatrix(experiments)
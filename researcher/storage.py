@@ -0,0 +1,221 @@
+"""Contains helpers for storing numeric observations as raw typed arrays in
+a binary file alongside the JSON record, rather than inside the record
+itself.
+
+Each numeric series is written to the binary file at an aligned offset
+and replaced in the JSON record by a small reference describing where it
+lives. When the record is read back the binary file is memory mapped and
+each reference becomes a read-only numpy array backed by that mapping, so
+series are only read from disk as they are used.
+
+Every write of a record creates a new binary file, whose name is stored
+in the references. A reader therefore always maps the binary file that
+was written with the JSON record it read, even while the record is being
+rewritten. Older binary files are removed once the new record is in
+place.
+"""
+
+import os
+
+from researcher.atomic import atomic_open
+from researcher.compression import strip_record_extension
+from researcher.globals import BINARY_EXTENSION
+
+ARRAY_KEY = "__array__"
+FILE_KEY = "file"
+ALIGNMENT = 64
+
+# The length in hex digits of the version in a binary file name.
+VERSION_LENGTH = 16
+
+def binary_file_name(file_name, version=None):
+    """Returns the name of a binary file which accompanies a record.
+
+    Args:
+        file_name (string): The full path to the JSON record, which may be
+        compressed.
+
+        version (string, optional): The version of the binary file. If
+        None, the name used before binary files were versioned is
+        returned. Defaults to None.
+
+    Returns:
+        string: The full path to the binary observations file.
+    """
+    stem = strip_record_extension(file_name)
+
+    return stem + BINARY_EXTENSION if version is None else stem + "." + version + BINARY_EXTENSION
+
+def binary_file_names(file_name):
+    """Lists every binary file on disk which accompanies a record, of any
+    version.
+
+    Args:
+        file_name (string): The full path to the JSON record.
+
+    Returns:
+        list[string]: The full path to each binary observations file.
+    """
+    directory, stem = os.path.split(strip_record_extension(file_name))
+    directory = directory + "/" if directory else ""
+
+    try:
+        names = os.listdir(directory or ".")
+    except FileNotFoundError:
+        return []
+
+    def is_binary_file(name):
+        if name == stem + BINARY_EXTENSION:
+            return True
+
+        version = name[len(stem) + 1:-len(BINARY_EXTENSION)]
+        return name.startswith(stem + ".") and name.endswith(BINARY_EXTENSION) and len(version) == VERSION_LENGTH and all(c in "0123456789abcdef" for c in version)
+
+    return [directory + name for name in names if is_binary_file(name)]
+
+def remove_binary_files(file_name, keep=None):
+    """Removes the binary files which accompany a record, except for the
+    one given. Called once a record has been replaced, so that binary 
+    files referenced only by the old record are removed.
+
+    Args:
+        file_name (string): The full path to the JSON record.
+
+        keep (string, optional): The full path to a binary file to keep.
+        Defaults to None.
+    """
+    for name in binary_file_names(file_name):
+        if name != keep:
+            try:
+                os.remove(name)
+            except FileNotFoundError:
+                pass
+
+def _as_array(value):
+    import numpy as np
+
+    if isinstance(value, np.ndarray):
+        array = value
+    elif isinstance(value, list) and len(value) > 0 and all(isinstance(x, (int, float, np.number)) and not isinstance(x, bool) for x in value):
+        array = np.asarray(value)
+    else:
+        return None
+
+    return array if array.ndim == 1 and array.size > 0 and array.dtype.kind in "iuf" else None
+
+class _ArrayWriter():
+    def __init__(self, f, name):
+        self.f = f
+        self.name = name
+        self.offset = 0
+
+    def write(self, array):
+        import numpy as np
+
+        padding = -self.offset % ALIGNMENT
+        self.f.write(b"\0" * padding)
+        self.offset += padding
+
+        reference = {ARRAY_KEY: {FILE_KEY: self.name, "offset": self.offset, "dtype": array.dtype.str, "length": len(array)}}
+
+        data = np.ascontiguousarray(array).tobytes()
+        self.f.write(data)
+        self.offset += len(data)
+
+        return reference
+
+    def pack(self, value):
+        import numpy as np
+
+        if isinstance(value, np.ndarray) and value.ndim == 2:
+            value = list(value)
+
+        array = _as_array(value)
+        if array is not None:
+            return self.write(array)
+
+        if isinstance(value, list) and len(value) > 0 and all(_as_array(fold) is not None for fold in value):
+            return [self.write(_as_array(fold)) for fold in value]
+
+        return value
+
+def save_binary_observations(file_name, observations, durable=False):
+    """Writes every numeric series in the given observations to a new
+    binary file which accompanies a record. Fold observations are stored
+    as one series per fold. Binary files written for earlier versions of
+    the record are left in place, see remove_binary_files.
+
+    Args:
+        file_name (string): The full path to the JSON record.
+
+        observations (dict): The observations to store.
+
+        durable (bool, optional): If True, the binary file is flushed to
+        disk before this returns. See atomic_open. Defaults to False.
+
+    Returns:
+        tuple[dict, string]: A copy of observations in which every stored
+        series has been replaced by a reference to its location in the 
+        binary file, and the full path to the binary file.
+    """
+    binary_name = binary_file_name(file_name, os.urandom(VERSION_LENGTH // 2).hex())
+
+    with atomic_open(binary_name, "wb", durable) as f:
+        writer = _ArrayWriter(f, os.path.basename(binary_name))
+        return {key: writer.pack(value) for key, value in observations.items()}, binary_name
+
+def _is_reference(value):
+    return isinstance(value, dict) and ARRAY_KEY in value
+
+def has_binary_observations(observations):
+    """Indicates whether any of the given observations refer to a binary
+    observations file.
+
+    Args:
+        observations (dict): Observations read from a JSON record.
+
+    Returns:
+        bool: True if any observation is stored in a binary file.
+    """
+    if not isinstance(observations, dict):
+        return False
+
+    return any(_is_reference(value) or (isinstance(value, list) and len(value) > 0 and _is_reference(value[0])) for value in observations.values())
+
+def load_binary_observations(file_name, observations):
+    """Replaces every reference in the given observations with a
+    read-only array backed by a memory mapping of the binary file which
+    accompanies the record. No data is copied.
+
+    Args:
+        file_name (string): The full path to the JSON record.
+
+        observations (dict): Observations read from the JSON record.
+
+    Returns:
+        dict: A copy of observations containing arrays in place of
+        references.
+    """
+    import numpy as np
+
+    directory = os.path.dirname(file_name)
+    buffers = {}
+
+    def buffer(name):
+        if name not in buffers:
+            path = binary_file_name(file_name) if name is None else os.path.join(directory, name)
+            buffers[name] = np.memmap(path, dtype=np.uint8, mode="r")
+
+        return buffers[name]
+
+    def unpack(value):
+        if _is_reference(value):
+            reference = value[ARRAY_KEY]
+            return np.frombuffer(buffer(reference.get(FILE_KEY)), dtype=reference["dtype"], count=reference["length"], offset=reference["offset"])
+
+        if isinstance(value, list) and len(value) > 0 and _is_reference(value[0]):
+            return [unpack(fold) for fold in value]
+
+        return value
+
+    return {key: unpack(value) for key, value in observations.items()}
@@ -0,0 +1,217 @@
+"""Contains an observation collector which streams observations to disk
+as they are made, so that nothing is lost if an experiment crashes and
+memory use does not grow with the length of the experiment.
+"""
+
+import os
+import json
+import time
+
+from researcher.globals import LOG_EXTENSION
+from researcher.fileutils import DEFAULT_HASH_VERSION, TrickyValuesEncoder
+from researcher.observations import ObservationCollector
+from researcher.record import record_experiment, record_name
+
+FOLD_KEY = "fold"
+KEY_KEY = "key"
+VALUES_KEY = "values"
+VALUE_KEY = "value"
+
+# The number of bytes read at a time while searching backwards through a
+# log for the end of its last complete entry.
+LOG_BLOCK_SIZE = 64 * 1024
+
+def read_observation_log(file_name):
+    """Reads every entry in an observation log. A partially written final
+    entry, as left behind by a crash, is ignored.
+
+    Args:
+        file_name (string): The full path to the log.
+
+    Returns:
+        list[dict]: The entries in the log in the order they were written.
+    """
+    entries = []
+    with open(file_name, "r") as f:
+        for line in f:
+            try:
+                entries.append(json.loads(line))
+            except json.JSONDecodeError:
+                break
+
+    return entries
+
+def _discard_partial_entry(file_name):
+    # only the end of the log is read, since a partial entry can only
+    # follow the last newline.
+    with open(file_name, "rb+") as f:
+        end = f.seek(0, os.SEEK_END)
+        while end > 0:
+            start = max(0, end - LOG_BLOCK_SIZE)
+            f.seek(start)
+            newline = f.read(end - start).rfind(b"\n")
+            if newline != -1:
+                f.truncate(start + newline + 1)
+                return
+            end = start
+
+        f.truncate(0)
+
+def _apply(collector, entry):
+    if FOLD_KEY in entry:
+        collector.add_fold_observations(entry[FOLD_KEY], entry[KEY_KEY], entry[VALUES_KEY])
+    else:
+        collector.set_observation(entry[KEY_KEY], entry[VALUE_KEY])
+
+def compact_observation_log(file_name):
+    """Combines all the entries in an observation log into a single 
+    dictionary of observations.
+
+    Args:
+        file_name (string): The full path to the log.
+
+    Returns:
+        dict: The observations stored in the log, in the same form as 
+        ObservationCollector.observations.
+    """
+    collector = ObservationCollector()
+    for entry in read_observation_log(file_name):
+        _apply(collector, entry)
+
+    return collector.observations
+
+class StreamingObservationCollector(ObservationCollector):
+    """An ObservationCollector which appends each observation to a log file
+    in the records directory as soon as it is made, rather than holding it
+    in memory. The log is flushed periodically, and is combined into a 
+    normal experiment record by finalize.
+
+    If a log already exists for the given parameters, for instance because
+    an earlier run crashed, the collector resumes it.
+
+    Attributes:
+        params (dict): The parameters of the experiment being observed.
+
+        save_path (string): The records directory.
+
+        log_file (string): The full path to the observation log.
+    """
+    def __init__(self, params, save_path, flush_every=100, flush_interval=10.0, fsync=False, hash_version=DEFAULT_HASH_VERSION):
+        """Instantiates a StreamingObservationCollector.
+
+        Args:
+            params (dict): The parameters of the experiment being observed.
+
+            save_path (string): The records directory in which to write the
+            log and, eventually, the record.
+
+            flush_every (int, optional): The log is flushed after this many
+            observations have been written since the last flush. Defaults
+            to 100.
+
+            flush_interval (float, optional): The log is flushed when an
+            observation is written more than this many seconds after the 
+            last flush. Defaults to 10.0.
+
+            fsync (bool, optional): If True each flush also forces the log
+            onto disk, so it survives the machine crashing as well as the
+            process. Defaults to False.
+
+            hash_version (int, optional): The hashing scheme used to name
+            the log and the record. See get_hash. Defaults to 1.
+        """
+        super().__init__()
+
+        self.params = params
+        self.save_path = save_path
+        self.hash_version = hash_version
+        self.log_file = save_path + record_name(params, hash_version) + LOG_EXTENSION
+
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+
+        self.__log = None
+        self.__observations = None
+        if os.path.isfile(self.log_file):
+            _discard_partial_entry(self.log_file)
+            for entry in read_observation_log(self.log_file):
+                _apply(self, entry)
+        else:
+            os.makedirs(save_path, exist_ok=True)
+
+        self.__log = open(self.log_file, "a")
+        self.__unflushed = 0
+        self.__last_flush = time.monotonic()
+
+    @property
+    def observations(self):
+        """dict: All observations written to the log so far. The log is
+        only read again once more observations have been written."""
+        if self.__observations is None:
+            if self.__log is not None and not self.__log.closed:
+                self.flush()
+
+            self.__observations = compact_observation_log(self.log_file)
+
+        return self.__observations
+
+    @observations.setter
+    def observations(self, observations):
+        # ObservationCollector initializes observations to an empty 
+        # dictionary, which is nothing to write.
+        pass
+
+    def __write(self, entry):
+        if self.__log is None:
+            # the entry is being replayed from an existing log.
+            return
+
+        self.__observations = None
+        self.__log.write(json.dumps(entry, cls=TrickyValuesEncoder) + "\n")
+        self.__unflushed += 1
+
+        if self.__unflushed >= self.flush_every or time.monotonic() - self.__last_flush >= self.flush_interval:
+            self.flush()
+
+    def _add_fold_values(self, fold, key, values):
+        self.__write({FOLD_KEY: fold, KEY_KEY: key, VALUES_KEY: values})
+
+    def _set_value(self, key, value):
+        self.__write({KEY_KEY: key, VALUE_KEY: value})
+
+    def flush(self):
+        """Writes all buffered observations to the log.
+        """
+        self.__log.flush()
+        if self.fsync:
+            os.fsync(self.__log.fileno())
+
+        self.__unflushed = 0
+        self.__last_flush = time.monotonic()
+
+    def close(self):
+        """Flushes and closes the log without recording the experiment. 
+        """
+        self.flush()
+        self.__log.close()
+
+    def finalize(self, duration=None, binary=False, compression=None):
+        """Records the experiment with all logged observations, exactly as
+        record_experiment would, and then deletes the log.
+
+        Args:
+            duration (datetime.timedelta, optional): The time elapsed 
+            between the start and the end of the experiment. Defaults to 
+            None.
+
+            binary (bool, optional): If True, numeric observations are 
+            stored in a binary file alongside the record. Defaults to 
+            False.
+
+            compression (string, optional): "gzip" or "zstd" to compress
+            the record. See record_experiment. Defaults to None.
+        """
+        self.close()
+        record_experiment(self.params, self.save_path, compact_observation_log(self.log_file), duration, binary, self.hash_version, compression)
+        os.remove(self.log_file)
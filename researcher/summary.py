@@ -0,0 +1,90 @@
+"""Contains helpers for summarizing numeric observations when they are
+recorded. Summaries are stored in the header of each record, so
+experiments can be compared by their best or final values without their
+observations being read.
+"""
+
+import math
+
+from researcher.lazy import is_ndarray
+from researcher.schema import FOLDS, SERIES, infer_schema
+
+STATISTICS = ["final", "min", "max", "argmin", "argmax", "mean"]
+
+def _fold_summary(fold):
+    if is_ndarray(fold):
+        fold = fold.tolist()
+    else:
+        fold = list(fold)
+
+    # NaN never equals itself, so this drops missing values.
+    values = [x for x in fold if x == x]
+
+    if not values:
+        return {"final": fold[-1] if fold else None, "min": None, "max": None, "argmin": None, "argmax": None, "mean": None}
+
+    lowest = min(values)
+    highest = max(values)
+
+    return {
+        "final": fold[-1],
+        "min": lowest,
+        "max": highest,
+        "argmin": fold.index(lowest),
+        "argmax": fold.index(highest),
+        "mean": math.fsum(values) / len(values),
+    }
+
+def summarize(observations, schema=None):
+    """Computes the final value, smallest and largest values, the steps at
+    which these occur and the mean of each fold of every numeric series or
+    fold observation. Missing values are ignored, except as final values.
+
+    Args:
+        observations (dict): The observations to summarize.
+
+        schema (dict, optional): The schema of the observations. If None
+        it is inferred. Defaults to None.
+
+    Returns:
+        dict: For each summarized observation, a dict holding each
+        statistic in STATISTICS. Fold observations hold a list with one
+        entry per fold for each statistic, where a fold without values has
+        None. Series hold a single value, as with final_observations.
+    """
+    if not observations:
+        return {}
+
+    if schema is None:
+        schema = infer_schema(observations)
+
+    summary = {}
+    for key, value in observations.items():
+        key_schema = schema.get(key, {})
+        if key_schema.get("kind") not in [SERIES, FOLDS] or key_schema.get("dtype") not in ["int", "float"]:
+            continue
+
+        if key_schema["kind"] == SERIES:
+            summary[key] = _fold_summary(value)
+        else:
+            folds = [_fold_summary(fold) for fold in value]
+            summary[key] = {statistic: [fold[statistic] for fold in folds] for statistic in STATISTICS}
+
+    return summary
+
+def fold_mean(values):
+    """Averages a statistic over the folds which have it.
+
+    Args:
+        values (list|float): The statistic of each fold, None where a fold
+        has no values, or the statistic of a series.
+
+    Returns:
+        float: The mean, or None if no fold has the statistic.
+    """
+    if not isinstance(values, list):
+        values = [values]
+
+    values = [v for v in values if v is not None and v == v]
+
+    return sum(values) / len(values) if values else None
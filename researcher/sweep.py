@@ -0,0 +1,100 @@
+"""Contains helpers for resuming parameter sweeps, by checking which sets of
+parameters have already been recorded without reading any records.
+"""
+
+import os
+
+from researcher.fileutils import DEFAULT_HASH_VERSION, HASH_VERSIONS, get_hash
+from researcher.recordfiles import file_hash, list_records
+
+class RecordedSet():
+    """The hashes of every experiment recorded in a directory, taken from
+    the record filenames. Checking whether a set of parameters has been
+    recorded only requires hashing them, however many records there are.
+
+    Attributes:
+        path (string): The records directory.
+
+        hash_versions (list[int]): The hashing schemes tried when checking
+        whether parameters have been recorded.
+    """
+    def __init__(self, path, hash_versions=HASH_VERSIONS):
+        """Collects the hashes of every record in a directory. A directory
+        which does not exist yet is treated as empty.
+
+        Args:
+            path (string): The records directory.
+
+            hash_versions (list[int], optional): The hashing schemes which
+            records in the directory may have been named with. Checks are
+            faster if only one is given. Defaults to every scheme.
+        """
+        self.path = path
+        self.hash_versions = hash_versions
+
+        self.__hashes = set()
+        self.refresh()
+
+    def __len__(self):
+        return len(self.__hashes)
+
+    def __contains__(self, params):
+        return self.is_recorded(params)
+
+    def refresh(self):
+        """Brings the set up to date with the records directory. Only the
+        directory listing is read.
+        """
+        if not os.path.isdir(self.path):
+            self.__hashes = set()
+            return
+
+        self.__hashes = {file_hash(name) for name in list_records(self.path)}
+
+    def add(self, params, hash_version=DEFAULT_HASH_VERSION):
+        """Marks a set of parameters as recorded, for instance after
+        recording an experiment with them.
+
+        Args:
+            params (dict): The parameters of the recorded experiment.
+
+            hash_version (int, optional): The hashing scheme the record was
+            named with. Defaults to 1.
+        """
+        self.__hashes.add(get_hash(params, hash_version))
+
+    def is_recorded(self, params):
+        """Checks whether an experiment with the given parameters has been
+        recorded, using the same hashing as record_experiment.
+
+        Args:
+            params (dict): The parameters that define an experiment.
+
+        Returns:
+            bool: True if a record with the given parameters exists.
+        """
+        return any(get_hash(params, version) in self.__hashes for version in self.hash_versions)
+
+def unrecorded(sweep, path, hash_versions=HASH_VERSIONS):
+    """Filters a sweep down to the sets of parameters which have not been
+    recorded yet. The records directory is listed once, when the first set
+    of parameters is requested.
+
+    Args:
+        sweep (iterable[dict]): The sets of parameters in the sweep.
+
+        path (string): The records directory.
+
+        hash_versions (list[int], optional): The hashing schemes which
+        records in the directory may have been named with. Defaults to
+        every scheme.
+
+    Returns:
+        iterator[dict]: The sets of parameters in the sweep without a
+        record, in their original order.
+    """
+    recorded = RecordedSet(path, hash_versions)
+
+    for params in sweep:
+        if not recorded.is_recorded(params):
+            yield params
@@ -0,0 +1,247 @@
+"""Contains a set of experiments which tracks the records in a directory,
+loading only new and modified records each time it is refreshed.
+"""
+
+import os
+import bisect
+import ctypes
+import ctypes.util
+import datetime
+import struct
+import sys
+
+from researcher.fileutils import load_experiment
+from researcher.recordfiles import is_record_file, is_sharded, list_records
+
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+_EVENT = struct.Struct("iIII")
+
+class InotifyWatcher():
+    """Reports the names of files in a directory which have been written,
+    moved or deleted, using the Linux inotify API.
+    """
+    def __init__(self, path):
+        """Starts watching a directory.
+
+        Args:
+            path (string): The directory to watch.
+
+        Raises:
+            OSError: If inotify is unavailable or the watch could not be
+            created.
+        """
+        if not sys.platform.startswith("linux"):
+            raise OSError("inotify is only available on linux")
+
+        self.__libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self.__fd = self.__libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.__fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+        mask = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_DELETE
+        if self.__libc.inotify_add_watch(self.__fd, os.fsencode(path), mask) < 0:
+            errno = ctypes.get_errno()
+            os.close(self.__fd)
+            raise OSError(errno, f"inotify_add_watch failed for {path}")
+
+    def changes(self):
+        """Returns the names of the files which have changed since the last
+        call.
+
+        Returns:
+            set[string]: The changed filenames, or None if too many changes
+            happened to be reported and the directory must be rescanned.
+        """
+        names = set()
+        while True:
+            try:
+                data = os.read(self.__fd, 64 * 1024)
+            except BlockingIOError:
+                return names
+
+            offset = 0
+            while offset < len(data):
+                _, mask, _, length = _EVENT.unpack_from(data, offset)
+                offset += _EVENT.size
+
+                if mask & IN_Q_OVERFLOW:
+                    return None
+
+                names.add(os.fsdecode(data[offset:offset + length].rstrip(b"\0")))
+                offset += length
+
+    def close(self):
+        """Stops watching the directory.
+        """
+        os.close(self.__fd)
+
+def _sort_key(experiment, name):
+    return (experiment.timestamp or datetime.datetime.min, name)
+
+class ExperimentSet():
+    """The experiments recorded in a directory, sorted by timestamp.
+
+    Refreshing the set only loads records which are new or have changed
+    since the last refresh. Where inotify is available changes are
+    reported by the operating system, otherwise the directory is polled
+    and the modification time, size and inode of each record compared to
+    those seen last time. Sharded directories are always polled.
+
+    Attributes:
+        path (string): The records directory.
+
+        lazy (bool): Whether experiments are loaded as LazyExperiments.
+
+        experiments (list[Experiment]): The experiments in the directory,
+        sorted by timestamp.
+    """
+    def __init__(self, path, lazy=False, watch=True):
+        """Loads every record in a directory into an ExperimentSet.
+
+        Args:
+            path (string): The records directory.
+
+            lazy (bool, optional): If True, LazyExperiment instances are
+            loaded. Defaults to False.
+
+            watch (bool, optional): If True, inotify is used to detect
+            changes where it is available. Defaults to True.
+        """
+        self.path = path
+        self.lazy = lazy
+        self.experiments = []
+
+        self.__keys = []
+        self.__loaded = {}
+        self.__failed = set()
+        self.__watcher = None
+
+        if watch and not is_sharded(path):
+            try:
+                self.__watcher = InotifyWatcher(path)
+            except (OSError, AttributeError):
+                self.__watcher = None
+
+        self.__rescan()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __len__(self):
+        return len(self.experiments)
+
+    def __iter__(self):
+        return iter(self.experiments)
+
+    def is_watching(self):
+        """
+        Returns:
+            bool: True if changes are detected with inotify rather than by
+            polling.
+        """
+        return self.__watcher is not None
+
+    def close(self):
+        """Stops watching the directory for changes.
+        """
+        if self.__watcher is not None:
+            self.__watcher.close()
+            self.__watcher = None
+
+    def __signature(self, name):
+        stat = os.stat(self.path + name)
+        return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+    def __remove(self, name):
+        signature, experiment = self.__loaded.pop(name)
+        index = bisect.bisect_left(self.__keys, _sort_key(experiment, name))
+
+        del self.__keys[index]
+        del self.experiments[index]
+
+    def __load(self, name):
+        if name in self.__loaded:
+            self.__remove(name)
+
+        try:
+            signature = self.__signature(name)
+            experiment = load_experiment(self.path, name, self.lazy)
+        except (FileNotFoundError, ValueError):
+            # the record was deleted or is still being written, so it is
+            # retried by later refreshes.
+            self.__failed.add(name)
+            return None
+
+        self.__failed.discard(name)
+
+        key = _sort_key(experiment, name)
+        index = bisect.bisect_left(self.__keys, key)
+
+        self.__keys.insert(index, key)
+        self.experiments.insert(index, experiment)
+        self.__loaded[name] = (signature, experiment)
+
+        return experiment
+
+    def __rescan(self):
+        names = set(list_records(self.path))
+
+        changed = []
+        for name in list(names):
+            if name not in self.__loaded:
+                changed.append(name)
+                continue
+
+            try:
+                if self.__loaded[name][0] != self.__signature(name):
+                    changed.append(name)
+            except FileNotFoundError:
+                # the record was deleted since it was listed.
+                names.discard(name)
+
+        for name in set(self.__loaded) - names:
+            self.__remove(name)
+
+        return [e for e in map(self.__load, sorted(changed)) if e is not None]
+
+    def refresh(self):
+        """Brings the set up to date with the records directory, loading
+        new and modified records and dropping deleted ones.
+
+        Returns:
+            list[Experiment]: The experiments which were loaded.
+        """
+        if self.__watcher is None:
+            return self.__rescan()
+
+        changes = self.__watcher.changes()
+        if changes is None:
+            return self.__rescan()
+
+        # records which failed to load may not change again, so they are
+        # retried whether or not there are new events for them.
+        loaded = []
+        for name in sorted(set(changes) | self.__failed):
+            if not is_record_file(name):
+                continue
+
+            if os.path.isfile(self.path + name):
+                experiment = self.__load(name)
+                if experiment is not None:
+                    loaded.append(experiment)
+            else:
+                self.__failed.discard(name)
+                if name in self.__loaded:
+                    self.__remove(name)
+
+        return loaded
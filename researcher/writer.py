@@ -0,0 +1,212 @@
+"""Contains a recorder which writes experiment records on a background
+thread, so that the thread running the experiment never waits on disk.
+"""
+
+import atexit
+import copy
+import datetime
+import queue
+import threading
+
+from researcher.fileutils import DEFAULT_HASH_VERSION
+from researcher.record import record_experiments
+
+_STOP = object()
+
+class BackgroundRecorder():
+    """Records experiments exactly as record_experiments would, but on a
+    background thread. Experiments waiting to be written are held in a
+    bounded queue. Once it is full, recording another experiment blocks
+    until the background thread catches up.
+
+    Leaving a with block, or calling close, waits until every experiment
+    has been written. Unless durable is False, written records are also
+    flushed to disk, so they survive a crash. Any recorder which is still
+    open when the interpreter exits is closed then.
+
+    Observations are written as they are when the background thread
+    reaches them, so they should not be modified after being recorded.
+    Parameters are copied, and timestamps taken, when experiments are 
+    recorded rather than when they are written.
+
+    Attributes:
+        save_path (string): The directory in which records are saved.
+
+        binary (bool): Whether numeric observations are stored in binary
+        files alongside the records.
+
+        hash_version (int): The hashing scheme used to name the records.
+
+        compression (string): The compression applied to the records, if
+        any.
+
+        durable (bool): Whether records are flushed to disk as they are
+        written.
+    """
+    def __init__(self, save_path, max_pending=64, binary=False, hash_version=DEFAULT_HASH_VERSION, compression=None, durable=True):
+        """Starts the background thread.
+
+        Args:
+            save_path (string): The directory in which to save records.
+
+            max_pending (int, optional): The most experiments which may be
+            waiting to be written before recording blocks. Defaults to 64.
+
+            binary (bool, optional): If True, numeric observations are
+            stored in binary files alongside the records. Defaults to
+            False.
+
+            hash_version (int, optional): The hashing scheme used to name
+            the records. See get_hash. Defaults to 1.
+
+            compression (string, optional): "gzip" or "zstd" to compress
+            the records. See save_experiment. Defaults to None.
+
+            durable (bool, optional): If True, each record is flushed to
+            disk as it is written, so that records flush and close have 
+            waited for survive a crash. See atomic_open. Defaults to True.
+        """
+        self.save_path = save_path
+        self.binary = binary
+        self.hash_version = hash_version
+        self.compression = compression
+        self.durable = durable
+
+        self.__queue = queue.Queue(maxsize=max_pending)
+        self.__error = None
+        self.__closed = False
+
+        self.__thread = threading.Thread(target=self.__run, name="researcher-recorder", daemon=True)
+        self.__thread.start()
+
+        atexit.register(self.close)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await self.close_async()
+
+    def __run(self):
+        while True:
+            batch = [self.__queue.get()]
+            while True:
+                try:
+                    batch.append(self.__queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            experiments = [item for item in batch if item is not _STOP]
+            try:
+                if experiments:
+                    record_experiments(experiments, self.save_path, self.binary, self.hash_version, self.compression, self.durable)
+            except Exception as e:
+                if self.__error is None:
+                    self.__error = e
+            finally:
+                for _ in batch:
+                    self.__queue.task_done()
+
+            if len(experiments) < len(batch):
+                return
+
+    def __raise_error(self):
+        if self.__error is not None:
+            error, self.__error = self.__error, None
+            raise error
+
+    def record(self, params, observations=None, duration=None):
+        """Queues an experiment to be recorded, blocking while the queue is
+        full.
+
+        Args:
+            params (dict): The parameters that define the experimental
+            conditions of the experiment.
+
+            observations (dict, optional): The observations made during
+            the experiment. Defaults to None.
+
+            duration (datetime.timedelta, optional): The time elapsed
+            between the start and the end of the experiment. Defaults to
+            None.
+
+        Raises:
+            ValueError: If the recorder has been closed.
+
+            Exception: Any error raised while writing earlier experiments,
+            which is only raised once.
+        """
+        if self.__closed:
+            raise ValueError("Cannot record experiments with a closed BackgroundRecorder")
+
+        self.__raise_error()
+        self.__queue.put((copy.deepcopy(params), observations, duration, datetime.datetime.now()))
+
+    def flush(self):
+        """Waits until every queued experiment has been written, and 
+        flushed to disk if the recorder is durable.
+
+        Raises:
+            Exception: Any error raised while writing the experiments,
+            which is only raised once.
+        """
+        self.__queue.join()
+        self.__raise_error()
+
+    def close(self):
+        """Waits until every queued experiment has been written and stops
+        the background thread. Closing a closed recorder does nothing.
+
+        Raises:
+            Exception: Any error raised while writing the experiments,
+            which is only raised once.
+        """
+        if self.__closed:
+            return
+
+        self.__closed = True
+        atexit.unregister(self.close)
+
+        self.__queue.put(_STOP)
+        self.__thread.join()
+        self.__raise_error()
+
+    async def record_async(self, params, observations=None, duration=None):
+        """Queues an experiment to be recorded without blocking the event
+        loop while the queue is full. See record.
+
+        Args:
+            params (dict): The parameters that define the experimental
+            conditions of the experiment.
+
+            observations (dict, optional): The observations made during
+            the experiment. Defaults to None.
+
+            duration (datetime.timedelta, optional): The time elapsed
+            between the start and the end of the experiment. Defaults to
+            None.
+        """
+        import asyncio
+
+        await asyncio.get_running_loop().run_in_executor(None, self.record, params, observations, duration)
+
+    async def flush_async(self):
+        """Waits until every queued experiment has been written without
+        blocking the event loop. See flush.
+        """
+        import asyncio
+
+        await asyncio.get_running_loop().run_in_executor(None, self.flush)
+
+    async def close_async(self):
+        """Closes the recorder without blocking the event loop. See close.
+        """
+        import asyncio
+
+        await asyncio.get_running_loop().run_in_executor(None, self.close)
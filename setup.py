@@ -19,7 +19,8 @@ setuptools.setup(
         "Operating System :: OS Independent",
     ],
     install_requires=['numpy', 'matplotlib'],
-    python_requires='>=3.6',
+    extras_require={'zstd': ['zstandard']},
+    python_requires='>=3.7',
     test_suite='nose.collector',
     tests_require=['nose'],
 )
\ No newline at end of file
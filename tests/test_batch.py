@@ -0,0 +1,41 @@
+import unittest
+import datetime
+import shutil
+import tempfile
+
+import researcher as rs
+
+from researcher.globals import SHARDED_NAME
+
+class TestBatchRecording(unittest.TestCase):
+    def setUp(self):
+        self.path = tempfile.mkdtemp() + "/"
+        self.batch = [({"title": "batch", "seed": i}, {"loss": [[0.5, i], [0.25, i]]}) for i in range(5)]
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def test_records_like_record_experiment(self):
+        names = rs.record_experiments(self.batch + [({"seed": 9}, None, datetime.timedelta(seconds=3))], self.path)
+        self.assertEqual(names, [rs.record_name(p) + ".json" for p, *_ in self.batch] + ["no_title_" + rs.get_hash({"seed": 9}) + ".json"])
+
+        for params, observations in self.batch:
+            e = rs.past_experiment_from_hash(self.path, rs.get_hash(params))
+            self.assertEqual(e.data["seed"], params["seed"])
+            self.assertEqual(e.observations, observations)
+
+        self.assertEqual(rs.load_experiment(self.path, names[-1]).data["duration"], 3.0)
+        self.assertNotIn("hash", self.batch[0][0])
+
+    def test_updates_index_and_shards(self):
+        open(self.path + SHARDED_NAME, "w").close()
+        rs.build_index(self.path)
+
+        names = rs.record_experiments(self.batch, self.path, binary=True, hash_version=2)
+
+        with rs.ExperimentIndex(self.path) as index:
+            self.assertEqual(sorted(index.names()), sorted(names))
+            self.assertTrue(all(index.is_current(name) for name in names))
+
+        self.assertTrue(all(name.startswith(rs.get_hash(p, 2)[:2] + "/") for name, (p, _) in zip(names, self.batch)))
+        self.assertEqual(rs.load_experiment(self.path, names[1]).final_observations("loss"), [1, 1])
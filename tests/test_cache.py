@@ -0,0 +1,73 @@
+import unittest
+import shutil
+import tempfile
+import time
+import os
+
+import researcher as rs
+
+def age(file_name, seconds=60):
+    past = time.time() - seconds
+    os.utime(file_name, (past, past))
+
+class TestExperimentCache(unittest.TestCase):
+    def setUp(self):
+        self.path = tempfile.mkdtemp() + "/"
+        for i in range(3):
+            rs.save_experiment(self.path, f"cached_{i}", {"title": "cached", "hash": f"{i}", "timestamp": "2021-01-01_00:00:0" + str(i)}, {"loss": [0.5, 0.1 * i]})
+            age(self.path + f"cached_{i}.json")
+
+        rs.clear_cache()
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+        rs.clear_cache()
+        rs.configure_cache(max_entries=1024)
+
+    def test_returns_cached_experiments(self):
+        first = rs.load_experiment(self.path, "cached_0")
+        second = rs.load_experiment(self.path, "cached_0.json")
+
+        self.assertIs(first, second)
+        self.assertEqual(rs.cache_info()["hits"], 1)
+        self.assertEqual(rs.cache_info()["misses"], 1)
+
+        lazy = rs.load_experiment(self.path, "cached_0", lazy=True)
+        self.assertIsInstance(lazy, rs.LazyExperiment)
+
+        rs.all_experiments(self.path)
+        rs.all_experiments(self.path, workers=2)
+        self.assertEqual(rs.cache_info()["hits"], 5)
+
+    def test_reloads_modified_records(self):
+        first = rs.load_experiment(self.path, "cached_0")
+        rs.save_experiment(self.path, "cached_0", first.data, {"loss": [0.4, 0.3]})
+        age(self.path + "cached_0.json", 30)
+
+        second = rs.load_experiment(self.path, "cached_0")
+        self.assertIsNot(first, second)
+        self.assertEqual(second.final_observations("loss"), 0.3)
+
+    def test_does_not_cache_fresh_records(self):
+        rs.save_experiment(self.path, "fresh", {"title": "fresh"}, {"loss": [0.5]})
+
+        self.assertIsNot(rs.load_experiment(self.path, "fresh"), rs.load_experiment(self.path, "fresh"))
+
+    def test_evicts_least_recently_used(self):
+        rs.configure_cache(max_entries=2)
+        first = rs.load_experiment(self.path, "cached_0")
+        rs.load_experiment(self.path, "cached_1")
+        rs.load_experiment(self.path, "cached_0")
+        rs.load_experiment(self.path, "cached_2")
+
+        self.assertEqual(rs.cache_info()["entries"], 2)
+        self.assertIs(rs.load_experiment(self.path, "cached_0"), first)
+        self.assertEqual(rs.cache_info()["misses"], 3)
+        rs.load_experiment(self.path, "cached_1")
+        self.assertEqual(rs.cache_info()["misses"], 4)
+
+    def test_can_be_disabled(self):
+        rs.configure_cache(max_entries=0)
+
+        self.assertIsNot(rs.load_experiment(self.path, "cached_0"), rs.load_experiment(self.path, "cached_0"))
+        self.assertEqual(rs.cache_info()["entries"], 0)
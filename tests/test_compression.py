@@ -0,0 +1,66 @@
+import unittest
+import shutil
+import tempfile
+import os
+
+import researcher as rs
+
+from researcher.compression import has_zstd
+from researcher.recordfiles import read_parameters
+
+class TestCompressedRecords(unittest.TestCase):
+    def setUp(self):
+        self.path = tempfile.mkdtemp() + "/"
+        self.params = [{"title": "compressed", "seed": i} for i in range(4)]
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def record_all(self):
+        for i, p in enumerate(self.params):
+            rs.record_experiment(p, self.path, observations={"loss": [[0.5, p["seed"]]]}, binary=i == 1, compression="gzip" if i % 2 == 0 else None)
+
+    def test_reads_compressed_and_plain_records(self):
+        self.record_all()
+
+        name = rs.record_name(self.params[0])
+        self.assertTrue(os.path.isfile(self.path + name + ".json.gz"))
+        self.assertTrue(any(f.startswith(rs.record_name(self.params[1])) and f.endswith(".bin") for f in os.listdir(self.path)))
+
+        self.assertEqual(rs.load_experiment(self.path, name).data["seed"], 0)
+        self.assertEqual(rs.load_experiment(self.path, name + ".json.gz", lazy=True).observations["loss"], [[0.5, 0]])
+        self.assertEqual(read_parameters(self.path + name + ".json.gz")["seed"], 0)
+
+        self.assertEqual(sorted(e.data["seed"] for e in rs.all_experiments(self.path)), [0, 1, 2, 3])
+        for p in self.params:
+            self.assertEqual(rs.past_experiment_from_hash(self.path, rs.get_hash(p)).final_observations("loss"), [p["seed"]])
+
+    def test_indexes_and_shards_compressed_records(self):
+        self.record_all()
+        rs.build_index(self.path)
+        rs.shard_records(self.path)
+
+        self.assertEqual(sorted(e.data["seed"] for e in rs.all_experiments(self.path, lazy=True)), [0, 1, 2, 3])
+        self.assertEqual(rs.past_experiment_from_hash(self.path, rs.get_hash(self.params[2])).data["seed"], 2)
+        self.assertEqual(rs.query(self.path, seed__gte=2)[0].data["title"], "compressed")
+
+    def test_falls_back_to_gzip(self):
+        name = rs.save_experiment(self.path, "zstd", {"a": 1}, {"loss": [1, 2]}, compact=True, compression="zstd")
+
+        self.assertEqual(name, "zstd.json.zst" if has_zstd() else "zstd.json.gz")
+        self.assertEqual(rs.load_experiment(self.path, "zstd").observations, {"loss": [1, 2]})
+        self.assertRaises(ValueError, rs.save_experiment, self.path, "bad", {}, None, compression="lzma")
+
+    def test_replaces_records_saved_with_other_compression(self):
+        rs.build_index(self.path)
+        rs.record_experiment(self.params[0], self.path, {"loss": [1, 2]}, binary=True)
+        rs.record_experiment(self.params[0], self.path, {"loss": [3]}, compression="gzip")
+        rs.record_experiments([(self.params[1], {"loss": [1]})], self.path, compression="gzip")
+        rs.record_experiments([(self.params[1], {"loss": [2]})], self.path)
+
+        with rs.ExperimentIndex(self.path) as index:
+            self.assertEqual(sorted(index.names()), sorted([rs.record_name(self.params[0]) + ".json.gz", rs.record_name(self.params[1]) + ".json"]))
+
+        self.assertEqual(sorted(os.listdir(self.path)), sorted([".researcher_index.sqlite", rs.record_name(self.params[0]) + ".json.gz", rs.record_name(self.params[1]) + ".json"]))
+        self.assertEqual(rs.past_experiment_from_hash(self.path, rs.get_hash(self.params[0])).observations, {"loss": [3]})
+        self.assertEqual([e.observations["loss"] for e in rs.all_experiments(self.path)], [[3], [2]])
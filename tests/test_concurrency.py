@@ -0,0 +1,61 @@
+import unittest
+import shutil
+import tempfile
+import multiprocessing
+import os
+
+import researcher as rs
+
+N_WORKERS = 4
+N_RECORDS = 10
+
+def record_trials(path, worker):
+    for i in range(N_RECORDS):
+        params = {"title": "stress", "worker": worker, "trial": i}
+        rs.record_experiment(params, path, observations={"loss": [[0.1] * 2000]})
+
+        # every worker rewrites the same shared record while others read it.
+        rs.record_experiment({"title": "shared"}, path, observations={"loss": [[worker] * (i + 1) * 100]})
+
+def read_records(path, stop):
+    errors = 0
+    while not stop.is_set():
+        names = os.listdir(path) if os.path.isdir(path) else []
+        for name in names:
+            if name.startswith("shared_"):
+                try:
+                    rs.load_experiment(path, name)
+                except ValueError:
+                    errors += 1
+    return errors
+
+class TestConcurrentRecording(unittest.TestCase):
+    def setUp(self):
+        self.path = tempfile.mkdtemp() + "/"
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def stress(self, path):
+        stop = multiprocessing.Manager().Event()
+
+        with multiprocessing.Pool(N_WORKERS + 1) as pool:
+            reader = pool.apply_async(read_records, (path, stop))
+            pool.starmap(record_trials, [(path, worker) for worker in range(N_WORKERS)])
+            stop.set()
+            self.assertEqual(reader.get(), 0)
+
+        experiments = rs.all_experiments(path)
+        self.assertEqual(len(experiments), N_WORKERS * N_RECORDS + 1)
+        self.assertFalse([name for name in os.listdir(path) if name.endswith(".tmp")])
+
+    def test_records_concurrently_into_new_directory(self):
+        self.stress(self.path + "records/")
+
+    def test_records_concurrently_into_indexed_directory(self):
+        rs.build_index(self.path)
+        self.stress(self.path)
+
+        with rs.ExperimentIndex(self.path) as index:
+            self.assertEqual(len(index.names()), N_WORKERS * N_RECORDS + 1)
+            self.assertEqual(len(index.find(rs.get_hash({"title": "shared"}))), 1)
@@ -131,3 +131,32 @@ class TestExperiment(unittest.TestCase):
         e = Experiment(self.mse_experiment)
 
         self.assertEqual(e.observations, expected_observations)
+
+
+class TestLazyExperiment(unittest.TestCase):
+    def test_defers_loading_observations(self):
+        e = rs.load_experiment(TEST_DATA_PATH, "example_epoch_record_sadasd328234g123v213b31271bn.json", lazy=True)
+
+        self.assertIsInstance(e, rs.LazyExperiment)
+        self.assertNotIn("observations", e.data)
+        self.assertEqual(e.get_hash(), "sadasd328234g123v213b31271bn")
+        self.assertFalse(e.observations.is_loaded())
+
+        self.assertTrue(e.has_observation("mse"))
+        self.assertTrue(e.observations.is_loaded())
+        self.assertEqual(e.final_observations("mse"), [0.78, 0.11, 0.21, 0.09, 0.72])
+        self.assertEqual(e.n_folds(), 5)
+
+    def test_matches_eager_experiment(self):
+        eager = rs.past_experiment_from_hash(TEST_DATA_PATH, "28hbsb12")
+        lazy = rs.past_experiment_from_hash(TEST_DATA_PATH, "28hbsb12", lazy=True)
+
+        self.assertEqual(lazy.timestamp, eager.timestamp)
+        self.assertEqual(lazy.identifier(), eager.identifier())
+        self.assertEqual(lazy.observations, eager.observations)
+
+    def test_handles_missing_observations(self):
+        e = rs.load_experiment(TEST_DATA_PATH, "experiments/cool_experiment_d45dee5991986a5b8215706f5e904b3e", lazy=True)
+
+        self.assertFalse(e.has_observation("mse"))
+        self.assertEqual(e.n_folds(), 0)
@@ -0,0 +1,80 @@
+import unittest
+import shutil
+import tempfile
+import csv
+import os
+from unittest import mock
+
+import numpy as np
+import researcher as rs
+
+from tests.tools import TEST_DATA_PATH
+
+class TestExportTable(unittest.TestCase):
+    def setUp(self):
+        self.path = tempfile.mkdtemp() + "/"
+        self.out = tempfile.mkdtemp() + "/"
+
+        rs.record_experiment({"title": "a", "lr": 0.1, "optimizer": {"name": "adam", "beta": 0.9}, "layers": [1, 2]}, self.path, {"loss": [[3, 1], [2, 2]], "acc": [0.5, 0.7]})
+        rs.record_experiment({"title": "b", "lr": "auto", "seed": 3}, self.path, {"loss": [1.0, 0.5]})
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+        shutil.rmtree(self.out)
+
+    def read_csv(self, name):
+        with open(self.out + name, newline="") as f:
+            return sorted(csv.DictReader(f), key=lambda row: row["title"])
+
+    def test_exports_csv(self):
+        self.assertEqual(rs.export_table(self.path, self.out + "table.csv", chunk_size=1), 2)
+
+        a, b = self.read_csv("table.csv")
+        self.assertEqual(list(a), ["hash", "layers", "lr", "optimizer.beta", "optimizer.name", "seed", "timestamp", "title", "observations.acc.final", "observations.loss.final"])
+        self.assertEqual((a["layers"], a["optimizer.name"], a["seed"], a["observations.acc.final"], a["observations.loss.final"]), ("[1, 2]", "adam", "", "0.7", "1.5"))
+        self.assertEqual((b["lr"], b["seed"], b["observations.acc.final"], b["observations.loss.final"]), ("auto", "3", "", "0.5"))
+
+    def test_exports_structured_array(self):
+        rs.build_index(self.path)
+        self.assertEqual(rs.export_table(self.path, self.out + "table.npy", metrics=["loss"], statistic="min"), 2)
+
+        table = np.sort(np.load(self.out + "table.npy"), order="title")
+        self.assertEqual(table.dtype["lr"].kind, "U")
+        self.assertEqual(table.dtype["optimizer.beta"].kind, "f")
+        self.assertEqual(table["lr"].tolist(), ["0.1", "auto"])
+        np.testing.assert_allclose(table["seed"], [np.nan, 3])
+        np.testing.assert_allclose(table["observations.loss.min"], [1.5, 0.5])
+        self.assertNotIn("observations.acc.min", table.dtype.names)
+
+    def test_reads_records_without_summaries(self):
+        shutil.copy(TEST_DATA_PATH + "example_record_28hbsb12bns8612vt26867156.json", self.path)
+        expected = np.mean(rs.load_experiment(self.path, "example_record_28hbsb12bns8612vt26867156.json").final_observations("mse"))
+
+        rs.export_table(self.path, self.out + "table.csv", metrics=["mse"])
+
+        rows = {row["title"]: row for row in self.read_csv("table.csv")}
+        self.assertAlmostEqual(float(rows["test"]["observations.mse.final"]), expected, places=2)
+        self.assertEqual(rows["a"]["observations.mse.final"], "")
+
+    def test_separates_parameters_from_metrics(self):
+        rs.record_experiment({"title": "c", "loss": {"final": 7}}, self.path, {"loss": [2.0]})
+        rs.export_table(self.path, self.out + "table.npy", metrics=["loss"])
+
+        table = np.sort(np.load(self.out + "table.npy"), order="title")
+        np.testing.assert_allclose(table["loss.final"], [np.nan, np.nan, 7])
+        np.testing.assert_allclose(table["observations.loss.final"], [1.5, 0.5, 2])
+
+        rs.record_experiment({"title": "d", "a.b": 1, "a": {"b": 2}}, self.path)
+        self.assertRaises(ValueError, rs.export_table, self.path, self.out + "clash.csv")
+
+    def test_leaves_no_partial_tables(self):
+        for name in ["table.csv", "table.npy"]:
+            with mock.patch("researcher.export.fold_mean", side_effect=RuntimeError("failed")):
+                self.assertRaises(RuntimeError, rs.export_table, self.path, self.out + name)
+
+        self.assertEqual(os.listdir(self.out), [])
+
+    def test_rejects_unknown_formats(self):
+        self.assertRaises(ValueError, rs.export_table, self.path, self.out + "table.xlsx")
+        self.assertRaises(ValueError, rs.export_table, self.path, self.out + "table.csv", statistic="median")
+        self.assertFalse(os.listdir(self.out))
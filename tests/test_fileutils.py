@@ -1,6 +1,9 @@
 from researcher.fileutils import past_experiment_from_hash
+from researcher.recordfiles import read_parameters
 import unittest
 import json
+import shutil
+import tempfile
 
 import numpy as np
 import researcher as rs
@@ -46,4 +49,47 @@ class TestFileUtils(unittest.TestCase):
         with open(TEST_DATA_PATH + "somename.json") as f:
             saved = json.load(f)
 
-        self.assertDictEqual(saved, expected)
\ No newline at end of file
+        self.assertDictEqual(saved, expected)
+
+    def test_loads_in_parallel(self):
+        names = ["example_record_28hbsb12bns8612vt26867156.json", "example_epoch_record_sadasd328234g123v213b31271bn.json", "epoch_record2_6576g326g7112.json"]
+        expected = [e.data for e in rs.load_experiments(TEST_DATA_PATH, names)]
+
+        self.assertEqual([e.data for e in rs.load_experiments(TEST_DATA_PATH, names, workers=2)], expected)
+        self.assertEqual([e.data for e in rs.load_experiments(TEST_DATA_PATH, names, workers=2, processes=False)], expected)
+
+        lazy = rs.load_experiments(TEST_DATA_PATH, names, lazy=True, workers=2)
+        self.assertEqual([e.observations for e in lazy], [d["observations"] for d in expected])
+
+    def test_reads_parameters_without_observations(self):
+        path = tempfile.mkdtemp() + "/"
+        params = {"a": "observations\": {", "b": {"observations": [1, 2]}, "c": "é中", "d": [5, 6, 7]}
+        rs.save_experiment(path, "header", params, observations={"loss": [0.1] * 10000})
+
+        self.assertDictEqual(read_parameters(path + "header.json"), params)
+
+        with open(path + "header.json", "w") as f:
+            f.write('{"a": 4, "observations": {"loss": [0.1, 0.')
+
+        self.assertDictEqual(read_parameters(path + "header.json"), {"a": 4})
+
+        with open(path + "header.json", "w") as f:
+            f.write('{"a": 4, "b": [0.1, 0.')
+
+        self.assertRaises(ValueError, read_parameters, path + "header.json")
+        shutil.rmtree(path)
+
+    def test_hashes_canonically(self):
+        params = {"title": "cool_experiment", "learning_rate": 0.003, "batch_size": 32, "alpha": 2e-9, "model": "rnn"}
+        self.assertEqual(rs.get_hash(params), "d45dee5991986a5b8215706f5e904b3e")
+
+        v2 = rs.get_hash(params, version=2)
+        self.assertEqual(len(v2), 32)
+        self.assertNotEqual(v2, rs.get_hash(params))
+
+        reordered = {"model": "rnn", "alpha": 2e-9, "batch_size": np.int64(32), "learning_rate": np.float64(0.003), "title": "cool_experiment"}
+        self.assertEqual(rs.get_hash(reordered, version=2), v2)
+        self.assertNotEqual(rs.get_hash(reordered), rs.get_hash(params))
+
+        self.assertEqual(rs.get_hash({"a": np.array([1, 2]), "b": np.bool_(True)}, 2), rs.get_hash({"b": True, "a": [1, 2]}, 2))
+        self.assertRaises(ValueError, rs.get_hash, params, 3)
@@ -0,0 +1,58 @@
+import unittest
+import shutil
+import tempfile
+
+import numpy as np
+import researcher as rs
+
+class TestGroupExperiments(unittest.TestCase):
+    def setUp(self):
+        self.experiments = [
+            rs.Experiment({"title": "grouped", "hash": str(i), "lr": lr, "seed": seed, "observations": {"loss": [[seed, lr * 10 + seed], [2.0, lr * 10]]}})
+            for i, (lr, seed) in enumerate([(0.1, 0), (0.2, 0), (0.1, 1), (0.2, 1), (0.1, 2)])
+        ]
+        self.experiments.append(rs.Experiment({"title": "grouped", "hash": "6", "lr": 0.3, "seed": 0, "observations": {}}))
+
+    def test_groups_by_all_but_seed(self):
+        groups = rs.group_experiments(self.experiments)
+
+        self.assertEqual(groups.keys, ["lr"])
+        self.assertEqual(groups.groups, [{"lr": 0.1}, {"lr": 0.2}, {"lr": 0.3}])
+        self.assertEqual(groups.indices.tolist(), [0, 1, 0, 1, 0, 2])
+        self.assertEqual([e.get_hash() for e in groups.members(1)], ["1", "3"])
+
+        self.assertEqual(rs.group_experiments(self.experiments, by=["seed"]).groups, [{"seed": 0}, {"seed": 1}, {"seed": 2}])
+
+    def test_aggregates_final_values(self):
+        stats = rs.group_experiments(self.experiments).aggregate("loss", quantiles=(0.5,))
+
+        self.assertEqual(stats["count"].tolist(), [3, 2, 0])
+        np.testing.assert_allclose(stats["mean"], [1.5, 2.25, np.nan])
+        np.testing.assert_allclose(stats["std"], [np.std([1, 1.5, 2]), 0.25, np.nan])
+        np.testing.assert_allclose(stats["quantiles"], [[1.5], [2.25], [np.nan]])
+
+        best = rs.group_experiments(self.experiments).aggregate("loss", "min", quantiles=())
+        np.testing.assert_allclose(best["mean"], [1.0, 1.25, np.nan])
+        self.assertRaises(ValueError, rs.group_experiments(self.experiments).aggregate, "loss", "median")
+
+    def test_aggregates_steps(self):
+        stats = rs.group_experiments(self.experiments).aggregate_steps("loss", ddof=1)
+
+        self.assertEqual(stats["mean"].shape, (3, 2))
+        np.testing.assert_allclose(stats["mean"][1], [1.25, 2.25])
+        np.testing.assert_allclose(stats["std"][0], [0.5, 0.5])
+        self.assertEqual(stats["quantiles"].shape, (3, 3, 2))
+
+    def test_uses_stored_summaries(self):
+        path = tempfile.mkdtemp() + "/"
+        try:
+            for seed in range(3):
+                rs.record_experiment({"title": "summarized", "seed": seed}, path, {"loss": [seed, 1, 0.5 * seed]})
+
+            experiments = rs.all_experiments(path, lazy=True)
+            stats = rs.group_experiments(experiments).aggregate("loss", "max")
+
+            np.testing.assert_allclose(stats["mean"], [4 / 3])
+            self.assertFalse(any(e.observations.is_loaded() for e in experiments))
+        finally:
+            shutil.rmtree(path)
@@ -0,0 +1,23 @@
+import unittest
+import subprocess
+import sys
+
+# The most time importing researcher may take, in seconds. Importing 
+# matplotlib.pyplot alone takes longer than this.
+IMPORT_BUDGET = 0.3
+
+class TestImportTime(unittest.TestCase):
+    def run_python(self, code):
+        return subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True).stdout.split()
+
+    def test_import_is_fast(self):
+        seconds = min(float(self.run_python("import time; start = time.perf_counter(); import researcher; print(time.perf_counter() - start)")[0]) for _ in range(3))
+        self.assertLess(seconds, IMPORT_BUDGET)
+
+    def test_heavy_modules_are_imported_lazily(self):
+        modules = ["numpy", "matplotlib", "asyncio", "concurrent.futures"]
+        loaded = self.run_python(f"import sys, researcher; print(*[m for m in {modules} if m in sys.modules])")
+        self.assertEqual(loaded, [])
+
+        loaded = self.run_python("import sys, researcher; researcher.metric_matrix; print('numpy' in sys.modules)")
+        self.assertEqual(loaded, ["True"])
@@ -0,0 +1,116 @@
+import unittest
+import shutil
+import tempfile
+import os
+import sqlite3
+from unittest import mock
+
+import researcher as rs
+
+from researcher.globals import INDEX_NAME
+from tests.tools import TEST_DATA_PATH
+
+class TestExperimentIndex(unittest.TestCase):
+    def setUp(self):
+        self.path = tempfile.mkdtemp() + "/"
+        for name in os.listdir(TEST_DATA_PATH):
+            if name.endswith(".json") and name != "somename.json":
+                shutil.copy(TEST_DATA_PATH + name, self.path)
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def test_builds_index(self):
+        self.assertFalse(rs.has_index(self.path))
+        rs.build_index(self.path)
+        self.assertTrue(rs.has_index(self.path))
+
+        with rs.ExperimentIndex(self.path) as index:
+            self.assertEqual(len(index.names()), 5)
+            params = index.parameters("example_record_28hbsb12bns8612vt26867156.json")
+
+        self.assertEqual(params["description"], "this is the first example record")
+        self.assertNotIn("observations", params)
+
+    def test_finds_experiments_by_hash(self):
+        rs.build_index(self.path)
+
+        e = rs.past_experiment_from_hash(self.path, "sadasd32823")
+        self.assertEqual(e.get_hash(), "sadasd328234g123v213b31271bn")
+
+        e = rs.past_experiment_from_hash(self.path, "7y2137h78123hhabsd8")
+        self.assertEqual(e.observations["batch_loss"], rs.load_experiment(TEST_DATA_PATH, "epoch_record3_7y2137h78123hhabsd8y.json").observations["batch_loss"])
+
+        self.assertRaises(ValueError, rs.past_experiment_from_hash, self.path, "nonexistenthash")
+
+    def test_finds_hash_segments_anywhere_in_hashes(self):
+        rs.save_experiment(self.path, "first_12345678abcdef", {"run": 1}, None)
+        rs.save_experiment(self.path, "second_abcd12345678ef", {"run": 2}, None)
+        rs.build_index(self.path)
+
+        self.assertEqual(rs.past_experiment_from_hash(self.path, "5678abcd").data["run"], 1)
+        self.assertEqual(rs.past_experiment_from_hash(self.path, "cd12345678").data["run"], 2)
+        self.assertRaises(ValueError, rs.past_experiment_from_hash, self.path, "12345678")
+
+    def test_looks_up_complete_hashes_in_index(self):
+        rs.save_experiment(self.path, "first_12345678", {"run": 1}, None)
+        rs.save_experiment(self.path, "second_ab12345678cd", {"run": 2}, None)
+        rs.build_index(self.path)
+
+        with rs.ExperimentIndex(self.path) as index:
+            self.assertEqual(index.find("12345678"), ["first_12345678.json"])
+            self.assertEqual(sorted(index.find("2345678")), ["first_12345678.json", "second_ab12345678cd.json"])
+
+    def test_matches_unindexed_loading(self):
+        expected = [e.data for e in rs.all_experiments(self.path)]
+        rs.build_index(self.path)
+
+        self.assertEqual([e.data for e in rs.all_experiments(self.path)], expected)
+
+    def test_record_experiment_updates_index(self):
+        rs.build_index(self.path)
+        rs.record_experiment({"title": "indexed", "lr": 0.1}, self.path, observations={"loss": [0.5, 0.4]})
+
+        with rs.ExperimentIndex(self.path) as index:
+            names = index.find(rs.get_hash({"title": "indexed", "lr": 0.1}))
+
+        self.assertEqual(len(names), 1)
+        self.assertTrue(names[0].startswith("indexed_"))
+
+    def test_refresh_picks_up_changes(self):
+        rs.build_index(self.path)
+
+        os.remove(self.path + "example_record_28hbsb12bns8612vt26867156.json")
+        shutil.copy(TEST_DATA_PATH + "experiments/cool_experiment_d45dee5991986a5b8215706f5e904b3e.json", self.path)
+
+        e = rs.past_experiment_from_hash(self.path, "d45dee5991986a5b")
+        self.assertEqual(e.data["model"], "rnn")
+        self.assertRaises(ValueError, rs.past_experiment_from_hash, self.path, "28hbsb12")
+
+        with rs.ExperimentIndex(self.path) as index:
+            self.assertEqual(len(index.names()), 5)
+
+        self.assertTrue(os.path.isfile(self.path + INDEX_NAME))
+
+    def test_loads_lazy_experiments_from_index(self):
+        rs.build_index(self.path)
+        expected = rs.all_experiments(self.path)
+        experiments = rs.all_experiments(self.path, lazy=True)
+
+        self.assertTrue(all(isinstance(e, rs.LazyExperiment) for e in experiments))
+        self.assertFalse(any(e.observations.is_loaded() for e in experiments))
+        self.assertEqual([e.get_hash() for e in experiments], [e.get_hash() for e in expected])
+        self.assertEqual([e.observations for e in experiments], [e.observations for e in expected])
+
+    def test_opens_without_waiting_for_writers(self):
+        rs.build_index(self.path)
+
+        writer = sqlite3.connect(self.path + INDEX_NAME)
+        writer.execute("BEGIN IMMEDIATE")
+        try:
+            with mock.patch("researcher.index.INDEX_TIMEOUT", 0.1):
+                with rs.ExperimentIndex(self.path) as index:
+                    self.assertEqual(len(index.names()), 5)
+        finally:
+            writer.rollback()
+            writer.close()
@@ -0,0 +1,44 @@
+import unittest
+
+import numpy as np
+import researcher as rs
+
+def experiment(hash, observations):
+    return rs.Experiment({"title": "matrix", "hash": hash, "observations": observations})
+
+class TestMetricMatrix(unittest.TestCase):
+    def setUp(self):
+        self.experiments = [
+            experiment("aaaaaaaa1", {"loss": [[0.9, 0.5, 0.4], [0.8, 0.6]]}),
+            experiment("bbbbbbbb2", {"loss": [0.7, 0.2, 0.3]}),
+            experiment("cccccccc3", {"accuracy": [0.5]}),
+            experiment("dddddddd4", {"loss": 0.1}),
+        ]
+        self.matrix = rs.metric_matrix(self.experiments, "loss")
+
+    def test_pads_values(self):
+        self.assertEqual(self.matrix.values.shape, (4, 2, 3))
+        self.assertTrue(np.isnan(self.matrix.values[0, 1, 2]))
+        self.assertTrue(np.all(np.isnan(self.matrix.values[2])))
+        self.assertEqual(self.matrix.lengths.tolist(), [[3, 2], [3, 0], [0, 0], [1, 0]])
+        self.assertEqual(self.matrix.identifiers[0], "matrix_aaaaaaaa")
+
+    def test_matches_final_observations(self):
+        finals = self.matrix.final_values()
+
+        self.assertEqual(finals[0].tolist(), self.experiments[0].final_observations("loss"))
+        self.assertEqual(finals[1, 0], self.experiments[1].final_observations("loss"))
+        self.assertAlmostEqual(self.matrix.final_means()[0], np.mean(self.experiments[0].final_observations("loss")))
+        self.assertTrue(np.isnan(self.matrix.final_means()[2]))
+
+    def test_aggregates(self):
+        self.assertEqual(self.matrix.best_steps().tolist(), [2, 1, -1, 0])
+        self.assertEqual(self.matrix.best_steps(minimize=False).tolist(), [0, 0, -1, 0])
+        self.assertEqual(self.matrix.ranking().tolist(), [3, 1, 0, 2])
+        self.assertEqual(self.matrix.ranking(minimize=False)[0], 0)
+
+    def test_gathers_several_metrics(self):
+        matrices = rs.metric_matrices(self.experiments, ["loss", "accuracy"])
+
+        self.assertEqual(matrices["accuracy"].values.shape, (4, 1, 1))
+        self.assertEqual(matrices["accuracy"].final_means()[2], 0.5)
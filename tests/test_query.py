@@ -0,0 +1,80 @@
+import unittest
+import shutil
+import tempfile
+import os
+
+import researcher as rs
+
+from researcher.globals import INDEX_NAME
+
+class TestQuery(unittest.TestCase):
+    def setUp(self):
+        self.path = tempfile.mkdtemp() + "/"
+        for model in ["rnn", "cnn"]:
+            for learning_rate in [1e-2, 1e-3, 1e-4]:
+                for batch_size in [32, 64]:
+                    params = {"title": model, "model": model, "learning_rate": learning_rate, "batch_size": batch_size}
+                    rs.record_experiment(params, self.path, observations={"loss": [[0.5, learning_rate]]})
+        rs.record_experiment({"title": "other", "model": "rnn"}, self.path)
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def assertQueryMatches(self, expected_count, **conditions):
+        if rs.has_index(self.path):
+            os.remove(self.path + INDEX_NAME)
+
+        unindexed = rs.query(self.path, **conditions)
+        self.assertEqual(len(unindexed), expected_count)
+
+        rs.build_index(self.path)
+        indexed = rs.query(self.path, **conditions)
+        self.assertEqual(sorted(e.get_hash() for e in indexed), sorted(e.get_hash() for e in unindexed))
+
+        return indexed
+
+    def test_filters_on_equality(self):
+        experiments = self.assertQueryMatches(3, model="rnn", batch_size=32)
+        self.assertFalse(experiments[0].observations.is_loaded())
+        self.assertTrue(all(e.data["model"] == "rnn" and e.data["batch_size"] == 32 for e in experiments))
+
+        self.assertQueryMatches(7, model="rnn")
+        self.assertQueryMatches(0, model="transformer")
+        self.assertQueryMatches(6, model__ne="rnn")
+        self.assertQueryMatches(6, batch_size=32.0)
+
+    def test_filters_on_comparisons(self):
+        self.assertQueryMatches(4, model="rnn", learning_rate__lt=1e-2)
+        self.assertQueryMatches(8, learning_rate__gte=1e-3)
+        self.assertQueryMatches(4, learning_rate__lte=1e-4, batch_size__gt=16)
+        self.assertQueryMatches(7, model__gt="co")
+
+    def test_orders_strings_only_against_strings(self):
+        for i, model in enumerate([True, None, ["a"], "x", 3]):
+            rs.record_experiment({"title": "mixed", "run": i, "model": model}, self.path)
+
+        self.assertEqual([e.data["model"] for e in self.assertQueryMatches(1, model__gt="s")], ["x"])
+        self.assertQueryMatches(13, model__lt="s")
+        self.assertQueryMatches(14, model__lte="x")
+        self.assertQueryMatches(11, model__ne="rnn")
+        self.assertQueryMatches(1, model__gte=3)
+
+    def test_filters_on_membership(self):
+        self.assertQueryMatches(8, learning_rate__in=[1e-2, 1e-4])
+        self.assertQueryMatches(13, model__in=["rnn", "cnn"])
+        self.assertQueryMatches(0, model__in=[])
+
+    def test_loads_eagerly(self):
+        experiments = rs.query(self.path, lazy=False, model="cnn", learning_rate=1e-3)
+
+        self.assertEqual(len(experiments), 2)
+        self.assertIsInstance(experiments[0].observations, dict)
+        self.assertEqual(experiments[0].final_observations("loss"), [1e-3])
+
+    def test_rejects_unknown_operators(self):
+        self.assertRaises(ValueError, rs.query, self.path, model__lt=["rnn"])
+        self.assertRaises(ValueError, rs.query, self.path, model__in="rnn")
+
+        rs.build_index(self.path)
+        self.assertRaises(ValueError, rs.query, self.path, model__lt=["rnn"])
+        self.assertRaises(ValueError, rs.query, self.path, model__in="rnn")
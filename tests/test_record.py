@@ -1,6 +1,8 @@
 import unittest
 import os
 import glob
+import shutil
+import tempfile
 
 import researcher as rs
 import numpy as np
@@ -81,4 +83,27 @@ class TestSavingExperiment(unittest.TestCase):
         rs.record_experiment(params, TEST_EXPERIMENT_PATH, observations=res.observations)
 
         self.assertTrue(os.path.isfile(TEST_EXPERIMENT_PATH + "cool_experiment_d45dee5991986a5b8215706f5e904b3e.json"))
-        e = rs.load_experiment(TEST_EXPERIMENT_PATH, "cool_experiment_d45dee5991986a5b8215706f5e904b3e.json")
\ No newline at end of file
+        e = rs.load_experiment(TEST_EXPERIMENT_PATH, "cool_experiment_d45dee5991986a5b8215706f5e904b3e.json")
+
+class TestRecordingWithHashVersion(unittest.TestCase):
+    def setUp(self):
+        self.path = tempfile.mkdtemp() + "/"
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def test_records_with_hash_version(self):
+        params = {
+            "title": "cool_experiment",
+            "learning_rate": 0.003,
+            "model": "rnn",
+        }
+
+        rs.record_experiment(params, self.path, hash_version=2)
+
+        name = rs.record_name(params, hash_version=2) + ".json"
+        self.assertTrue(os.path.isfile(self.path + name))
+
+        e = rs.load_experiment(self.path, name)
+        self.assertEqual(e.get_hash(), rs.get_hash(params, 2))
+        self.assertEqual(e.data["hash_version"], 2)
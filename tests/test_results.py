@@ -1,5 +1,6 @@
 import unittest
 
+import numpy as np
 import researcher as rs
 
 from tests.tools import TEST_DATA_PATH
@@ -108,3 +109,48 @@ class TestObservationAnalysis(unittest.TestCase):
 
 
     
+
+    def test_compact_collector_matches_collector(self):
+        rb = rs.ObservationCollector()
+        compact = rs.CompactObservationCollector()
+
+        for collector in [rb, compact]:
+            collector.add_fold_observations(0, "loss", [0.5, 0.4, 0.3])
+            collector.add_fold_observation(2, "loss", 0.2)
+            collector.set_observation("final_score", 0.9)
+            collector.add_fold_observation(0, "labels", "a")
+
+        self.assertEqual(compact.observations, rb.observations)
+        self.assertEqual(compact.fold_arrays("loss")[0].tolist(), [0.5, 0.4, 0.3])
+        self.assertRaises(ValueError, compact.set_observation, "loss", 0.5)
+        self.assertRaises(ValueError, compact.add_fold_observation, 0, "final_score", 0.5)
+
+    def test_compact_collector_keeps_value_types(self):
+        rb = rs.ObservationCollector()
+        compact = rs.CompactObservationCollector()
+
+        for collector in [rb, compact]:
+            collector.add_fold_observations(0, "epochs", [1, 2, 3])
+            collector.add_fold_observation(1, "epochs", 4)
+            collector.add_fold_observation(0, "improved", True)
+            collector.add_fold_observations(0, "mixed", [0.5, 1])
+            collector.add_fold_observation(0, "mixed", True)
+            collector.add_fold_observation(1, "mixed", 2.5)
+
+        self.assertEqual(compact.observations, rb.observations)
+        self.assertEqual([type(v) for v in compact.observations["epochs"][0] + compact.observations["mixed"][0]], [int, int, int, float, int, bool])
+        self.assertEqual(compact.schema(), rb.schema())
+        self.assertEqual(compact.schema()["epochs"]["dtype"], "int")
+
+        compact = rs.CompactObservationCollector()
+        compact.add_fold_observations(0, "loss", np.array([0.5, 0.25]))
+        compact.add_fold_observation(0, "loss", np.float64(0.125))
+        compact.add_fold_observation(0, "steps", np.int64(3))
+        compact.add_fold_observation(0, "lr", np.float32(0.5))
+        compact.add_fold_observation(0, "precise", np.longdouble(0.5))
+        self.assertEqual(compact.observations, {"loss": [[0.5, 0.25, 0.125]], "steps": [[3]], "lr": [[0.5]], "precise": [[0.5]]})
+        self.assertEqual([type(compact.observations[key][0][0]) for key in ["loss", "steps", "lr", "precise"]], [float, int, float, np.longdouble])
+
+        explicit = rs.CompactObservationCollector("d")
+        explicit.add_fold_observation(0, "epochs", 1)
+        self.assertIs(type(explicit.observations["epochs"][0][0]), float)
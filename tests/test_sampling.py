@@ -0,0 +1,39 @@
+import unittest
+
+import numpy as np
+import researcher as rs
+
+class TestDownsample(unittest.TestCase):
+    def test_keeps_extremes(self):
+        values = np.sin(np.linspace(0, 20, 100001))
+        values[12345] = 5
+        values[67890] = -5
+        values[500] = np.nan
+
+        steps, kept = rs.downsample(values, 100)
+
+        self.assertLessEqual(len(steps), 100)
+        self.assertTrue(np.all(np.diff(steps) > 0))
+        self.assertIn(12345, steps)
+        self.assertIn(67890, steps)
+        self.assertTrue(np.array_equal(kept, values[steps]))
+        self.assertEqual(np.nanmax(kept), 5)
+
+        steps, kept = rs.downsample([1, 2, 3], 100)
+        self.assertEqual(list(steps), [0, 1, 2])
+        self.assertRaises(ValueError, rs.downsample, values, 1)
+
+    def test_caches_per_experiment_metric_and_size(self):
+        e = rs.Experiment({"observations": {"loss": [list(range(1000)), list(range(1000, 0, -1))], "lr": list(range(50))}})
+
+        folds = e.downsampled_folds("loss", 10)
+        self.assertEqual(len(folds), 2)
+        self.assertEqual(list(folds[0][1]), [0, 199, 200, 399, 400, 599, 600, 799, 800, 999])
+        self.assertIs(e.downsampled_folds("loss", 10), folds)
+        self.assertIsNot(e.downsampled_folds("loss", 20), folds)
+
+        steps, mean = e.downsampled_mean("loss", 10)
+        self.assertTrue(np.allclose(mean, 500))
+
+        self.assertEqual(len(e.downsampled_folds("lr", 10)), 1)
+        self.assertEqual(len(e.downsampled_mean("lr")[0]), 50)
@@ -0,0 +1,52 @@
+import unittest
+import shutil
+import tempfile
+
+import numpy as np
+import researcher as rs
+
+from researcher.globals import SCHEMA_KEY
+from researcher.schema import infer_schema
+
+class TestObservationSchema(unittest.TestCase):
+    def setUp(self):
+        self.path = tempfile.mkdtemp() + "/"
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def test_describes_observations(self):
+        schema = infer_schema({"loss": [[1, 2], [3.5]], "lr": np.arange(4), "best": 5, "flags": [True, False], "names": ["a", 1]})
+
+        self.assertEqual(schema["loss"], {"kind": "folds", "folds": 2, "lengths": [2, 1], "dtype": "float"})
+        self.assertEqual(schema["lr"], {"kind": "series", "folds": 1, "lengths": [4], "dtype": "int"})
+        self.assertEqual(schema["best"], {"kind": "value"})
+        self.assertEqual(schema["flags"]["dtype"], "bool")
+        self.assertEqual(schema["names"]["dtype"], "object")
+
+    def test_stores_schema_in_header(self):
+        collector = rs.CompactObservationCollector()
+        collector.set_observation("confusion", [[3, 1], [0, 4]])
+        for fold in range(3):
+            collector.add_fold_observations(fold, "loss", [0.5, 0.25])
+
+        rs.record_experiment_with_collector({"title": "schema"}, self.path, collector)
+        rs.record_experiment({"title": "inferred"}, self.path, {"loss": [[0.5], [0.4]]})
+
+        e = rs.past_experiment_from_hash(self.path, rs.get_hash({"title": "schema"}), lazy=True)
+        self.assertEqual(e.schema()["confusion"]["kind"], "series")
+        self.assertEqual(e.schema()["loss"], {"kind": "folds", "folds": 3, "lengths": [2, 2, 2], "dtype": "float"})
+        self.assertEqual(e.n_folds(), 3)
+        self.assertFalse(e.observations.is_loaded())
+
+        e = rs.past_experiment_from_hash(self.path, rs.get_hash({"title": "inferred"}), lazy=True)
+        self.assertEqual(e.n_folds(), 2)
+        self.assertFalse(e.observations.is_loaded())
+
+    def test_keeps_schema_parameters(self):
+        rs.record_experiment({"title": "t", "schema": "v2"}, self.path, {"loss": [0.5]})
+
+        e = rs.past_experiment_from_hash(self.path, rs.get_hash({"title": "t", "schema": "v2"}))
+        self.assertEqual(e.data["schema"], "v2")
+        self.assertEqual(e.schema()["loss"]["kind"], "series")
+        self.assertRaises(ValueError, rs.record_experiment, {"title": "t", SCHEMA_KEY: "v2"}, self.path)
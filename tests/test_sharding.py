@@ -0,0 +1,69 @@
+import unittest
+import shutil
+import tempfile
+import os
+
+import researcher as rs
+
+from researcher.globals import INDEX_NAME, SHARDED_NAME
+
+class TestShardedLayout(unittest.TestCase):
+    def setUp(self):
+        self.path = tempfile.mkdtemp() + "/"
+        self.params = [{"title": "sharded", "seed": i} for i in range(20)]
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def record_all(self, params):
+        for p in params:
+            rs.record_experiment(p, self.path, observations={"loss": [[0.5, p["seed"]]]}, binary=p["seed"] % 2 == 0)
+
+    def check_loads(self, params):
+        experiments = rs.all_experiments(self.path)
+        self.assertEqual(sorted(e.data["seed"] for e in experiments), sorted(p["seed"] for p in params))
+
+        for p in params:
+            param_hash = rs.get_hash(p)
+            e = rs.past_experiment_from_hash(self.path, param_hash)
+            self.assertEqual(e.final_observations("loss"), [p["seed"]])
+            self.assertEqual(rs.load_experiment(self.path, "sharded_" + param_hash).data["seed"], p["seed"])
+
+    def test_saves_into_shards(self):
+        open(self.path + SHARDED_NAME, "w").close()
+        self.record_all(self.params)
+
+        param_hash = rs.get_hash(self.params[0])
+        self.assertTrue(os.path.isfile(self.path + param_hash[:2] + "/sharded_" + param_hash + ".json"))
+        self.assertFalse(any(name.endswith(".json") for name in os.listdir(self.path)))
+        self.check_loads(self.params)
+
+    def test_migrates_flat_directory(self):
+        self.record_all(self.params[:10])
+        rs.build_index(self.path)
+        rs.shard_records(self.path)
+        self.record_all(self.params[10:])
+
+        self.assertFalse(any(name.endswith(".json") or name.endswith(".bin") for name in os.listdir(self.path)))
+        self.check_loads(self.params)
+        self.assertEqual(len(rs.query(self.path, title="sharded")), 20)
+
+        os.remove(self.path + INDEX_NAME)
+        self.check_loads(self.params)
+
+    def test_finds_hash_segments_in_other_shards(self):
+        rs.save_experiment(self.path, "first_12345678abcdef", {"run": 1}, None)
+        rs.save_experiment(self.path, "second_abcd12345678ef", {"run": 2}, None)
+        rs.shard_records(self.path)
+
+        self.assertEqual(rs.past_experiment_from_hash(self.path, "cd12345678").data["run"], 2)
+        self.assertRaises(ValueError, rs.past_experiment_from_hash, self.path, "12345678")
+
+    def test_refreshes_experiment_sets(self):
+        rs.shard_records(self.path)
+        self.record_all(self.params[:5])
+
+        with rs.ExperimentSet(self.path) as experiments:
+            self.assertEqual(len(experiments), 5)
+            self.record_all(self.params[5:])
+            self.assertEqual(len(experiments.refresh()), 15)
@@ -0,0 +1,50 @@
+import unittest
+import random
+
+import researcher as rs
+
+class TestParameterMatrix(unittest.TestCase):
+    def setUp(self):
+        random.seed(3)
+        self.experiments = [
+            rs.Experiment({
+                "title": "similar",
+                "hash": str(i),
+                "lr": random.choice([0.1, 0.01, 1]),
+                "layers": random.choice([[64, 64], [32], [64, 64.0]]),
+                "optimizer": random.choice([{"name": "adam", "beta": 0.9}, {"beta": 0.9, "name": "adam"}, {"name": "sgd"}]),
+                **({"dropout": random.choice([0.1, 0.5])} if i % 3 else {}),
+            })
+            for i in range(40)
+        ]
+        self.matrix = rs.parameter_matrix(self.experiments)
+
+    def test_matches_pairwise_comparisons(self):
+        self.assertEqual(sorted(self.matrix.keys), ["dropout", "layers", "lr", "optimizer"])
+
+        common = self.matrix.common_counts()
+        differing = self.matrix.differing_counts()
+
+        for i, a in enumerate(self.experiments):
+            for j, b in enumerate(self.experiments):
+                self.assertEqual(common[i, j], a.common_values(b))
+                self.assertEqual(differing[i, j], a.differing_values(b))
+
+        query = {"lr": 0.1, "layers": [64, 64], "dropout": 0.3, "seed": 4}
+        common, differing = self.matrix.compare(query)
+        self.assertEqual(list(common), [rs.Experiment(query).common_values(e) for e in self.experiments])
+        self.assertEqual(list(differing), [rs.Experiment(query).differing_values(e) for e in self.experiments])
+
+    def test_finds_nearest_experiments(self):
+        target = self.experiments[7]
+        nearest = self.matrix.nearest(target, k=3)
+
+        self.assertEqual(len(nearest), 3)
+        self.assertEqual(nearest[0].common_values(target), len(self.matrix.encode(target)[self.matrix.encode(target) >= 0]))
+
+        ranks = [(e.common_values(target), -e.differing_values(target)) for e in nearest]
+        best = sorted([(e.common_values(target), -e.differing_values(target)) for e in self.experiments], reverse=True)[:3]
+        self.assertEqual(ranks, best)
+
+        self.assertEqual(len(self.matrix.nearest(target, k=100)), 40)
+        self.assertEqual(rs.parameter_matrix([]).nearest(target), [])
@@ -0,0 +1,77 @@
+import unittest
+import shutil
+import tempfile
+import json
+import os
+
+import numpy as np
+import researcher as rs
+
+class TestBinaryStorage(unittest.TestCase):
+    def setUp(self):
+        self.path = tempfile.mkdtemp() + "/"
+        self.observations = {
+            "loss": [[0.5, 0.4, 0.3], [0.6, 0.5]],
+            "steps": np.arange(1000, dtype=np.int32),
+            "val_loss": [0.9, 0.8],
+            "best_epoch": 3,
+            "labels": ["a", "b"],
+        }
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def test_stores_series_outside_json(self):
+        rs.save_experiment(self.path, "binary", {"title": "binary"}, self.observations, binary=True)
+
+        with open(self.path + "binary.json") as f:
+            saved = json.load(f)
+
+        self.assertIn("__array__", saved["observations"]["val_loss"])
+        self.assertTrue(os.path.isfile(self.path + saved["observations"]["val_loss"]["__array__"]["file"]))
+        self.assertEqual(saved["observations"]["best_epoch"], 3)
+        self.assertEqual(saved["observations"]["labels"], ["a", "b"])
+
+    def test_loads_binary_observations(self):
+        rs.save_experiment(self.path, "binary", {"title": "binary"}, self.observations, binary=True)
+        e = rs.load_experiment(self.path, "binary")
+
+        self.assertEqual(e.n_folds(), 2)
+        self.assertEqual([list(fold) for fold in e.observations["loss"]], [[0.5, 0.4, 0.3], [0.6, 0.5]])
+        self.assertEqual(e.final_observations("loss"), [0.3, 0.5])
+        self.assertEqual(e.final_observations("val_loss"), 0.8)
+        self.assertEqual(e.observations["steps"].dtype, np.int32)
+        self.assertTrue(np.array_equal(e.observations["steps"], np.arange(1000)))
+        self.assertIsInstance(e.observations["steps"].base, np.memmap)
+
+    def test_records_binary_experiments(self):
+        rs.record_experiment({"title": "binary", "lr": 0.1}, self.path, observations=self.observations, binary=True)
+        e = rs.all_experiments(self.path, lazy=True)[0]
+
+        self.assertEqual(e.final_observations("loss"), [0.3, 0.5])
+        self.assertEqual(e.data["lr"], 0.1)
+
+    def test_rewrites_do_not_tear_reads(self):
+        rs.save_experiment(self.path, "binary", {"title": "binary"}, self.observations, binary=True)
+        old = rs.load_experiment(self.path, "binary")
+
+        rs.save_experiment(self.path, "binary", {"title": "binary"}, {"steps": np.arange(10, 20)}, binary=True)
+        new = rs.load_experiment(self.path, "binary")
+
+        self.assertTrue(np.array_equal(old.observations["steps"], np.arange(1000)))
+        self.assertTrue(np.array_equal(new.observations["steps"], np.arange(10, 20)))
+        self.assertEqual(len([name for name in os.listdir(self.path) if name.endswith(".bin")]), 1)
+
+        rs.save_experiment(self.path, "binary", {"title": "binary"}, {"steps": [1, 2]})
+        self.assertEqual(sorted(os.listdir(self.path)), ["binary.json"])
+
+    def test_loads_unversioned_binary_files(self):
+        rs.save_experiment(self.path, "binary", {"title": "binary"}, {"steps": np.arange(5)}, binary=True)
+
+        with open(self.path + "binary.json") as f:
+            saved = json.load(f)
+        os.replace(self.path + saved["observations"]["steps"]["__array__"].pop("file"), self.path + "binary.bin")
+        with open(self.path + "binary.json", "w") as f:
+            json.dump(saved, f)
+
+        self.assertTrue(np.array_equal(rs.load_experiment(self.path, "binary").observations["steps"], np.arange(5)))
@@ -0,0 +1,94 @@
+import unittest
+import shutil
+import tempfile
+import os
+from unittest import mock
+
+import researcher as rs
+
+class TestStreamingObservationCollector(unittest.TestCase):
+    def setUp(self):
+        self.path = tempfile.mkdtemp() + "/"
+        self.params = {"title": "streamed", "learning_rate": 0.01}
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def test_streams_observations_to_log(self):
+        collector = rs.StreamingObservationCollector(self.params, self.path, flush_every=1)
+        collector.add_fold_observation(0, "loss", 0.5)
+        collector.add_fold_observations(1, "loss", [0.4, 0.3])
+        collector.set_observation("final_score", 0.9)
+
+        self.assertTrue(os.path.isfile(collector.log_file))
+        self.assertEqual(rs.compact_observation_log(collector.log_file), {"loss": [[0.5], [0.4, 0.3]], "final_score": 0.9})
+        self.assertEqual(collector.observations["loss"], [[0.5], [0.4, 0.3]])
+
+        self.assertRaises(ValueError, collector.set_observation, "loss", 0.5)
+        self.assertRaises(ValueError, collector.add_fold_observation, 0, "final_score", 0.5)
+        collector.close()
+
+    def test_finalizes_into_record(self):
+        collector = rs.StreamingObservationCollector(self.params, self.path)
+        for i in range(3):
+            for j in range(1, 8):
+                collector.add_fold_observation(i, "rmse", 0.98 / j)
+        collector.finalize()
+
+        self.assertFalse(os.path.isfile(collector.log_file))
+        e = rs.past_experiment_from_hash(self.path, rs.get_hash(self.params))
+        self.assertEqual(e.n_folds(), 3)
+        self.assertEqual(e.final_observations("rmse"), [0.98 / 7] * 3)
+
+    def test_resumes_crashed_log(self):
+        collector = rs.StreamingObservationCollector(self.params, self.path)
+        collector.add_fold_observations(0, "loss", [0.5, 0.4])
+        collector.set_observation("final_score", 0.9)
+        collector.close()
+
+        with open(collector.log_file, "a") as f:
+            f.write('{"fold": 0, "key": "lo')
+
+        resumed = rs.StreamingObservationCollector(self.params, self.path)
+        self.assertRaises(ValueError, resumed.set_observation, "final_score", 0.5)
+        resumed.add_fold_observation(0, "loss", 0.3)
+        self.assertEqual(resumed.observations["loss"], [[0.5, 0.4, 0.3]])
+        resumed.close()
+
+    def test_resumes_log_with_long_partial_entry(self):
+        collector = rs.StreamingObservationCollector(self.params, self.path)
+        collector.add_fold_observations(0, "loss", [0.5, 0.4])
+        collector.close()
+
+        with open(collector.log_file, "a") as f:
+            f.write('{"fold": 0, "key": "loss", "values": [' + "0.1, " * 20)
+
+        with mock.patch("researcher.streaming.LOG_BLOCK_SIZE", 8):
+            resumed = rs.StreamingObservationCollector(self.params, self.path)
+
+        self.assertEqual(resumed.observations["loss"], [[0.5, 0.4]])
+        resumed.close()
+
+        with open(collector.log_file, "w") as f:
+            f.write('{"fold": 0, "key": "lo')
+
+        with mock.patch("researcher.streaming.LOG_BLOCK_SIZE", 8):
+            resumed = rs.StreamingObservationCollector(self.params, self.path)
+
+        self.assertEqual(resumed.observations, {})
+        resumed.close()
+
+    def test_reads_log_again_only_after_appends(self):
+        collector = rs.StreamingObservationCollector(self.params, self.path)
+        collector.add_fold_observation(0, "loss", 0.5)
+
+        with mock.patch("researcher.streaming.compact_observation_log", wraps=rs.compact_observation_log) as compact:
+            self.assertEqual(collector.observations["loss"], [[0.5]])
+            self.assertEqual(collector.observations["loss"], [[0.5]])
+            self.assertEqual(compact.call_count, 1)
+
+            collector.add_fold_observation(0, "loss", 0.4)
+            self.assertEqual(collector.observations["loss"], [[0.5, 0.4]])
+            self.assertEqual(compact.call_count, 2)
+
+        collector.close()
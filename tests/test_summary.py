@@ -0,0 +1,69 @@
+import unittest
+import shutil
+import tempfile
+
+import numpy as np
+import researcher as rs
+
+from researcher.globals import SUMMARY_KEY
+from researcher.summary import summarize
+
+class TestObservationSummary(unittest.TestCase):
+    def setUp(self):
+        self.path = tempfile.mkdtemp() + "/"
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def test_summarizes_observations(self):
+        summary = summarize({"loss": [[3, 1, 2], [float("nan"), 5.0, 4.0], []], "lr": np.array([0.1, 0.3, 0.2]), "best": 5, "names": ["a"]})
+
+        self.assertEqual(summary["loss"]["final"], [2, 4.0, None])
+        self.assertEqual(summary["loss"]["min"], [1, 4.0, None])
+        self.assertEqual(summary["loss"]["argmin"], [1, 2, None])
+        self.assertEqual(summary["loss"]["argmax"], [0, 1, None])
+        self.assertEqual(summary["loss"]["mean"], [2, 4.5, None])
+        self.assertEqual(summary["lr"]["max"], 0.3)
+        self.assertEqual(summary["lr"]["argmax"], 1)
+        self.assertNotIn("best", summary)
+        self.assertNotIn("names", summary)
+
+    def test_ranks_without_reading_observations(self):
+        rs.build_index(self.path)
+        for i, losses in enumerate([[0.9, 0.5], [0.7, 0.2], [0.8, 0.6]]):
+            rs.record_experiment({"title": "ranked", "run": i}, self.path, {"val_loss": [losses, [x + 0.1 for x in losses]]})
+        rs.record_experiment({"title": "ranked", "run": 3}, self.path, {"accuracy": [0.5]})
+
+        with rs.ExperimentIndex(self.path) as index:
+            ranked = index.rank("val_loss", "min")
+            self.assertEqual([params["run"] for _, params, _ in ranked], [1, 0, 2])
+            self.assertAlmostEqual(ranked[0][2], 0.25)
+            self.assertEqual(len(index.rank("val_loss", "final", descending=True, limit=1)), 1)
+            self.assertRaises(ValueError, index.rank, "val_loss", "median")
+
+        e = rs.past_experiment_from_hash(self.path, rs.get_hash({"title": "ranked", "run": 1}), lazy=True)
+        self.assertEqual(e.statistic("val_loss", "argmin"), [1, 1])
+        self.assertAlmostEqual(e.statistic("val_loss", "min", mean=True), 0.25)
+        self.assertFalse(e.observations.is_loaded())
+
+    def test_computes_missing_summaries(self):
+        e = rs.Experiment({"observations": {"loss": [3, 1, 2]}})
+
+        self.assertIsNone(e.summary())
+        self.assertEqual(e.statistic("loss", "min"), 1)
+        self.assertRaises(KeyError, e.statistic, "accuracy", "min")
+
+    def test_keeps_summary_parameters(self):
+        params = {"title": "described", "summary": "first try"}
+        rs.save_experiment(self.path, "older", dict(params, hash="older", timestamp="2020-01-01_00:00:00"), {"loss": [0.5, 0.25]})
+        rs.record_experiment(params, self.path, {"loss": [0.5, 0.25]})
+        rs.build_index(self.path)
+
+        e = rs.past_experiment_from_hash(self.path, rs.get_hash(params))
+        self.assertEqual(e.data["summary"], "first try")
+        self.assertEqual(e.summary()["loss"]["min"], 0.25)
+        self.assertIsNone(rs.load_experiment(self.path, "older").summary())
+
+        self.assertEqual(rs.export_table(self.path, self.path + "table.csv"), 2)
+        self.assertEqual(list(rs.group_experiments(rs.all_experiments(self.path), by=["title"]).aggregate("loss", "min")["mean"]), [0.25])
+        self.assertRaises(ValueError, rs.record_experiment, {"title": "t", SUMMARY_KEY: {}}, self.path)
@@ -0,0 +1,41 @@
+import unittest
+import shutil
+import tempfile
+
+import researcher as rs
+
+from researcher.globals import SHARDED_NAME
+
+class TestSweepDeduplication(unittest.TestCase):
+    def setUp(self):
+        self.path = tempfile.mkdtemp() + "/"
+        self.sweep = [{"title": "sweep", "lr": lr, "seed": seed} for lr in [0.1, 0.01] for seed in range(3)]
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def test_skips_recorded_parameters(self):
+        for params in self.sweep[:2]:
+            rs.record_experiment(params, self.path)
+        rs.record_experiment(self.sweep[2], self.path, hash_version=2)
+
+        recorded = rs.RecordedSet(self.path)
+        self.assertEqual(len(recorded), 3)
+        self.assertTrue(recorded.is_recorded(self.sweep[0]))
+        self.assertTrue(self.sweep[2] in recorded)
+        self.assertFalse(recorded.is_recorded(self.sweep[3]))
+
+        self.assertFalse(rs.RecordedSet(self.path, hash_versions=[1]).is_recorded(self.sweep[2]))
+
+        recorded.add(self.sweep[3])
+        self.assertTrue(recorded.is_recorded(self.sweep[3]))
+
+        self.assertEqual(list(rs.unrecorded(iter(self.sweep), self.path)), self.sweep[3:])
+
+    def test_handles_missing_and_sharded_directories(self):
+        self.assertEqual(list(rs.unrecorded(self.sweep, self.path + "missing/")), self.sweep)
+
+        open(self.path + SHARDED_NAME, "w").close()
+        rs.record_experiment(self.sweep[4], self.path)
+
+        self.assertEqual(list(rs.unrecorded(self.sweep, self.path)), self.sweep[:4] + self.sweep[5:])
@@ -0,0 +1,75 @@
+import unittest
+import shutil
+import tempfile
+import os
+from unittest import mock
+
+import researcher as rs
+
+class TestExperimentSet(unittest.TestCase):
+    def setUp(self):
+        self.path = tempfile.mkdtemp() + "/"
+        self.save("b", "2021-01-01_00:00:02")
+        self.save("a", "2021-01-01_00:00:01")
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def save(self, name, timestamp, loss=0.5):
+        rs.save_experiment(self.path, name, {"title": name, "hash": name * 8, "timestamp": timestamp}, {"loss": [loss]})
+
+    def check_refreshes(self, watch):
+        with rs.ExperimentSet(self.path, watch=watch) as experiments:
+            self.assertEqual([e.data["title"] for e in experiments], ["a", "b"])
+            self.assertEqual(experiments.refresh(), [])
+
+            self.save("c", "2021-01-01_00:00:00")
+            self.save("d", "2021-01-01_00:00:03")
+            loaded = experiments.refresh()
+
+            self.assertEqual(sorted(e.data["title"] for e in loaded), ["c", "d"])
+            self.assertEqual([e.data["title"] for e in experiments], ["c", "a", "b", "d"])
+
+            os.remove(self.path + "a.json")
+            self.save("b", "2021-01-01_00:00:02", loss=0.25)
+            loaded = experiments.refresh()
+
+            self.assertEqual([e.data["title"] for e in loaded], ["b"])
+            self.assertEqual([e.data["title"] for e in experiments], ["c", "b", "d"])
+            self.assertEqual(experiments.experiments[1].final_observations("loss"), 0.25)
+
+    def test_refreshes_by_polling(self):
+        self.check_refreshes(watch=False)
+
+    def test_refreshes_with_inotify(self):
+        experiments = rs.ExperimentSet(self.path)
+        watching = experiments.is_watching()
+        experiments.close()
+
+        if not watching:
+            self.skipTest("inotify is unavailable")
+
+        self.check_refreshes(watch=True)
+
+    def test_retries_failed_loads(self):
+        with rs.ExperimentSet(self.path) as experiments:
+            if not experiments.is_watching():
+                self.skipTest("inotify is unavailable")
+
+            with mock.patch("researcher.watcher.load_experiment", side_effect=ValueError("partially written")):
+                self.save("c", "2021-01-01_00:00:00")
+                self.assertEqual(experiments.refresh(), [])
+
+            # no further events arrive for c.
+            self.assertEqual([e.data["title"] for e in experiments.refresh()], ["c"])
+            self.assertEqual(experiments.refresh(), [])
+
+    def test_drops_records_deleted_while_rescanning(self):
+        with rs.ExperimentSet(self.path, watch=False) as experiments:
+            os.remove(self.path + "a.json")
+
+            # a is listed but deleted before it is checked.
+            with mock.patch("researcher.watcher.list_records", return_value=["a.json", "b.json"]):
+                self.assertEqual(experiments.refresh(), [])
+
+            self.assertEqual([e.data["title"] for e in experiments], ["b"])
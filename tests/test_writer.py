@@ -0,0 +1,75 @@
+import unittest
+import asyncio
+import datetime
+import shutil
+import tempfile
+import os
+from unittest import mock
+
+import researcher as rs
+
+class TestBackgroundRecorder(unittest.TestCase):
+    def setUp(self):
+        self.path = tempfile.mkdtemp() + "/"
+        self.params = [{"title": "background", "seed": i} for i in range(20)]
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def test_records_in_background(self):
+        with rs.BackgroundRecorder(self.path, max_pending=2) as recorder:
+            for params in self.params:
+                recorder.record(params, {"loss": [params["seed"]]})
+                params["seed"] = -1
+
+        experiments = rs.all_experiments(self.path)
+        self.assertEqual(sorted(e.data["seed"] for e in experiments), list(range(20)))
+        self.assertTrue(all(e.observations["loss"] == [e.data["seed"]] for e in experiments))
+
+        self.assertRaises(ValueError, recorder.record, self.params[0])
+
+    def test_syncs_records_to_disk(self):
+        with mock.patch("os.fsync", wraps=os.fsync) as fsync:
+            with rs.BackgroundRecorder(self.path) as recorder:
+                recorder.record(self.params[0], {"loss": [1.0]})
+            synced = fsync.call_count
+
+            with rs.BackgroundRecorder(self.path, durable=False) as recorder:
+                recorder.record(self.params[1], {"loss": [1.0]})
+
+        # the record and then its directory.
+        self.assertEqual(synced, 2)
+        self.assertEqual(fsync.call_count, 2)
+        self.assertEqual(len(rs.all_experiments(self.path)), 2)
+
+    def test_timestamps_when_recorded(self):
+        times = [datetime.datetime(2021, 3, 4, 5, 6, i) for i in range(3)]
+
+        with mock.patch("researcher.writer.datetime") as clock:
+            clock.datetime.now.side_effect = times
+            with rs.BackgroundRecorder(self.path) as recorder:
+                for params in self.params[:3]:
+                    recorder.record(params)
+
+        experiments = rs.all_experiments(self.path)
+        self.assertEqual([e.data["seed"] for e in experiments], [0, 1, 2])
+        self.assertEqual([e.timestamp for e in experiments], times)
+
+    def test_reports_errors(self):
+        open(self.path + "file", "w").close()
+
+        recorder = rs.BackgroundRecorder(self.path + "file/")
+        recorder.record(self.params[0])
+
+        self.assertRaises(OSError, recorder.flush)
+        recorder.close()
+
+    def test_records_from_event_loop(self):
+        async def run():
+            async with rs.BackgroundRecorder(self.path) as recorder:
+                for params in self.params:
+                    await recorder.record_async(params)
+                await recorder.flush_async()
+                self.assertEqual(len(rs.all_experiments(self.path)), 20)
+
+        asyncio.run(run())